@@ -0,0 +1,8 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio-Config benchmarks.
+
+The benchmarks follow the `airspeed velocity <https://asv.readthedocs.io>`_
+conventions and can be run with ``asv run`` from the repository root.
+"""
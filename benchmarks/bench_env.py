@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmarks of the environment configuration loader."""
+
+import os
+
+from flask import Flask
+
+from invenio_config import InvenioConfigEnvironment
+from invenio_config import env as env_module
+
+
+class EnvironmentScan:
+    """Scan cost against the size of the environment.
+
+    ``size`` is the number of unrelated variables, of which one percent use
+    the configuration prefix.
+    """
+
+    params = [100, 1000, 10000]
+    param_names = ["size"]
+
+    def setup(self, size):
+        """Populate the environment."""
+        self._environ = dict(os.environ)
+        for i in range(size):
+            os.environ["BENCH_OTHER_{0}".format(i)] = "value {0}".format(i)
+        for i in range(size // 100):
+            os.environ["BENCHAPP_STR_{0}".format(i)] = "plain string"
+            os.environ["BENCHAPP_DICT_{0}".format(i)] = "{'a': [1, 2, 3]}"
+        self.app = Flask("benchapp")
+
+    def teardown(self, size):
+        """Restore the environment."""
+        os.environ.clear()
+        os.environ.update(self._environ)
+        env_module._parsed_environ.clear()
+
+    def time_scan_cold(self, size):
+        """Load the environment without previously parsed values."""
+        env_module._parsed_environ.clear()
+        InvenioConfigEnvironment(self.app, prefix="BENCHAPP_")
+
+    def time_scan_warm(self, size):
+        """Load the environment with previously parsed values."""
+        InvenioConfigEnvironment(self.app, prefix="BENCHAPP_")
+
+    def time_scan_multiple_prefixes(self, size):
+        """Load the environment for several prefixes in one pass."""
+        InvenioConfigEnvironment(self.app, prefix=["BENCH_", "BENCHAPP_"])
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmarks of the configuration loaders."""
+
+import os
+
+from flask import Flask
+
+from invenio_config import (
+    InvenioConfigEntryPointModule,
+    InvenioConfigEnvironment,
+    InvenioConfigInstanceFolder,
+    InvenioConfigModule,
+    create_config_loader,
+)
+from invenio_config.binary import InvenioConfigBinary, dump_binary_config
+from invenio_config.overlay import SharedConfigLoader
+
+from .synthetic import SyntheticSources
+
+
+def _app(sources):
+    """Create an application using the synthetic instance folder."""
+    return Flask("benchapp", instance_path=sources.path, instance_relative_config=True)
+
+
+class ConfigLoader:
+    """End to end ``create_config_loader()(app)``."""
+
+    params = ([10, 100], [10, 1000], [10, 1000])
+    param_names = ["entry_points", "env_vars", "cfg_keys"]
+
+    def setup(self, entry_points, env_vars, cfg_keys):
+        """Create the sources."""
+        self.sources = SyntheticSources(
+            entry_points=entry_points, env_vars=env_vars, cfg_keys=cfg_keys
+        )
+        self.loader = create_config_loader(env_prefix=self.sources.prefix[:-1])
+
+    def teardown(self, entry_points, env_vars, cfg_keys):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_cold(self, entry_points, env_vars, cfg_keys):
+        """Load with entry point modules imported from scratch."""
+        self.sources.unload_modules()
+        self.loader(_app(self.sources))
+
+    def time_warm(self, entry_points, env_vars, cfg_keys):
+        """Load with entry point modules already imported."""
+        self.loader(_app(self.sources))
+
+
+class EntryPointModule:
+    """:class:`invenio_config.InvenioConfigEntryPointModule` in isolation."""
+
+    params = ([10, 100, 500], [False, True])
+    param_names = ["entry_points", "parallel"]
+
+    def setup(self, entry_points, parallel):
+        """Create the sources."""
+        self.sources = SyntheticSources(entry_points=entry_points)
+
+    def teardown(self, entry_points, parallel):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_cold(self, entry_points, parallel):
+        """Load with entry point modules imported from scratch."""
+        self.sources.unload_modules()
+        InvenioConfigEntryPointModule(_app(self.sources), parallel=parallel)
+
+    def time_warm(self, entry_points, parallel):
+        """Load with entry point modules already imported."""
+        InvenioConfigEntryPointModule(_app(self.sources), parallel=parallel)
+
+
+class Environment:
+    """:class:`invenio_config.InvenioConfigEnvironment` in isolation."""
+
+    params = [10, 100, 1000]
+    param_names = ["env_vars"]
+
+    def setup(self, env_vars):
+        """Create the sources."""
+        self.sources = SyntheticSources(env_vars=env_vars)
+        self.app = _app(self.sources)
+
+    def teardown(self, env_vars):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_load(self, env_vars):
+        """Load the environment variables."""
+        InvenioConfigEnvironment(self.app, prefix=self.sources.prefix)
+
+
+class InstanceFolder:
+    """:class:`invenio_config.InvenioConfigInstanceFolder` in isolation.
+
+    ``cached`` enables the bytecode cache of the compiled file.
+    """
+
+    params = ([10, 1000, 10000], [False, True])
+    param_names = ["cfg_keys", "cached"]
+
+    def setup(self, cfg_keys, cached):
+        """Create the sources."""
+        self.sources = SyntheticSources(cfg_keys=cfg_keys)
+        self.app = _app(self.sources)
+        self.cache_dir = os.path.join(self.sources.path, "cache") if cached else None
+        InvenioConfigInstanceFolder(self.app, cache_dir=self.cache_dir)
+
+    def teardown(self, cfg_keys, cached):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_load(self, cfg_keys, cached):
+        """Load the instance folder file."""
+        InvenioConfigInstanceFolder(self.app, cache_dir=self.cache_dir)
+
+
+class Module:
+    """:class:`invenio_config.InvenioConfigModule` in isolation."""
+
+    params = [10, 1000, 10000]
+    param_names = ["keys"]
+
+    def setup(self, keys):
+        """Create the configuration object."""
+        self.config = type(
+            "Config", (), {"BENCH_{0}".format(i): i for i in range(keys)}
+        )
+        self.app = Flask("benchapp")
+
+    def time_load(self, keys):
+        """Load the configuration object."""
+        InvenioConfigModule(self.app, module=self.config)
+
+
+class SharedConfig:
+    """Per application cost of :class:`invenio_config.overlay.SharedConfigLoader`.
+
+    Compared with ``create_config_loader``, the entry point configuration is
+    only loaded once, and each application only holds its own values.
+    """
+
+    params = ([False, True], [100])
+    param_names = ["shared", "entry_points"]
+
+    def setup(self, shared, entry_points):
+        """Create the sources and load the base configuration."""
+        self.sources = SyntheticSources(entry_points=entry_points, cfg_keys=10)
+        if shared:
+            self.loader = SharedConfigLoader(env_prefix=self.sources.prefix[:-1])
+            self.loader.base
+        else:
+            self.loader = create_config_loader(env_prefix=self.sources.prefix[:-1])
+
+    def teardown(self, shared, entry_points):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_create_app(self, shared, entry_points):
+        """Load the configuration of a new application."""
+        self.loader(_app(self.sources))
+
+    def peakmem_create_apps(self, shared, entry_points):
+        """Load the configuration of 100 applications."""
+        apps = []
+        for _ in range(100):
+            app = _app(self.sources)
+            self.loader(app)
+            apps.append(app)
+
+
+class BinaryConfig:
+    """:class:`invenio_config.binary.InvenioConfigBinary` against the loader.
+
+    The binary file holds the configuration merged by
+    ``create_config_loader`` from the synthetic sources.
+    """
+
+    params = [10, 100, 500]
+    param_names = ["entry_points"]
+
+    def setup(self, entry_points):
+        """Create the sources and export the merged configuration."""
+        self.sources = SyntheticSources(entry_points=entry_points, cfg_keys=100)
+        app = _app(self.sources)
+        create_config_loader(env_prefix=self.sources.prefix[:-1])(app)
+        self.path = os.path.join(self.sources.path, "config.bin")
+        dump_binary_config(app.config, self.path)
+
+    def teardown(self, entry_points):
+        """Remove the sources."""
+        self.sources.cleanup()
+
+    def time_load(self, entry_points):
+        """Load the binary file."""
+        InvenioConfigBinary(_app(self.sources), path=self.path)
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmarks of the configuration access metrics."""
+
+import timeit
+
+from flask import Flask
+
+from invenio_config.metrics import install_config_meter
+
+#: Number of keys of the benchmarked configuration.
+KEYS = 3000
+
+
+def _app(metered):
+    """Create an application with many keys."""
+    app = Flask("benchapp")
+    app.config.update(("BENCH_KEY_{0}".format(i), i) for i in range(KEYS))
+    if metered:
+        install_config_meter(app)
+    return app
+
+
+class ConfigGet:
+    """Cost of ``app.config.get`` and ``app.config[key]``."""
+
+    params = [False, True]
+    param_names = ["metered"]
+
+    def setup(self, metered):
+        """Create the application."""
+        self.config = _app(metered).config
+        self.keys = ["BENCH_KEY_{0}".format(i) for i in range(KEYS)]
+
+    def time_get(self, metered):
+        """Read every key with ``get``."""
+        get = self.config.get
+        for key in self.keys:
+            get(key)
+
+    def time_getitem(self, metered):
+        """Read every key with item access."""
+        config = self.config
+        for key in self.keys:
+            config[key]
+
+
+class ConfigGetOverhead:
+    """Overhead of a metered ``app.config.get``.
+
+    A metered read is a Python method call instead of a C call, so it is
+    several times slower than an unmetered one, but should stay within a
+    few hundred nanoseconds.
+    """
+
+    def setup(self):
+        """Create the applications."""
+        self.plain = _app(False).config
+        self.metered = _app(True).config
+
+    def _time(self, config):
+        """Return the time of one ``get`` in nanoseconds."""
+        number = 100000
+        timer = timeit.Timer("get('BENCH_KEY_42')", globals={"get": config.get})
+        return min(timer.repeat(5, number)) / number * 1e9
+
+    def track_get_overhead(self):
+        """Additional time of a metered ``get``."""
+        return self._time(self.metered) - self._time(self.plain)
+
+    track_get_overhead.unit = "ns"
+
+    def track_get_ratio(self):
+        """Ratio of metered to unmetered ``get`` time."""
+        return self._time(self.metered) / self._time(self.plain)
+
+    track_get_ratio.unit = "ratio"
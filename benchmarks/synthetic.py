@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Synthetic and scalable configuration sources for the benchmarks."""
+
+import os
+import shutil
+import sys
+import tempfile
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+ENTRY_POINT_GROUP = "invenio_config.module"
+
+
+class SyntheticSources:
+    """Temporary configuration sources.
+
+    :param entry_points: Number of entry point configuration modules.
+    :param keys_per_module: Number of keys defined by each module.
+    :param env_vars: Number of prefixed environment variables.
+    :param cfg_keys: Number of keys in the instance folder file.
+    """
+
+    prefix = "BENCHAPP_"
+
+    def __init__(self, entry_points=0, keys_per_module=20, env_vars=0, cfg_keys=0):
+        """Create the sources."""
+        self.path = tempfile.mkdtemp()
+        self.entry_points = []
+        self.modules = []
+        for i in range(entry_points):
+            name = "bench_config_{0:05d}".format(i)
+            with open(os.path.join(self.path, name + ".py"), "w") as fp:
+                for j in range(keys_per_module):
+                    fp.write("BENCH_{0}_{1} = {{'value': {1}}}\n".format(i, j))
+            self.modules.append(name)
+            self.entry_points.append(
+                EntryPoint(
+                    name="{0:05d}_bench".format(i), value=name, group=ENTRY_POINT_GROUP
+                )
+            )
+
+        with open(os.path.join(self.path, "benchapp.cfg"), "w") as fp:
+            for k in range(cfg_keys):
+                fp.write("BENCH_CFG_{0} = ['value', {0}]\n".format(k))
+
+        self._environ = dict(os.environ)
+        for m in range(env_vars):
+            os.environ["{0}ENV_{1}".format(self.prefix, m)] = "{'value': %d}" % m
+
+        sys.path.insert(0, self.path)
+        self._patch = patch(
+            "importlib.metadata.entry_points", return_value=self.entry_points
+        )
+        self._patch.start()
+
+    def unload_modules(self):
+        """Remove the configuration modules from the import cache."""
+        for name in self.modules:
+            sys.modules.pop(name, None)
+
+    def cleanup(self):
+        """Remove the sources."""
+        self._patch.stop()
+        self.unload_modules()
+        sys.path.remove(self.path)
+        os.environ.clear()
+        os.environ.update(self._environ)
+        shutil.rmtree(self.path)
@@ -24,6 +24,8 @@ The following configuration loaders exists:
 - :py:data:`invenio_config.env.InvenioConfigEnvironment` - for loading
   configuration from environment variables with defined prefix (e.g.
   ``INVENIO_SECRET_KEY``).
+- :py:data:`invenio_config.binary.InvenioConfigBinary` - for loading
+  configuration exported to a binary file.
 
 It also includes configuration loader factory that it is used to merge these
 sources in predefined order ensuring correct behavior in common scenarios.
@@ -72,6 +74,10 @@ The following default configuration values exist:
 - :py:data:`~invenio_config.default.ALLOWED_HTML_ATTRS` - allowed attributes
   used for html sanitizing by bleach.
 
+The two values above are also available compiled to sets, for fast lookups
+when sanitizing html, as the derived values ``ALLOWED_HTML_TAGS_LOOKUP`` and
+``ALLOWED_HTML_ATTRS_LOOKUP`` (see :func:`invenio_config.derived.get_derived`).
+
 The default configuration loader will warn if the ``SECRET_KEY`` is not
 defined:
 
@@ -169,6 +175,7 @@ that combines loaders in predictable way. You can use
 
 """
 
+from .binary import InvenioConfigBinary
 from .default import InvenioConfigDefault
 from .entrypoint import InvenioConfigEntryPointModule
 from .env import InvenioConfigEnvironment
@@ -180,6 +187,7 @@ __version__ = "1.1.1"
 
 __all__ = (
     "__version__",
+    "InvenioConfigBinary",
     "InvenioConfigDefault",
     "InvenioConfigEntryPointModule",
     "InvenioConfigEnvironment",
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio asynchronous configuration loader.
+
+Application factories running inside an event loop can use the loader
+returned by :func:`create_async_config_loader`, which does not block the
+loop while importing modules and reading files:
+
+.. code-block:: python
+
+    config_loader = create_async_config_loader(config=config, env_prefix="APP")
+
+    async def create_app():
+        app = Flask("myapp")
+        await config_loader(app)
+        return app
+"""
+
+import asyncio
+from operator import attrgetter
+
+from werkzeug.utils import import_string
+
+from .discovery import entry_points
+from .entrypoint import _warn_concurrent_import
+from .ext import track_stage
+from .utils import ConfigLoader
+
+
+def create_async_config_loader(
+    config=None,
+    env_prefix="APP",
+    entry_point_group="invenio_config.module",
+    entry_point_index=None,
+    executor=None,
+    **kwargs,
+):
+    """Create an asynchronous configuration loader.
+
+    The loader loads the same sources in the same order as the loader of
+    :func:`invenio_config.utils.create_config_loader`, and accepts the same
+    options, except those changing how entry points are imported
+    (``snapshot_path``, ``key_index`` and ``parallel``). Entry point modules
+    and the configuration module are imported concurrently in an executor,
+    and then merged in order on the event loop. Entry point modules whose
+    concurrent import failed (e.g. due to an import lock deadlock) are
+    imported again one after the other. The remaining stages run in the
+    executor.
+
+    :param config: Either an import string to a module with configuration or
+        alternatively the module itself.
+    :param env_prefix: Environment variable prefix to import configuration
+        from.
+    :param entry_point_group: The configuration entry point group.
+    :param entry_point_index: Path of an entry point index file (see
+        :mod:`invenio_config.discovery`).
+    :param executor: The :class:`concurrent.futures.Executor` to use,
+        defaults to the default executor of the event loop.
+    :param kwargs: The other options of
+        :func:`~invenio_config.utils.create_config_loader`.
+    :return: A coroutine function with the signature
+        ``config_loader(app, **kwargs)``.
+    :raises ValueError: If ``snapshot_path``, ``key_index`` or ``parallel``
+        is set.
+
+    .. versionadded:: 1.2.0
+    """
+    unsupported = [
+        name for name in ("snapshot_path", "key_index", "parallel") if kwargs.get(name)
+    ]
+    if unsupported:
+        raise ValueError(
+            "The asynchronous loader does not support {0}.".format(
+                ", ".join(unsupported)
+            )
+        )
+    loader = ConfigLoader(
+        config=config,
+        env_prefix=env_prefix,
+        entry_point_index=entry_point_index,
+        **kwargs,
+    )
+
+    async def _config_loader(app, **kwargs_config):
+        loop = asyncio.get_running_loop()
+
+        def run(func, *args):
+            return loop.run_in_executor(executor, func, *args)
+
+        async def load_entry_points():
+            eps = await run(entry_points, entry_point_group, entry_point_index)
+            eps = sorted(eps, key=attrgetter("name"))
+            results = await asyncio.gather(
+                *[run(ep.load) for ep in eps], return_exceptions=True
+            )
+            loaded = []
+            for ep, result in zip(eps, results):
+                if isinstance(result, Exception):
+                    _warn_concurrent_import(app, ep, result)
+                    result = await run(ep.load)
+                elif isinstance(result, BaseException):
+                    raise result
+                loaded.append((ep, result))
+            return loaded
+
+        async def load_module():
+            if isinstance(config, str):
+                return await run(import_string, config)
+            return config
+
+        loader.prepare(app)
+        loaded, module = await asyncio.gather(load_entry_points(), load_module())
+
+        with track_stage(app, "entry_points", record_sources=False):
+            for ep, obj in loaded:
+                with track_stage(app, "entry_point", ep.name):
+                    app.config.from_object(obj)
+        if module:
+            with track_stage(app, "module", getattr(config, "__name__", config)):
+                app.config.from_object(module)
+        await run(loader.load_instance_folder, app)
+        await run(loader.load_overrides, app, kwargs_config)
+        await run(loader.finalize, app)
+
+    return _config_loader
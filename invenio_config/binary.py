@@ -0,0 +1,275 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio binary configuration export.
+
+The configuration loaded from the entry points, the configuration module
+and the instance folder can be exported to a compact binary file, e.g. while
+building a container image, and loaded back with :class:`InvenioConfigBinary`
+without importing any configuration module:
+
+.. code-block:: python
+
+    # At build time.
+    app = Flask("invenio", instance_path=instance_path)
+    with record_keys(app) as keys:
+        ConfigLoader(config=config).load_base(app)
+    dump_binary_config(
+        {key: app.config[key] for key in keys}, "/opt/invenio/config.bin"
+    )
+
+    # In each process.
+    def config_loader(app, **kwargs_config):
+        InvenioConfigBinary(app, path="/opt/invenio/config.bin")
+        app.config.update(kwargs_config)
+        InvenioConfigEnvironment(app, prefix="INVENIO_")
+        InvenioConfigDefault(app)
+
+Only the keys set by these stages (see
+:meth:`invenio_config.utils.ConfigLoader.load_base`) should be exported.
+Exporting the fully loaded configuration would store the keyword arguments
+and environment variables of the build, e.g. ``SECRET_KEY`` or its
+``"CHANGE_ME"`` default, in the file, as well as the values Flask computes
+when creating the application, e.g. ``DEBUG``.
+
+The file starts with a header holding a format version and the Python
+version, followed by :mod:`marshal` data. Plain values (strings, bytes,
+numbers, booleans, ``None``, and lists, tuples, sets and dictionaries of
+them) are stored as is and need no decoding. Other values are stored as
+tagged tuples:
+
+- dates, times and durations, compiled regular expressions and
+  :class:`~invenio_config.frozen.FrozenDict` are decoded when loading,
+- classes, functions and modules are stored as import references, which
+  are only resolved when the key is first read (see
+  :class:`~invenio_config.mapping.LazyConfigMixin`).
+
+Other values, e.g. lambdas or instances of other classes, cannot be
+exported. Loading a file therefore never runs code other than importing the
+referenced modules.
+"""
+
+import importlib
+import marshal
+import os
+import re
+import struct
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta, timezone
+from functools import partial
+from types import BuiltinFunctionType, FunctionType, ModuleType
+
+from .frozen import FrozenDict
+from .mapping import LazyConfigMixin, LazyValue, extend_config
+
+#: Version of the binary format.
+BINARY_FORMAT_VERSION = 2
+
+_MAGIC = b"ICFB"
+_HEADER = struct.Struct("<4sHBB")
+
+#: First item of tagged tuples.
+_TAG = "\x00invenio-config"
+
+_PLAIN_TYPES = frozenset([str, bytes, int, float, complex, bool, type(None)])
+_REFERENCE_TYPES = (type, FunctionType, BuiltinFunctionType, ModuleType)
+
+
+def _resolve_reference(ref):
+    """Import the object of a ``module:qualname`` reference."""
+    module_name, _, qualname = ref.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in qualname.split(".") if qualname else ():
+        obj = getattr(obj, name)
+    return obj
+
+
+def _import_reference(obj):
+    """Return the import reference of an object, or ``None``."""
+    if isinstance(obj, ModuleType):
+        ref = obj.__name__
+    else:
+        module = getattr(obj, "__module__", None)
+        qualname = getattr(obj, "__qualname__", None)
+        if not module or not qualname or "<" in qualname:
+            return None
+        ref = "{0}:{1}".format(module, qualname)
+    try:
+        if _resolve_reference(ref) is obj:
+            return ref
+    except Exception:
+        pass
+    return None
+
+
+def _encode(value, kinds):
+    """Encode a value, adding the kinds of tagged values found to ``kinds``."""
+    cls = type(value)
+    if cls in _PLAIN_TYPES:
+        return value
+    if cls is dict:
+        return {_encode(k, kinds): _encode(v, kinds) for k, v in value.items()}
+    if cls in (list, tuple, set, frozenset):
+        return cls(_encode(item, kinds) for item in value)
+
+    if cls is timedelta:
+        kinds.add("eager")
+        return (_TAG, "timedelta", (value.days, value.seconds, value.microseconds))
+    if cls in (datetime, date, time) and (
+        getattr(value, "tzinfo", None) is None or type(value.tzinfo) is timezone
+    ):
+        kinds.add("eager")
+        return (_TAG, cls.__name__, value.isoformat())
+    if cls is FrozenDict:
+        kinds.add("eager")
+        return (_TAG, "frozendict", _encode(dict(value), kinds))
+    if isinstance(value, re.Pattern):
+        kinds.add("eager")
+        return (_TAG, "pattern", (value.pattern, value.flags))
+
+    if isinstance(value, _REFERENCE_TYPES):
+        ref = _import_reference(value)
+        if ref is not None:
+            kinds.add("lazy")
+            return (_TAG, "import", ref)
+    raise TypeError(
+        "value of type {0} is neither plain data nor importable: {1!r}".format(
+            cls.__name__, value
+        )
+    )
+
+
+_DECODERS = {
+    "timedelta": lambda data: timedelta(*data),
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "frozendict": lambda data: FrozenDict(_decode(data)),
+    "pattern": lambda data: re.compile(*data),
+    "import": _resolve_reference,
+}
+
+
+def _decode(value):
+    """Decode an encoded value."""
+    cls = type(value)
+    if cls is tuple:
+        if len(value) == 3 and type(value[0]) is str and value[0] == _TAG:
+            return _DECODERS[value[1]](value[2])
+        return tuple(_decode(item) for item in value)
+    if cls is dict:
+        return {_decode(k): _decode(v) for k, v in value.items()}
+    if cls in (list, set, frozenset):
+        return cls(_decode(item) for item in value)
+    return value
+
+
+def dump_binary_config(config, path):
+    """Export a configuration to a binary file.
+
+    The file is replaced atomically.
+
+    :param config: The configuration, e.g. ``app.config``.
+    :param path: Path of the binary file.
+    :raises TypeError: If a value cannot be exported, naming its key.
+
+    .. versionadded:: 1.2.0
+    """
+    payload = {"plain": {}, "eager": {}, "lazy": {}}
+    for key, value in config.items():
+        kinds = set()
+        try:
+            encoded = _encode(value, kinds)
+        except TypeError as exc:
+            raise TypeError("Cannot export {0}: {1}".format(key, exc)) from None
+        kind = "lazy" if "lazy" in kinds else "eager" if kinds else "plain"
+        payload[kind][key] = encoded
+    data = _HEADER.pack(
+        _MAGIC, BINARY_FORMAT_VERSION, *sys.version_info[:2]
+    ) + marshal.dumps(payload)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmppath = tempfile.mkstemp(dir=directory, prefix=".config-")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmppath, path)
+    except BaseException:
+        os.unlink(tmppath)
+        raise
+
+
+def load_binary_config(path, lazy=True):
+    """Load a configuration exported by :func:`dump_binary_config`.
+
+    :param path: Path of the binary file.
+    :param lazy: Return :class:`~invenio_config.mapping.LazyValue`
+        placeholders for values with import references, instead of resolving
+        them.
+    :returns: A dictionary.
+    :raises ValueError: If the file is not a binary configuration, or was
+        exported with another format or Python version.
+
+    .. versionadded:: 1.2.0
+    """
+    with open(path, "rb") as fp:
+        data = fp.read()
+    try:
+        magic, version, major, minor = _HEADER.unpack_from(data)
+    except struct.error:
+        magic = None
+    if magic != _MAGIC:
+        raise ValueError("{0} is not a binary configuration file".format(path))
+    if version != BINARY_FORMAT_VERSION or (major, minor) != sys.version_info[:2]:
+        raise ValueError(
+            "{0} was exported with format version {1} and Python {2}.{3}".format(
+                path, version, major, minor
+            )
+        )
+
+    payload = marshal.loads(data[_HEADER.size :])
+    values = payload["plain"]
+    for key, value in payload["eager"].items():
+        values[key] = _decode(value)
+    for key, value in payload["lazy"].items():
+        values[key] = LazyValue(partial(_decode, value)) if lazy else _decode(value)
+    return values
+
+
+class InvenioConfigBinary(object):
+    """Load configuration from a binary export.
+
+    See :func:`dump_binary_config` to export the configuration.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app=None, path=None, lazy=True, silent=False):
+        """Initialize extension.
+
+        :param path: Path of the binary file.
+        :param lazy: Resolve import references when their key is first read.
+        :param silent: Ignore missing files.
+        """
+        self.path = path
+        self.lazy = lazy
+        self.silent = silent
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Initialize Flask application."""
+        if not self.path:
+            return
+        try:
+            values = load_binary_config(self.path, lazy=self.lazy)
+        except FileNotFoundError:
+            if self.silent:
+                return
+            raise
+        if self.lazy:
+            extend_config(app, LazyConfigMixin)
+        app.logger.debug(f"Loading config from {self.path}")
+        app.config.update(values)
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration file bytecode cache.
+
+Python configuration files are not modules, so the import system never
+caches their bytecode. :func:`compile_config_file` stores the compiled code
+of a configuration file in a cache directory, keyed by the path of the file,
+and reuses it as long as the size and modification time of the file match.
+If they do not but the content hash still does, e.g. because the file was
+copied again during a deployment, the cached code is reused as well.
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import struct
+import tempfile
+import types
+
+_HEADER = struct.Struct("<4sQQ32s")
+
+
+def _cache_filename(cache_dir, filename):
+    """Return the cache file of a configuration file."""
+    digest = hashlib.sha256(os.path.abspath(filename).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest[:32] + ".cfgc")
+
+
+def _read_cache(cache_filename):
+    """Read a cache file, returning its header fields and code."""
+    try:
+        with open(cache_filename, "rb") as fp:
+            data = fp.read()
+        magic, size, mtime_ns, digest = _HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if magic != importlib.util.MAGIC_NUMBER:
+        return None
+    return size, mtime_ns, digest, data[_HEADER.size :]
+
+
+def _write_cache(cache_filename, stat, digest, code):
+    """Write a cache file atomically, ignoring errors."""
+    data = _HEADER.pack(
+        importlib.util.MAGIC_NUMBER, stat.st_size, stat.st_mtime_ns, digest
+    ) + marshal.dumps(code)
+    try:
+        os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+        fd, tmppath = tempfile.mkstemp(dir=os.path.dirname(cache_filename))
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmppath, cache_filename)
+    except OSError:
+        pass
+
+
+def compile_config_file(filename, cache_dir=None):
+    """Compile a Python configuration file, using the bytecode cache.
+
+    :param filename: The path of the configuration file.
+    :param cache_dir: The cache directory, or ``None`` to always compile.
+    :returns: A code object.
+
+    .. versionadded:: 1.2.0
+    """
+    if cache_dir:
+        cache_filename = _cache_filename(cache_dir, filename)
+        cached = _read_cache(cache_filename)
+        stat = os.stat(filename)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            try:
+                return marshal.loads(cached[3])
+            except (EOFError, ValueError, TypeError):
+                cached = None
+
+    with open(filename, "rb") as fp:
+        source = fp.read()
+    if not cache_dir:
+        return compile(source, filename, "exec")
+
+    digest = hashlib.sha256(source).digest()
+    code = None
+    if cached and cached[2] == digest:
+        try:
+            code = marshal.loads(cached[3])
+        except (EOFError, ValueError, TypeError):
+            pass
+    if code is None:
+        code = compile(source, filename, "exec")
+    _write_cache(cache_filename, stat, digest, code)
+    return code
+
+
+def load_config_file(filename, cache_dir=None):
+    """Execute a Python configuration file and return its uppercase values.
+
+    Behaves like :meth:`flask.Config.from_pyfile` without modifying any
+    configuration.
+
+    :param filename: The path of the file.
+    :param cache_dir: The bytecode cache directory, see
+        :func:`compile_config_file`.
+    :returns: Dictionary of the uppercase variables defined in the file.
+
+    .. versionadded:: 1.2.0
+    """
+    module = types.ModuleType("config")
+    module.__file__ = filename
+    exec(compile_config_file(filename, cache_dir=cache_dir), module.__dict__)
+    return {key: getattr(module, key) for key in dir(module) if key.isupper()}
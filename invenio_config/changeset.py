@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration change-sets.
+
+Refreshing the configuration of a running application, e.g. after the
+environment of a long-running worker changed, does not require running the
+whole configuration loader again. The :class:`IncrementalConfigLoader`
+remembers the values contributed by each configuration source, re-evaluates
+only the sources that may have changed, and writes back only the keys whose
+value changed:
+
+.. code-block:: python
+
+    loader = IncrementalConfigLoader(app, [
+        ("module", InvenioConfigModule(module="myapp.config")),
+        ("instance_folder", InvenioConfigInstanceFolder()),
+        ("environment", InvenioConfigEnvironment(prefix="APP_")),
+    ])
+    ...
+    loader.refresh("environment")
+
+A source is any object with a ``collect(app, config)`` method returning the
+values it contributes, ``config`` being the configuration it applies to, or
+a dictionary of static values.
+"""
+
+from collections import ChainMap
+
+from .signals import config_changed
+
+_missing = object()
+
+
+class ConfigChangeSet(object):
+    """Minimal set of changes between two configuration states.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, changed=None, removed=None):
+        """Initialize change-set.
+
+        :param changed: Dictionary of the added or changed values.
+        :param removed: Set of the removed keys.
+        """
+        self.changed = changed or {}
+        self.removed = removed or set()
+
+    @property
+    def keys(self):
+        """Return the set of keys affected by the change-set."""
+        return set(self.changed) | self.removed
+
+    def __bool__(self):
+        """Check if the change-set contains any change."""
+        return bool(self.changed or self.removed)
+
+    def __repr__(self):
+        """Represent the change-set."""
+        return "<ConfigChangeSet changed={0!r} removed={1!r}>".format(
+            sorted(self.changed), sorted(self.removed)
+        )
+
+    def apply(self, app, source=None):
+        """Write the changes to the application configuration.
+
+        The changed values are written in a single :meth:`dict.update` call,
+        then the :data:`invenio_config.signals.config_changed` signal is sent.
+
+        :param app: The Flask application.
+        :param source: Description of the changes, sent with the signal.
+        """
+        if not self:
+            return
+        if self.changed:
+            app.config.update(self.changed)
+        for key in self.removed:
+            app.config.pop(key, None)
+        config_changed.send(app, keys=self.keys, source=source)
+
+
+def diff_config(old, new):
+    """Compute the change-set turning one configuration state into another.
+
+    Values are compared by identity first, then by equality.
+
+    :param old: The old configuration mapping.
+    :param new: The new configuration mapping.
+    :returns: A :class:`ConfigChangeSet`.
+
+    .. versionadded:: 1.2.0
+    """
+    changed = {}
+    for key, value in new.items():
+        old_value = old.get(key, _missing)
+        if old_value is not value and (old_value is _missing or old_value != value):
+            changed[key] = value
+    return ConfigChangeSet(changed, {key for key in old if key not in new})
+
+
+class IncrementalConfigLoader(object):
+    """Re-apply configuration sources incrementally.
+
+    The sources are given in loading order and evaluated once when the
+    loader is created. On :meth:`refresh`, only the requested sources are
+    evaluated again, and the values they contribute are merged with the
+    remembered contributions of the other sources, respecting their order.
+
+    Like :class:`invenio_config.reload.ConfigFileWatcher`, keys which were
+    modified after they were last written by the loader are left untouched,
+    and keys no longer contributed by any source keep their last value.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app, sources, load=False):
+        """Initialize loader.
+
+        :param app: The Flask application.
+        :param sources: List of ``(name, source)`` tuples, in loading order.
+        :param load: Write the values of the sources to the application
+            configuration. Otherwise they are expected to be loaded already.
+        """
+        self.app = app
+        self.sources = list(sources)
+        self._contributions = {}
+        self._merged = {}
+        if load:
+            self.refresh()
+        else:
+            self._merged = self._merge(self.names)
+            for key, value in self._merged.items():
+                current = dict.get(app.config, key, _missing)
+                if current is not _missing and current == value:
+                    self._merged[key] = current
+
+    @property
+    def names(self):
+        """Return the names of the sources, in loading order."""
+        return [name for name, source in self.sources]
+
+    def contributions(self, name):
+        """Return the values last contributed by a source."""
+        return self._contributions.get(name, {})
+
+    def _merge(self, names):
+        """Evaluate the given sources and merge all contributions."""
+        merged = {}
+        view = ChainMap(merged, self.app.config)
+        for name, source in self.sources:
+            if name in names or name not in self._contributions:
+                if isinstance(source, dict):
+                    values = dict(source)
+                else:
+                    values = source.collect(self.app, view)
+                self._contributions[name] = values
+            merged.update(self._contributions[name])
+        return merged
+
+    def diff(self, *names):
+        """Compute the changes of the given sources without applying them.
+
+        :param names: Names of the sources to evaluate again, defaults to all.
+        :returns: A tuple of the :class:`ConfigChangeSet` and the merged
+            contributions.
+        """
+        unknown = set(names) - set(self.names)
+        if unknown:
+            raise KeyError(", ".join(sorted(unknown)))
+
+        merged = self._merge(set(names or self.names))
+        changed = {}
+        for key, value in merged.items():
+            old = self._merged.get(key, _missing)
+            if old is not _missing:
+                if old is value or old == value:
+                    # Keep the identity of unchanged values.
+                    merged[key] = old
+                    continue
+                if dict.get(self.app.config, key, _missing) is not old:
+                    # Modified since last written.
+                    continue
+            changed[key] = value
+        # Keys no longer contributed keep their last value.
+        for key, old in self._merged.items():
+            merged.setdefault(key, old)
+        return ConfigChangeSet(changed), merged
+
+    def refresh(self, *names):
+        """Evaluate the given sources again and apply the changed values.
+
+        :param names: Names of the sources to evaluate again, defaults to all.
+        :returns: The applied :class:`ConfigChangeSet`.
+        """
+        changeset, merged = self.diff(*names)
+        self._merged = merged
+        changeset.apply(self.app, source=", ".join(names or self.names))
+        return changeset
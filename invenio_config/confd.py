@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration directory.
+
+Loads configuration split over several files in the directory
+``<app.name>.d`` next to the ``cfg`` file of
+:class:`~invenio_config.folder.InvenioConfigInstanceFolder`, e.g.::
+
+    instance/
+        invenio.cfg
+        invenio.d/
+            10-search.cfg
+            20-storage.toml
+            30-oauth.yaml
+
+Python files (``.cfg`` and ``.py``) are executed and structured files are
+parsed (see :mod:`invenio_config.structured`). Other files are ignored.
+"""
+
+import copy
+import hashlib
+import os
+
+from .bytecode import load_config_file
+from .ext import get_extension, track_stage
+from .signals import config_changed
+from .structured import LOADERS, load_structured
+
+_missing = object()
+
+#: Loaded values of each file, keyed by path.
+_fragments = {}
+
+
+def _load_fragment(filename, cache_dir=None):
+    """Load a configuration file, reusing the values if it did not change.
+
+    :returns: The values of the file, or ``None`` if it is not supported.
+    """
+    ext = os.path.splitext(filename)[1][1:]
+    if ext not in ("cfg", "py") and ext not in LOADERS:
+        return None
+
+    stat = os.stat(filename)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _fragments.get(filename)
+    if cached and cached[0] == signature:
+        return cached[2]
+
+    with open(filename, "rb") as fp:
+        source = fp.read()
+    digest = hashlib.sha256(source).digest()
+    if cached and cached[1] == digest:
+        values = cached[2]
+    elif ext in LOADERS:
+        values = load_structured(filename, source.decode("utf-8"))
+    else:
+        values = load_config_file(filename, cache_dir=cache_dir)
+    _fragments[filename] = (signature, digest, values)
+    return values
+
+
+class InvenioConfigDirectory(object):
+    """Load configuration from all files in a directory, in sorted order.
+
+    Like entry points in
+    :class:`~invenio_config.entrypoint.InvenioConfigEntryPointModule`, files
+    are loaded in alphabetical ascending order, so values of ``20-name.cfg``
+    override values of ``10-name.cfg``.
+
+    The values of each file are cached for the process together with the
+    size, modification time and content hash of the file. Unchanged files are
+    neither read nor executed again when another application is created or
+    when :meth:`reload` is called. Each application gets its own copy of the
+    values, so modifying them in place does not affect other applications.
+    Python files can also use a bytecode cache directory, which persists
+    across restarts (see :mod:`invenio_config.bytecode`).
+
+    The loader is available as
+    ``app.extensions['invenio-config'].config_directory``, to :meth:`reload`
+    the directory.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app=None, cache_dir=None):
+        """Initialize extension.
+
+        :param cache_dir: Directory of the bytecode cache.
+        """
+        self.cache_dir = cache_dir
+        self.values = {}
+        self._applied = {}
+        if app:
+            self.init_app(app)
+
+    @staticmethod
+    def get_directory(app):
+        """Return the configuration directory of an application."""
+        return os.path.join(app.config.root_path, "{0}.d".format(app.name))
+
+    def load_files(self, app):
+        """Load the values of each file.
+
+        :param app: The Flask application.
+        :returns: A list of ``(filename, values)`` tuples in loading order,
+            the values being shared with other applications.
+        """
+        directory = self.get_directory(app)
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return []
+
+        files = []
+        for name in names:
+            filename = os.path.join(directory, name)
+            if name.startswith(".") or not os.path.isfile(filename):
+                continue
+            fragment = _load_fragment(filename, cache_dir=self.cache_dir)
+            if fragment is not None:
+                app.logger.debug(f"Loading config from {filename}")
+                files.append((filename, fragment))
+        return files
+
+    def load(self, app):
+        """Load and merge the values of all files.
+
+        :param app: The Flask application.
+        :returns: The merged values, shared with other applications.
+        """
+        values = {}
+        for filename, fragment in self.load_files(app):
+            values.update(fragment)
+        return values
+
+    def init_app(self, app):
+        """Initialize Flask application."""
+        self.values = {}
+        self._applied = {}
+        for filename, fragment in self.load_files(app):
+            self.values.update(fragment)
+            values = copy.deepcopy(fragment)
+            self._applied.update(values)
+            with track_stage(app, "instance_folder", filename):
+                app.config.update(values)
+        get_extension(app).config_directory = self
+
+    def reload(self, app):
+        """Reload the directory, applying only the changed values.
+
+        Only files which changed are read again. Keys which were overridden
+        by later configuration sources, or which are set by the keyword
+        arguments or environment variables of the configuration loader (see
+        :attr:`invenio_config.ext.InvenioConfig.pinned_keys`), are left
+        untouched, and keys removed from all files keep their last value.
+        Sends :data:`invenio_config.signals.config_changed` if values
+        changed.
+
+        :param app: The Flask application.
+        :returns: The set of changed keys.
+        """
+        values = self.load(app)
+        ext = app.extensions.get("invenio-config")
+        pinned = ext.pinned_keys if ext is not None else ()
+        changes = {}
+        for key, value in values.items():
+            old = self.values.get(key, _missing)
+            if old is value or key in pinned:
+                continue
+            if old is not _missing:
+                if old == value:
+                    # Keep the identity of unchanged values.
+                    values[key] = old
+                    continue
+                if app.config.get(key, _missing) is not self._applied.get(key):
+                    # Overridden by a later configuration source.
+                    continue
+            changes[key] = value
+
+        self.values = values
+        if changes:
+            changes = copy.deepcopy(changes)
+            self._applied.update(changes)
+            app.config.update(changes)
+            config_changed.send(app, keys=set(changes), source=self.get_directory(app))
+        return set(changes)
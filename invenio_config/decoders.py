@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio environment variable decoders.
+
+Decoders convert the string value of an environment variable to the type
+expected by a configuration key, see
+:class:`~invenio_config.env.InvenioConfigEnvironment`. They raise
+:class:`ValueError` for invalid values.
+"""
+
+import json
+import re
+from datetime import timedelta
+
+_TRUE = frozenset(["1", "true", "yes", "on", "y", "t"])
+_FALSE = frozenset(["0", "false", "no", "off", "n", "f", ""])
+
+_DURATION = re.compile(
+    r"^\s*(?:(?P<days>\d+(?:\.\d+)?)\s*d)?\s*(?:(?P<hours>\d+(?:\.\d+)?)\s*h)?"
+    r"\s*(?:(?P<minutes>\d+(?:\.\d+)?)\s*m(?:in)?)?"
+    r"\s*(?:(?P<seconds>\d+(?:\.\d+)?)\s*s)?"
+    r"\s*(?:(?P<milliseconds>\d+(?:\.\d+)?)\s*ms)?\s*$",
+    re.IGNORECASE,
+)
+
+_BYTESIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgtp]?)(i?)b?\s*$", re.IGNORECASE)
+
+
+def decode_bool(value):
+    """Decode a boolean, e.g. ``true``, ``False``, ``1``, ``off``."""
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError("{0!r} is not a boolean".format(value))
+
+
+def decode_int(value):
+    """Decode an integer, e.g. ``42`` or ``1_000``."""
+    return int(value.strip(), 10)
+
+
+def decode_float(value):
+    """Decode a float, e.g. ``1e5`` or ``0.5``."""
+    return float(value.strip())
+
+
+def decode_str_list(value):
+    """Decode a comma separated list of strings, or a JSON array."""
+    stripped = value.strip()
+    if stripped.startswith("["):
+        value = json.loads(stripped)
+        if not isinstance(value, list):  # pragma: no cover
+            raise ValueError("{0!r} is not a list".format(stripped))
+        return [str(item) for item in value]
+    return [item.strip() for item in stripped.split(",") if item.strip()]
+
+
+def decode_json(value):
+    """Decode a JSON document."""
+    return json.loads(value)
+
+
+def decode_duration(value):
+    """Decode a duration, e.g. ``30`` (seconds), ``5m``, ``1h30m``, ``2d``.
+
+    :returns: A :class:`~datetime.timedelta`.
+    """
+    try:
+        parts = {"seconds": float(value)}
+    except ValueError:
+        match = _DURATION.match(value)
+        if not match or not any(match.groups()):
+            raise ValueError("{0!r} is not a duration".format(value))
+        parts = {k: float(v) for k, v in match.groupdict().items() if v}
+    try:
+        return timedelta(**parts)
+    except OverflowError:
+        raise ValueError("{0!r} is out of range".format(value))
+
+
+def decode_bytesize(value):
+    """Decode a size in bytes, e.g. ``512``, ``10MB`` or ``1.5GiB``.
+
+    Units without ``i`` are powers of 1000, units with ``i`` powers of 1024.
+
+    :returns: An integer.
+    """
+    match = _BYTESIZE.match(value)
+    if not match:
+        raise ValueError("{0!r} is not a size".format(value))
+    number, unit, binary = match.groups()
+    exponent = "kmgtp".find(unit.lower()) + 1 if unit else 0
+    try:
+        return int(float(number) * (1024 if binary else 1000) ** exponent)
+    except OverflowError:
+        raise ValueError("{0!r} is out of range".format(value))
+
+
+#: Decoders of the supported types.
+DECODERS = {
+    bool: decode_bool,
+    int: decode_int,
+    float: decode_float,
+    str: str,
+    list: decode_str_list,
+    dict: decode_json,
+    "bool": decode_bool,
+    "int": decode_int,
+    "float": decode_float,
+    "str": str,
+    "str_list": decode_str_list,
+    "json": decode_json,
+    "duration": decode_duration,
+    "bytesize": decode_bytesize,
+}
+
+
+def get_decoder(type_):
+    """Return the decoder of a type.
+
+    :param type_: A key of :data:`DECODERS`, or a callable taking the string
+        value and returning the decoded value.
+    :returns: The decoder.
+    """
+    try:
+        return DECODERS[type_]
+    except (KeyError, TypeError):
+        if callable(type_):
+            return type_
+        raise ValueError("Unknown environment variable type {0!r}".format(type_))
@@ -5,6 +5,10 @@
 """Invenio default configuration."""
 
 import warnings
+from collections.abc import Mapping
+
+from .derived import register_derived
+from .frozen import FrozenDict
 
 #: Allowed tags used for html sanitizing by bleach.
 ALLOWED_HTML_TAGS = [
@@ -50,10 +54,70 @@ ALLOWED_HTML_ATTRS = {
 }
 
 
+def compile_allowed_html_tags(tags):
+    """Build a set of allowed tags for constant time membership checks.
+
+    :param tags: List of allowed tags.
+    :returns: A frozenset, or ``None`` if ``tags`` is not a list of tags.
+
+    .. versionadded:: 1.2.0
+    """
+    if isinstance(tags, (str, bytes)):
+        return None
+    try:
+        return frozenset(tags)
+    except TypeError:
+        return None
+
+
+def compile_allowed_html_attrs(attrs):
+    """Build the complete set of allowed attributes of each tag.
+
+    The attributes allowed for all tags (key ``"*"``) are merged into the set
+    of each tag. The ``"*"`` key holds the attributes of tags which are not
+    listed.
+
+    :param attrs: Dictionary of allowed attributes per tag.
+    :returns: A :class:`~invenio_config.frozen.FrozenDict` of frozensets, or
+        ``None`` if ``attrs`` is not a dictionary of attribute lists (e.g. if
+        it uses callables).
+
+    .. versionadded:: 1.2.0
+    """
+    if not isinstance(attrs, Mapping):
+        return None
+    try:
+        wildcard = frozenset(attrs.get("*", ()))
+        return FrozenDict(
+            [("*", wildcard)]
+            + [(tag, wildcard | frozenset(names)) for tag, names in attrs.items()]
+        )
+    except TypeError:
+        return None
+
+
+register_derived(
+    "ALLOWED_HTML_TAGS_LOOKUP", ["ALLOWED_HTML_TAGS"], compile_allowed_html_tags
+)
+register_derived(
+    "ALLOWED_HTML_ATTRS_LOOKUP", ["ALLOWED_HTML_ATTRS"], compile_allowed_html_attrs
+)
+
+
 class InvenioConfigDefault(object):
     """Load configuration from module.
 
+    Lookup structures compiled from the final ``ALLOWED_HTML_TAGS`` and
+    ``ALLOWED_HTML_ATTRS`` (see :func:`compile_allowed_html_tags` and
+    :func:`compile_allowed_html_attrs`) are registered as the derived values
+    ``ALLOWED_HTML_TAGS_LOOKUP`` and ``ALLOWED_HTML_ATTRS_LOOKUP``, which
+    follow later changes of the configuration (see
+    :func:`invenio_config.derived.get_derived`).
+
     .. versionadded:: 1.0.0
+
+    .. versionchanged:: 1.2.0
+       Register the precompiled HTML sanitizing lookup structures.
     """
 
     def __init__(self, app=None):
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio derived configuration values.
+
+Extensions often compute values from the configuration, e.g. compiled
+regular expressions from URL patterns or parsed durations. A derived value
+is declared once as a function of some configuration keys:
+
+.. code-block:: python
+
+    @register_derived("SEARCH_URL_REGEX", ["SEARCH_URL_PATTERN"])
+    def compile_search_url(pattern):
+        return re.compile(pattern)
+
+and read with :func:`get_derived`. It is computed on first access and
+memoized per application. It is computed again when one of its keys is set
+to another value, e.g. by a configuration loader or when a configuration
+file is reloaded, which is detected by comparing the identity of the values
+and through the :data:`invenio_config.signals.config_changed` signal.
+Modifying a value in place is not detected.
+"""
+
+from collections import namedtuple
+from operator import is_
+
+from .ext import get_extension
+from .signals import config_changed
+
+#: Registered derived values, keyed by name.
+_registry = {}
+
+
+class DerivedValue(namedtuple("DerivedValue", ["name", "keys", "func"])):
+    """Declaration of a value derived from configuration keys.
+
+    .. versionadded:: 1.2.0
+    """
+
+    __slots__ = ()
+
+
+def register_derived(name, keys, func=None):
+    """Register a value derived from configuration keys.
+
+    Can be used as decorator if ``func`` is not given.
+
+    :param name: The name of the derived value.
+    :param keys: The configuration keys it depends on.
+    :param func: Function computing the value, called with the values of the
+        keys (``None`` for missing keys) as positional arguments.
+    :returns: The function.
+
+    .. versionadded:: 1.2.0
+    """
+    if func is None:
+        return lambda func: register_derived(name, keys, func)
+    _registry[name] = DerivedValue(name, tuple(keys), func)
+    return func
+
+
+class DerivedConfigCache(object):
+    """Memoized derived values of an application.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app):
+        """Initialize cache.
+
+        :param app: The Flask application.
+        """
+        self.app = app
+        self._entries = {}
+
+    def get(self, name):
+        """Return a derived value, computing it if needed.
+
+        :param name: The name of the derived value.
+        :raises KeyError: If no derived value is registered with this name.
+        """
+        derived = _registry[name]
+        config = self.app.config
+        values = tuple([config.get(key) for key in derived.keys])
+        entry = self._entries.get(name)
+        if (
+            entry is not None
+            and entry[0] is derived
+            and all(map(is_, entry[1], values))
+        ):
+            return entry[2]
+        result = derived.func(*values)
+        self._entries[name] = (derived, values, result)
+        return result
+
+    def invalidate(self, keys=None):
+        """Forget the derived values depending on the given keys.
+
+        :param keys: The changed configuration keys, or ``None`` for all.
+        """
+        if keys is None:
+            self._entries.clear()
+            return
+        keys = set(keys)
+        for name, entry in list(self._entries.items()):
+            if keys.intersection(entry[0].keys):
+                self._entries.pop(name, None)
+
+
+def get_derived(app, name):
+    """Return a derived value of an application.
+
+    :param app: The Flask application.
+    :param name: The name of the derived value.
+    :returns: The memoized value.
+
+    .. versionadded:: 1.2.0
+    """
+    ext = get_extension(app)
+    if ext.derived is None:
+        ext.derived = DerivedConfigCache(app)
+    return ext.derived.get(name)
+
+
+@config_changed.connect
+def _invalidate(app, keys=None, **kwargs):
+    """Forget the derived values depending on changed keys."""
+    ext = app.extensions.get("invenio-config")
+    if ext is not None and ext.derived is not None:
+        ext.derived.invalidate(keys)
@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration entry point discovery index.
+
+Listing the entry points of a group reads the metadata of every installed
+distribution. The entry point index stores the entry points of some groups in
+a file, e.g. at image build time:
+
+.. code-block:: python
+
+    build_entry_point_index("/opt/invenio/entry_points.json")
+
+Loaders given the index read the entry points from it as long as no
+distribution was installed or removed since, which is detected by comparing
+the modification times and the distribution metadata directories
+(``.dist-info`` and ``.egg-info``) of the site-packages directories (see
+:func:`site.getsitepackages`). Other :data:`sys.path` entries, such as the
+current working directory or the directory of the running script, are not
+considered, so an index built at image build time stays valid whichever
+process uses it. The index file should not be stored in a site-packages
+directory.
+"""
+
+import json
+import os
+import site
+from collections import namedtuple
+from importlib.metadata import EntryPoint
+
+from invenio_base.utils import entry_points as _entry_points
+
+#: Version of the index format.
+ENTRY_POINT_INDEX_VERSION = 1
+
+#: Distribution of an indexed entry point.
+IndexedDistribution = namedtuple("IndexedDistribution", ["name", "version"])
+
+_indexes = {}
+
+
+class IndexedEntryPoint(object):
+    """Entry point read from the index.
+
+    .. versionadded:: 1.2.0
+    """
+
+    __slots__ = ("name", "value", "group", "dist")
+
+    def __init__(self, name, value, group, dist=None):
+        """Initialize entry point."""
+        self.name = name
+        self.value = value
+        self.group = group
+        self.dist = dist
+
+    def load(self):
+        """Load the object the entry point refers to."""
+        return EntryPoint(self.name, self.value, self.group).load()
+
+    def __repr__(self):
+        """Represent the entry point."""
+        return "IndexedEntryPoint(name={0!r}, value={1!r}, group={2!r})".format(
+            self.name, self.value, self.group
+        )
+
+
+def _site_packages():
+    """Return the site-packages directories."""
+    paths = list(getattr(site, "getsitepackages", list)())
+    if hasattr(site, "getusersitepackages"):
+        paths.append(site.getusersitepackages())
+    return paths
+
+
+def _paths_signature():
+    """Return the state of the site-packages directories.
+
+    Each existing directory is described by its modification time and the
+    sorted names of the distribution metadata directories it contains.
+    """
+    signature = []
+    for path in _site_packages():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            names = os.listdir(path)
+        except OSError:
+            continue
+        dists = sorted(n for n in names if n.endswith((".dist-info", ".egg-info")))
+        signature.append([path, mtime, dists])
+    return signature
+
+
+def build_entry_point_index(path, groups=("invenio_config.module",)):
+    """Index the entry points of some groups and write the index to a file.
+
+    :param path: Path of the JSON file.
+    :param groups: The entry point groups to index.
+
+    .. versionadded:: 1.2.0
+    """
+    index = {
+        "version": ENTRY_POINT_INDEX_VERSION,
+        "paths": _paths_signature(),
+        "groups": {},
+    }
+    for group in groups:
+        index["groups"][group] = [
+            [
+                ep.name,
+                ep.value,
+                getattr(getattr(ep, "dist", None), "name", None),
+                getattr(getattr(ep, "dist", None), "version", None),
+            ]
+            for ep in _entry_points(group=group)
+        ]
+    with open(path, "w") as fp:
+        json.dump(index, fp)
+    _indexes.pop(path, None)
+
+
+def load_entry_point_index(path):
+    """Load an entry point index if it is still current.
+
+    The parsed index is cached for the process.
+
+    :param path: Path of the JSON file.
+    :returns: The index, or ``None`` if it is missing or outdated.
+
+    .. versionadded:: 1.2.0
+    """
+    index = _indexes.get(path)
+    if index is None:
+        try:
+            with open(path) as fp:
+                index = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != ENTRY_POINT_INDEX_VERSION:
+            return None
+        _indexes[path] = index
+    if index["paths"] != _paths_signature():
+        return None
+    return index
+
+
+def entry_points(group, index=None):
+    """Return the entry points of a group, using the index if possible.
+
+    :param group: The entry point group.
+    :param index: Path of an entry point index file.
+    :returns: A list of entry points.
+
+    .. versionadded:: 1.2.0
+    """
+    if index:
+        data = load_entry_point_index(index)
+        if data is not None and group in data["groups"]:
+            return [
+                IndexedEntryPoint(
+                    name, value, group, IndexedDistribution(dist_name, version)
+                )
+                for name, value, dist_name, version in data["groups"][group]
+            ]
+    return _entry_points(group=group)
@@ -5,9 +5,133 @@
 
 """Invenio entry point module configuration."""
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from operator import attrgetter
+from time import perf_counter
 
-from invenio_base.utils import entry_points
+from .discovery import entry_points
+from .ext import track_stage
+from .mapping import LazyConfigMixin, LazyValue, extend_config
+
+#: Version of the key index format.
+KEY_INDEX_VERSION = 1
+
+
+def _entry_point_version(ep):
+    """Return the version of the distribution providing an entry point."""
+    return getattr(getattr(ep, "dist", None), "version", None)
+
+
+def build_key_index(entry_point_group="invenio_config.module"):
+    """Build an index of the configuration keys defined by each entry point.
+
+    Building the index imports every configuration module of the group, so it
+    should be done once, e.g. during image build, and stored with
+    :func:`dump_key_index`.
+
+    :param entry_point_group: The entry point group name.
+    :returns: A JSON serializable dictionary.
+
+    .. versionadded:: 1.2.0
+    """
+    index = {}
+    for ep in entry_points(group=entry_point_group):
+        obj = ep.load()
+        index[ep.name] = {
+            "value": ep.value,
+            "version": _entry_point_version(ep),
+            "keys": sorted(key for key in dir(obj) if key.isupper()),
+        }
+    return {
+        "version": KEY_INDEX_VERSION,
+        "group": entry_point_group,
+        "entry_points": index,
+    }
+
+
+def dump_key_index(path, entry_point_group="invenio_config.module"):
+    """Build the key index of an entry point group and write it to a file.
+
+    :param path: Path of the JSON file.
+    :param entry_point_group: The entry point group name.
+
+    .. versionadded:: 1.2.0
+    """
+    with open(path, "w") as fp:
+        json.dump(build_key_index(entry_point_group), fp)
+
+
+def load_key_index(path):
+    """Load a key index written by :func:`dump_key_index`.
+
+    :param path: Path of the JSON file.
+    :returns: The index, or ``None`` if the file is missing or outdated.
+
+    .. versionadded:: 1.2.0
+    """
+    try:
+        with open(path) as fp:
+            index = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != KEY_INDEX_VERSION:
+        return None
+    return index
+
+
+def _indexed_keys(index, ep):
+    """Return the indexed keys of an entry point, if the index is current."""
+    indexed = index.get(ep.name)
+    if (
+        indexed
+        and indexed["value"] == ep.value
+        and indexed["version"] == _entry_point_version(ep)
+    ):
+        return indexed["keys"]
+    return None
+
+
+def _timed_load(ep):
+    """Load an entry point and measure the time it took."""
+    start = perf_counter()
+    obj = ep.load()
+    return obj, perf_counter() - start
+
+
+def _warn_concurrent_import(app, ep, exc):
+    """Log that the concurrent import of an entry point failed."""
+    app.logger.warning(
+        f"Concurrent import of {ep.value} failed, importing it sequentially",
+        exc_info=exc,
+    )
+
+
+class _LazyEntryPoint(object):
+    """Entry point whose object is loaded once on first use."""
+
+    def __init__(self, ep):
+        """Initialize lazy entry point."""
+        self.ep = ep
+        self._obj = None
+
+    def load(self):
+        """Load the entry point object."""
+        if self._obj is None:
+            self._obj = self.ep.load()
+        return self._obj
+
+    def getattr(self, key):
+        """Get a configuration value from the entry point object."""
+        try:
+            return getattr(self.load(), key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __repr__(self):
+        """Represent the entry point."""
+        return self.ep.value
 
 
 class InvenioConfigEntryPointModule(object):
@@ -19,23 +143,115 @@ class InvenioConfigEntryPointModule(object):
     defined in ``10_name`` app override configurations defined in ``00_name``
     app.
 
+    In lazy mode, a key index (see :func:`build_key_index`) tells which keys
+    each entry point defines. Instead of importing the module, placeholders
+    are set for its keys and the module is imported the first time one of
+    them is read. Entry points missing from the index, or indexed for another
+    module or distribution version, are loaded eagerly.
+
+    In parallel mode, the modules are imported concurrently in a thread pool,
+    while their configuration is still applied in alphabetical order. Modules
+    whose concurrent import failed (e.g. due to an import lock deadlock) are
+    imported again sequentially.
+
     .. versionadded:: 1.0.0
+
+    The entry points can be read from an index file instead of the metadata
+    of all installed distributions, see :mod:`invenio_config.discovery`.
+
+    .. versionchanged:: 1.2.0
+       Added the ``lazy``, ``key_index``, ``parallel``, ``max_workers`` and
+       ``entry_point_index`` arguments.
     """
 
-    def __init__(self, app=None, entry_point_group="invenio_config.module"):
-        """Initialize extension."""
+    def __init__(
+        self,
+        app=None,
+        entry_point_group="invenio_config.module",
+        lazy=False,
+        key_index=None,
+        parallel=False,
+        max_workers=None,
+        entry_point_index=None,
+    ):
+        """Initialize extension.
+
+        :param lazy: Defer the import of configuration modules until one of
+            their keys is accessed.
+        :param key_index: The key index, or the path to a file written by
+            :func:`dump_key_index`.
+        :param parallel: Import the configuration modules concurrently.
+        :param max_workers: Number of threads used in parallel mode, defaults
+            to the :class:`~concurrent.futures.ThreadPoolExecutor` default.
+        :param entry_point_index: Path of an entry point index file.
+        """
         self.entry_point_group = entry_point_group
+        self.lazy = lazy
+        self.key_index = key_index
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.entry_point_index = entry_point_index
         if app:
             self.init_app(app)
 
+    def _get_key_index(self):
+        """Return the indexed entry points, if any."""
+        index = self.key_index
+        if isinstance(index, str):
+            index = load_key_index(index)
+        if not index or index.get("group") != self.entry_point_group:
+            return {}
+        return index["entry_points"]
+
+    def _load_parallel(self, app, eps):
+        """Load entry points concurrently.
+
+        :returns: A list with the loaded object and import time of each entry
+            point, or ``None`` for those which failed to load.
+        """
+        results = [None] * len(eps)
+        if not self.parallel or len(eps) < 2:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(_timed_load, ep) for ep in eps]
+            for i, (ep, future) in enumerate(zip(eps, futures)):
+                try:
+                    results[i] = future.result()
+                except Exception as exc:
+                    _warn_concurrent_import(app, ep, exc)
+        return results
+
     def init_app(self, app):
         """Initialize Flask application."""
         if self.entry_point_group:
             eps = sorted(
-                entry_points(group=self.entry_point_group),
+                entry_points(self.entry_point_group, index=self.entry_point_index),
                 key=attrgetter("name"),
             )
 
-            for ep in eps:
+            index = {}
+            if self.lazy:
+                index = self._get_key_index()
+                extend_config(app, LazyConfigMixin)
+
+            plan = [(ep, _indexed_keys(index, ep)) for ep in eps]
+            loaded = iter(
+                self._load_parallel(app, [ep for ep, keys in plan if keys is None])
+            )
+
+            for ep, keys in plan:
+                if keys is not None:
+                    app.logger.debug(f"Deferring config for entry point {ep.value}")
+                    lazy_ep = _LazyEntryPoint(ep)
+                    with track_stage(app, "entry_point", ep.name):
+                        for key in keys:
+                            app.config[key] = LazyValue(partial(lazy_ep.getattr, key))
+                    continue
+
                 app.logger.debug(f"Loading config for entry point {ep.value}")
-                app.config.from_object(ep.load())
+                with track_stage(app, "entry_point", ep.name) as timing:
+                    obj, import_time = next(loaded) or _timed_load(ep)
+                    if timing is not None:
+                        timing["import_time"] = import_time
+                    app.config.from_object(obj)
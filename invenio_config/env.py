@@ -5,37 +5,386 @@
 """Invenio environment configuration."""
 
 import ast
+import copy
 import os
+import warnings
+from collections import ChainMap
+from functools import lru_cache, partial
+
+from .decoders import get_decoder
+
+#: First characters of values which may be Python literals.
+_LITERAL_START = frozenset("'\"[{(-+.0123456789#\\")
+
+#: Names which are Python literals.
+_LITERAL_NAMES = ("True", "False", "None")
+
+#: Immutable types whose parsed values can be shared between applications.
+_IMMUTABLE_TYPES = (str, int, float, complex, bool, bytes, type(None))
+
+#: Separator of nested keys in variable names.
+NESTED_SEPARATOR = "__"
+
+#: Parsed environment values, keyed by variable name.
+_parsed_environ = {}
+
+#: Types of configuration keys registered by extensions.
+_registered_types = {}
+
+
+def register_env_types(types):
+    """Register the expected types of configuration keys.
+
+    Environment variables setting these keys are decoded with the decoder of
+    the type (see :mod:`invenio_config.decoders`) instead of being evaluated
+    as Python literals.
+
+    .. code-block:: python
+
+        register_env_types({
+            "SEARCH_TIMEOUT": "duration",
+            "FILES_MAX_SIZE": "bytesize",
+            "SEARCH_HOSTS": list,
+        })
+
+    :param types: Dictionary of types keyed by configuration key.
+
+    .. versionadded:: 1.2.0
+    """
+    for key, type_ in types.items():
+        _registered_types[key] = get_decoder(type_)
+
+
+def _is_plain_string(value):
+    """Check if a value can not be a Python literal."""
+    value = value.lstrip()
+    first = value[:1]
+    if first in _LITERAL_START or value.startswith(_LITERAL_NAMES):
+        return False
+    # String and bytes literals with prefixes, e.g. b'...' or rb"...".
+    return not (first in "bBrRuU" and ("'" in value[1:3] or '"' in value[1:3]))
+
+
+def parse_value(value):
+    """Evaluate a value as Python literal, falling back to the value itself.
+
+    :param value: The value to parse.
+    :returns: The literal, or the value if it is not a Python literal.
+
+    .. versionadded:: 1.2.0
+    """
+    if isinstance(value, str) and _is_plain_string(value):
+        return value
+    try:
+        return ast.literal_eval(value)
+    except (SyntaxError, ValueError):
+        return value
+
+
+@lru_cache(maxsize=None)
+def _size_limited_parser(max_size):
+    """Return a parser evaluating values up to a size as Python literals."""
+
+    def parse(value):
+        if len(value) > max_size:
+            warnings.warn(
+                "Environment variable value longer than {0} characters is not "
+                "evaluated".format(max_size),
+                UserWarning,
+            )
+            return value
+        return parse_value(value)
+
+    return parse
+
+
+def _container_key(container, part):
+    """Return the key or index of a path part in a container.
+
+    :raises ValueError: If the part is not an index of a list.
+    """
+    if isinstance(container, list):
+        return int(part)
+    if part not in container and part.lstrip("-").isdigit() and int(part) in container:
+        return int(part)
+    return part
+
+
+def _check_index(container, key):
+    """Check that a list index exists or is the index of a new last item."""
+    if isinstance(container, list) and not -len(container) <= key <= len(container):
+        raise IndexError("list index {0} out of range".format(key))
+
+
+def _set_item(container, key, value):
+    """Set a value in a container, appending it at the index past the end."""
+    if isinstance(container, list) and key == len(container):
+        container.append(value)
+    else:
+        container[key] = value
+
+
+def patch_nested(value, overrides, on_error=None):
+    """Set nested values in a copy of a dictionary or list.
+
+    Only the containers on the paths of the overrides are copied, each at
+    most once, so the original value and unrelated nested values are shared.
+    Missing dictionary keys are created, and the index past the last item of
+    a list appends an item.
+
+    :param value: The dictionary or list to patch.
+    :param overrides: List of ``(path, value)`` tuples, where ``path`` is a
+        list of keys or list indices.
+    :param on_error: Callable called with the path and the exception of
+        overrides which cannot be applied, e.g. because the path traverses a
+        scalar value or a list index is out of range. These overrides are
+        skipped. Defaults to raising a :class:`ValueError`.
+    :returns: The patched copy.
+
+    .. versionadded:: 1.2.0
+    """
+    root = copy.copy(value)
+    copied = {id(root)}
+    for path, new_value in overrides:
+        # Resolve the whole path before modifying anything, so that invalid
+        # overrides are skipped without side effects.
+        steps = []
+        node = root
+        try:
+            for part in path[:-1]:
+                key = _container_key(node, part)
+                _check_index(node, key)
+                try:
+                    child = node[key]
+                except (KeyError, IndexError):
+                    child = {}
+                else:
+                    if not isinstance(child, (dict, list)):
+                        raise ValueError(
+                            "cannot set a value in a value of type {0}".format(
+                                type(child).__name__
+                            )
+                        )
+                    if id(child) not in copied:
+                        child = copy.copy(child)
+                steps.append((node, key, child))
+                node = child
+            key = _container_key(node, path[-1])
+            _check_index(node, key)
+        except (ValueError, IndexError) as e:
+            if on_error is None:
+                raise ValueError(
+                    "Cannot set {0!r}: {1}".format(NESTED_SEPARATOR.join(path), e)
+                )
+            on_error(path, e)
+            continue
+
+        for parent, parent_key, child in steps:
+            copied.add(id(child))
+            _set_item(parent, parent_key, child)
+        _set_item(node, key, new_value)
+    return root
+
+
+def _warn_nested(varname, path, error):
+    """Warn about an environment variable setting an invalid nested path."""
+    warnings.warn(
+        "Ignoring environment variable {0}: {1}".format(
+            NESTED_SEPARATOR.join([varname] + path), error
+        ),
+        UserWarning,
+    )
+
+
+def _parse_cached(varname, raw, decoder):
+    """Parse an environment variable, reusing previously parsed values."""
+    cached = _parsed_environ.get(varname)
+    if cached is not None and cached[0] == raw and cached[1] is decoder:
+        value = cached[2]
+    else:
+        try:
+            value = decoder(raw)
+        except ValueError as e:
+            raise ValueError(
+                "Invalid value for environment variable {0}: {1}".format(varname, e)
+            )
+        _parsed_environ[varname] = (raw, decoder, value)
+    if not isinstance(value, _IMMUTABLE_TYPES):
+        # Applications must not share mutable values.
+        value = copy.deepcopy(value)
+    return value
+
+
+def _iter_environ(prefixes):
+    """Iterate over the environment variables matching the prefixes."""
+    if os.supports_bytes_environ:
+        # Iterating over the raw keys avoids decoding every variable name.
+        environb = os.environb
+        bprefixes = tuple(os.fsencode(prefix) for prefix in prefixes)
+        for key in list(environb):
+            if key.startswith(bprefixes):
+                yield os.fsdecode(key), os.fsdecode(environb[key])
+    else:  # pragma: no cover
+        for varname, raw in list(os.environ.items()):
+            if varname.startswith(prefixes):
+                yield varname, raw
+
+
+def scan_environ(prefixes, get_decoder=None):
+    """Collect the environment variables matching any of the given prefixes.
+
+    The environment is scanned once for all prefixes. Parsed values are cached
+    for the process and only re-parsed when the variable changes. Empty
+    variables are returned as empty strings, as their value depends on the
+    application configuration.
+
+    :param prefixes: List of variable name prefixes.
+    :param get_decoder: Callable returning the decoder of a configuration
+        key. Defaults to :func:`parse_value` for all keys.
+    :returns: A dictionary mapping each prefix to a dictionary of parsed
+        values keyed by the variable name without the prefix.
+
+    .. versionadded:: 1.2.0
+    """
+    prefixes = tuple(prefixes)
+    result = {prefix: {} for prefix in prefixes}
+    for varname, raw in _iter_environ(prefixes):
+        for prefix in prefixes:
+            if varname.startswith(prefix):
+                key = varname[len(prefix) :]
+                decoder = get_decoder(key) if get_decoder else parse_value
+                value = _parse_cached(varname, raw, decoder) if raw else raw
+                result[prefix][key] = value
+    return result
 
 
 class InvenioConfigEnvironment(object):
     """Load configuration from environment variables.
 
+    Several prefixes can be given, in which case variables with a later prefix
+    take precedence.
+
+    Variables setting a key with a known type, given with ``types`` or
+    registered with :func:`register_env_types`, are decoded by the decoder of
+    the type (see :mod:`invenio_config.decoders`). Other variables are
+    evaluated as Python literals if ``literal_eval`` is enabled and they are
+    not longer than ``max_literal_size``, and kept as strings otherwise.
+
+    Variables can set a nested value of a dictionary or list configuration
+    by separating the keys with a double underscore, e.g.
+    ``INVENIO_SEARCH_CLIENT_CONFIG__timeout=30`` sets the ``timeout`` key of
+    ``SEARCH_CLIENT_CONFIG`` (see :func:`patch_nested`). This only applies if
+    the configuration value is a dictionary or list, and the variable name
+    does not match an existing key. Variables setting a path which does not
+    fit the value, e.g. an index out of range of a list, are ignored with a
+    warning.
+
     .. versionadded:: 1.0.0
+
+    .. versionchanged:: 1.2.0
+       Parsed values are cached, multiple prefixes are supported, values can
+       be decoded according to the type of their key and nested values can be
+       set.
     """
 
-    def __init__(self, app=None, prefix="INVENIO_"):
-        """Initialize extension."""
+    def __init__(
+        self,
+        app=None,
+        prefix="INVENIO_",
+        types=None,
+        literal_eval=True,
+        max_literal_size=100000,
+    ):
+        """Initialize extension.
+
+        :param types: Dictionary of types keyed by configuration key.
+        :param literal_eval: Evaluate values of keys without type as Python
+            literals.
+        :param max_literal_size: Maximum length of values evaluated as Python
+            literals, or ``None`` for no limit.
+        """
         self.prefix = prefix
+        self.types = {k: get_decoder(v) for k, v in (types or {}).items()}
+        self.literal_eval = literal_eval
+        self.max_literal_size = max_literal_size
         if app:
             self.init_app(app)
 
+    @property
+    def prefixes(self):
+        """List of prefixes."""
+        if isinstance(self.prefix, str):
+            return [self.prefix]
+        return list(self.prefix)
+
+    def get_decoder(self, key):
+        """Return the decoder of a configuration key."""
+        decoder = self.types.get(key) or _registered_types.get(key)
+        if decoder is not None:
+            return decoder
+        if not self.literal_eval:
+            return str
+        if self.max_literal_size is None:
+            return parse_value
+        return _size_limited_parser(self.max_literal_size)
+
     def init_app(self, app):
         """Initialize Flask application."""
-        prefix_len = len(self.prefix)
-        for varname, value in os.environ.items():
-            if not varname.startswith(self.prefix):
-                continue
-
-            # Prepare values
-            varname = varname[prefix_len:]
-            value = value or app.config.get(varname)
-
-            # Evaluate value
-            try:
-                value = ast.literal_eval(value)
-            except (SyntaxError, ValueError):
-                pass
-
-            # Set value
-            app.config[varname] = value
+        self.apply(app, self.scan())
+
+    def scan(self):
+        """Collect the values of the environment variables.
+
+        :returns: The result of :func:`scan_environ` for the prefixes.
+        """
+        return scan_environ(self.prefixes, self.get_decoder)
+
+    def collect(self, app, config=None):
+        """Return the configuration values set by the environment variables.
+
+        :param app: The Flask application.
+        :param config: The configuration the variables apply to, defaults to
+            the application configuration. Empty variables and nested keys
+            depend on its values.
+        :returns: A dictionary.
+
+        .. versionadded:: 1.2.0
+        """
+        return self._collect(self.scan(), app.config if config is None else config)
+
+    def _collect(self, environ, config):
+        """Compute the values set by collected environment variables."""
+        values = {}
+        view = ChainMap(values, config)
+        for prefix in self.prefixes:
+            nested = {}
+            for varname, value in environ[prefix].items():
+                top, sep, path = varname.partition(NESTED_SEPARATOR)
+                if (
+                    sep
+                    and path
+                    and varname not in view
+                    and isinstance(view.get(top), (dict, list))
+                ):
+                    nested.setdefault(top, []).append(
+                        (path.split(NESTED_SEPARATOR), value)
+                    )
+                    continue
+                if value == "":
+                    # Evaluate the current value.
+                    value = parse_value(view.get(varname))
+                values[varname] = value
+
+            for top, overrides in nested.items():
+                values[top] = patch_nested(
+                    view[top], overrides, partial(_warn_nested, prefix + top)
+                )
+        return values
+
+    def apply(self, app, environ):
+        """Set the collected values in the application configuration.
+
+        :param app: The Flask application.
+        :param environ: The values returned by :meth:`scan`.
+        """
+        app.config.update(self._collect(environ, app.config))
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio-Config extension state."""
+
+from contextlib import contextmanager
+from time import perf_counter
+
+from .mapping import extend_config
+from .profiling import StageTiming
+
+
+class InvenioConfig(object):
+    """Invenio-Config extension.
+
+    Holds information gathered by the configuration loaders, and is available
+    as ``app.extensions['invenio-config']``. It is only registered by the
+    loaders when one of the optional features using it is enabled.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app=None):
+        """Initialize extension."""
+        #: Timings of the configuration loading stages, see
+        #: :class:`invenio_config.profiling.ConfigLoadTimings`.
+        self.timings = None
+        #: Origin of the configuration values, see
+        #: :class:`invenio_config.provenance.ConfigProvenance`.
+        self.provenance = None
+        #: Watchers reloading configuration files or sources, see
+        #: :class:`invenio_config.reload.ConfigFileWatcher` and
+        #: :class:`invenio_config.sources.CachedConfigSource`.
+        self.watchers = []
+        #: Keys set by the keyword arguments and environment variables of the
+        #: configuration loader, which take precedence over reloaded files
+        #: and sources.
+        self.pinned_keys = set()
+        #: The loader of the configuration directory, see
+        #: :class:`invenio_config.confd.InvenioConfigDirectory`.
+        self.config_directory = None
+        #: Memoized derived values, see
+        #: :class:`invenio_config.derived.DerivedConfigCache`.
+        self.derived = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        app.extensions["invenio-config"] = self
+
+
+def get_extension(app):
+    """Return the Invenio-Config extension of an application, creating it.
+
+    :param app: The Flask application.
+    :returns: The :class:`InvenioConfig` instance.
+    """
+    ext = app.extensions.get("invenio-config")
+    if ext is None:
+        ext = InvenioConfig(app)
+    return ext
+
+
+class RecordingConfigMixin(object):
+    """Configuration mixin recording the keys set during loading stages.
+
+    Keys are recorded whenever they are assigned, even to a value identical
+    to the current one, e.g. an environment variable setting ``DEBUG`` to
+    ``False``. Values resolved on access (see
+    :class:`invenio_config.mapping.LazyConfigMixin`) are not recorded.
+    """
+
+    def _record(self, keys):
+        """Add keys to the sets of the stages being tracked."""
+        for recorded in self.__dict__.get("_recorded_keys", ()):
+            recorded.update(keys)
+
+    def __setitem__(self, key, value):
+        """Set a value, recording the key."""
+        self._record((key,))
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        """Update values, recording the keys."""
+        values = dict(*args, **kwargs)
+        self._record(values)
+        super().update(values)
+
+    def __ior__(self, other):
+        """Update values, recording the keys."""
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        """Set a value if not defined, recording the key."""
+        if key not in self:
+            self._record((key,))
+        return super().setdefault(key, default)
+
+
+@contextmanager
+def record_keys(app):
+    """Record the configuration keys assigned within the context.
+
+    The configuration is extended with :class:`RecordingConfigMixin`.
+
+    :param app: The Flask application.
+    :returns: A context manager yielding the set of recorded keys.
+    """
+    config = extend_config(app, RecordingConfigMixin)
+    stages = config.__dict__.setdefault("_recorded_keys", [])
+    recorded = set()
+    stages.append(recorded)
+    try:
+        yield recorded
+    finally:
+        stages.remove(recorded)
+
+
+@contextmanager
+def track_stage(app, stage, name=None, record_sources=True):
+    """Track the configuration keys set by a configuration loading stage.
+
+    Does nothing unless profiling or provenance tracking is enabled for the
+    application, in which case the configuration is extended with
+    :class:`RecordingConfigMixin`. The yielded dictionary (``None`` if not
+    tracking) can be used to report the import time of the stage.
+
+    :param app: The Flask application.
+    :param stage: The stage name.
+    :param name: An optional name, e.g. the entry point name.
+    :param record_sources: Record the stage as a source of the keys it set.
+        Disabled for stages only grouping other stages.
+    """
+    ext = app.extensions.get("invenio-config")
+    timings = getattr(ext, "timings", None)
+    provenance = getattr(ext, "provenance", None) if record_sources else None
+    if timings is None and provenance is None:
+        yield None
+        return
+
+    before = set(dict.keys(app.config))
+    extra = {"import_time": None}
+    start = perf_counter()
+    with record_keys(app) as recorded:
+        yield extra
+    wall_time = perf_counter() - start
+
+    keys = [key for key in dict.keys(app.config) if key in recorded]
+    if timings is not None:
+        new_keys = sum(1 for key in keys if key not in before)
+        timings.add(
+            StageTiming(
+                stage,
+                name,
+                wall_time,
+                extra["import_time"],
+                new_keys,
+                len(keys) - new_keys,
+            )
+        )
+    if provenance is not None:
+        provenance.record(stage, name, keys, app.config)
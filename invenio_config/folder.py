@@ -4,6 +4,13 @@
 
 """Invenio instance folder configuration."""
 
+import errno
+import os
+
+from .bytecode import load_config_file
+from .ext import get_extension
+from .reload import ConfigFileWatcher
+
 
 class InvenioConfigInstanceFolder(object):
     """Load configuration from py file in folder.
@@ -15,14 +22,71 @@ class InvenioConfigInstanceFolder(object):
     More about `instance folders
     <http://flask.pocoo.org/docs/latest/config/#instance-folders>`_.
 
+    With ``watch`` enabled, the file is watched for changes and reloaded
+    without restarting the application (see
+    :class:`invenio_config.reload.ConfigFileWatcher`). The watcher is
+    available in ``app.extensions['invenio-config'].watchers``.
+
+    With a ``cache_dir``, the compiled code of the file is stored in this
+    directory and executed directly as long as the file did not change (see
+    :func:`invenio_config.bytecode.compile_config_file`), instead of
+    compiling the file for each application.
+
     .. versionadded:: 1.0.0
+
+    .. versionchanged:: 1.2.0
+       Added the ``watch`` and ``cache_dir`` arguments.
     """
 
-    def __init__(self, app=None):
-        """Initialize extension."""
+    def __init__(self, app=None, watch=False, cache_dir=None, **watch_kwargs):
+        """Initialize extension.
+
+        :param watch: Reload the file when it changes.
+        :param cache_dir: Directory of the bytecode cache.
+        :param watch_kwargs: Keyword arguments for the watcher.
+        """
+        self.watch = watch
+        self.cache_dir = cache_dir
+        self.watch_kwargs = watch_kwargs
         if app:
             self.init_app(app)
 
+    def get_filename(self, app):
+        """Return the path of the configuration file."""
+        return os.path.join(app.config.root_path, "{0}.cfg".format(app.name))
+
+    def collect(self, app, config=None):
+        """Return the configuration values defined in the file.
+
+        :param app: The Flask application.
+        :param config: Unused, see :mod:`invenio_config.changeset`.
+        :returns: A dictionary, empty if the file does not exist.
+
+        .. versionadded:: 1.2.0
+        """
+        try:
+            return load_config_file(self.get_filename(app), cache_dir=self.cache_dir)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.EISDIR, errno.ENOTDIR):
+                return {}
+            e.strerror = f"Unable to load configuration file ({e.strerror})"
+            raise
+
     def init_app(self, app):
         """Initialize Flask application."""
-        app.config.from_pyfile("{0}.cfg".format(app.name), silent=True)
+        if not self.watch:
+            if self.cache_dir:
+                app.config.update(self.collect(app))
+            else:
+                app.config.from_pyfile("{0}.cfg".format(app.name), silent=True)
+            return
+
+        watcher = ConfigFileWatcher(
+            app,
+            self.get_filename(app),
+            cache_dir=self.cache_dir,
+            **self.watch_kwargs,
+        )
+        watcher.load()
+        watcher.start()
+        get_extension(app).watchers.append(watcher)
@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio frozen configuration.
+
+Freezing the configuration converts nested values to immutable equivalents
+(lists to tuples, sets to frozensets and dictionaries to :class:`FrozenDict`)
+and makes any further modification of ``app.config`` raise a
+:class:`TypeError`.
+
+Freezing should happen once the application is fully initialized, as
+extensions usually set their default configuration in ``init_app`` and
+Flask itself writes to the configuration, e.g. when setting
+:attr:`flask.Flask.testing`:
+
+.. code-block:: python
+
+    app = create_app()
+    freeze_config(app)
+"""
+
+import gc
+
+from .mapping import extend_config
+
+
+def _frozen(*args, **kwargs):
+    """Refuse to modify a frozen configuration."""
+    raise TypeError("The application configuration is frozen.")
+
+
+class FrozenDict(dict):
+    """Immutable and hashable dictionary.
+
+    It is a :class:`dict` subclass, so it can be serialized with
+    :func:`json.dumps` and passes ``isinstance(value, dict)`` checks, but all
+    methods modifying it raise a :class:`TypeError`.
+
+    .. versionadded:: 1.2.0
+    """
+
+    __slots__ = ("_hash",)
+
+    __setitem__ = __delitem__ = __ior__ = _frozen
+    update = pop = popitem = clear = setdefault = _frozen
+
+    def __init__(self, *args, **kwargs):
+        """Initialize dictionary."""
+        dict.__init__(self, *args, **kwargs)
+        self._hash = None
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):
+        """Create a dictionary with keys from an iterable."""
+        return cls(dict.fromkeys(iterable, value))
+
+    def __reduce__(self):
+        """Pickle the items, as they cannot be set after creation."""
+        return (type(self), (dict(self),))
+
+    def __hash__(self):
+        """Hash the items."""
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __repr__(self):
+        """Represent the dictionary."""
+        return "FrozenDict({0})".format(dict.__repr__(self))
+
+
+def freeze_value(value):
+    """Convert a value to an immutable equivalent.
+
+    Lists and tuples become tuples, sets become frozensets and dictionaries
+    become :class:`FrozenDict`, recursively. Other values are returned as is.
+
+    :param value: The value to freeze.
+    :returns: The frozen value.
+
+    .. versionadded:: 1.2.0
+    """
+    if isinstance(value, (list, tuple)) and not hasattr(value, "_fields"):
+        return tuple(freeze_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(v) for v in value)
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze_value(v)) for k, v in value.items())
+    return value
+
+
+class FrozenConfigMixin(object):
+    """Configuration mixin refusing any modification."""
+
+    __setitem__ = __delitem__ = _frozen
+    update = pop = popitem = clear = __ior__ = _frozen
+
+    def setdefault(self, key, default=None):
+        """Return the value of a key, which must exist."""
+        if key not in self:
+            _frozen()
+        return self[key]
+
+    def __hash__(self):
+        """Hash the configuration items.
+
+        :raises TypeError: If a value is not hashable.
+        """
+        try:
+            return self.__dict__["_frozen_hash"]
+        except KeyError:
+            value = self.__dict__["_frozen_hash"] = hash(frozenset(self.items()))
+            return value
+
+
+def freeze_config(app, gc_freeze=False):
+    """Freeze the application configuration.
+
+    :param app: The Flask application.
+    :param gc_freeze: Move all objects tracked by the garbage collector to the
+        permanent generation (see :func:`gc.freeze`), so that collections in
+        forked worker processes do not write to the memory pages holding the
+        configuration. This affects the whole process and the frozen objects
+        are never collected, so it should only be used in the master process
+        of a prefork server.
+    :returns: The frozen configuration.
+    :raises ValueError: If configuration files or sources are watched for
+        changes, as their changes could not be applied.
+
+    .. versionadded:: 1.2.0
+    """
+    ext = app.extensions.get("invenio-config")
+    if ext is not None and ext.watchers:
+        raise ValueError(
+            "Cannot freeze a configuration whose files or sources are watched."
+        )
+    config = app.config
+    for key, value in list(config.items()):
+        dict.__setitem__(config, key, freeze_value(value))
+    extend_config(app, FrozenConfigMixin)
+    if gc_freeze and hasattr(gc, "freeze"):
+        gc.freeze()
+    return config
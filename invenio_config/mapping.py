@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration mapping extensions.
+
+Some configuration loaders need to change how ``app.config`` behaves, e.g. to
+resolve values lazily. Rather than replacing the configuration object, which
+other code may already hold a reference to, its class is swapped for a
+subclass combining the original class with a mixin.
+"""
+
+_config_classes = {}
+
+
+def extend_config(app, mixin):
+    """Extend the class of the application configuration with a mixin.
+
+    The mixin must not define ``__slots__`` nor ``__init__``, as the existing
+    configuration object is kept and only its class is changed.
+
+    :param app: The Flask application.
+    :param mixin: The mixin class.
+    :returns: The application configuration.
+    """
+    cls = type(app.config)
+    if not issubclass(cls, mixin):
+        new_cls = _config_classes.get((mixin, cls))
+        if new_cls is None:
+            name = mixin.__name__.replace("Mixin", "") + cls.__name__
+            new_cls = _config_classes[(mixin, cls)] = type(name, (mixin, cls), {})
+        app.config.__class__ = new_cls
+    return app.config
+
+
+class LazyValue(object):
+    """Placeholder for a configuration value computed on first access."""
+
+    __slots__ = ("resolver",)
+
+    def __init__(self, resolver):
+        """Initialize placeholder.
+
+        :param resolver: Callable without arguments returning the value.
+        """
+        self.resolver = resolver
+
+    def __repr__(self):
+        """Represent the placeholder."""
+        return "<LazyValue {0!r}>".format(self.resolver)
+
+
+class LazyConfigMixin(object):
+    """Configuration mixin resolving :class:`LazyValue` on first access.
+
+    Placeholders are stored directly in the dictionary, so membership tests,
+    key iteration and overriding a key never trigger the resolution. Reading
+    a value replaces the placeholder with the resolved value.
+    """
+
+    def _resolve(self, key, value):
+        """Resolve a placeholder and store the result."""
+        value = value.resolver()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _resolve_all(self):
+        """Resolve all pending placeholders."""
+        for key, value in list(dict.items(self)):
+            if type(value) is LazyValue:
+                self._resolve(key, value)
+
+    def __getitem__(self, key):
+        """Get a value, resolving it if needed."""
+        value = super().__getitem__(key)
+        if type(value) is LazyValue:
+            value = self._resolve(key, value)
+        return value
+
+    def get(self, key, default=None):
+        """Get a value, resolving it if needed."""
+        value = super().get(key, default)
+        if type(value) is LazyValue:
+            value = self._resolve(key, value)
+        return value
+
+    def setdefault(self, key, default=None):
+        """Set a default value, resolving the existing one if needed."""
+        value = super().setdefault(key, default)
+        if type(value) is LazyValue:
+            value = self._resolve(key, value)
+        return value
+
+    def pop(self, key, *args):
+        """Remove a value, resolving it if needed."""
+        value = super().pop(key, *args)
+        if type(value) is LazyValue:
+            value = value.resolver()
+        return value
+
+    def __iter__(self):
+        """Iterate over the keys.
+
+        Overriding it makes CPython copy the configuration, e.g. with
+        ``dict(app.config)`` or ``{**app.config}``, through
+        :meth:`__getitem__`, which resolves pending values, instead of
+        copying the placeholders.
+        """
+        return dict.__iter__(self)
+
+    def values(self):
+        """Return all values, resolving pending ones."""
+        self._resolve_all()
+        return super().values()
+
+    def items(self):
+        """Return all items, resolving pending ones."""
+        self._resolve_all()
+        return super().items()
+
+    def copy(self):
+        """Return a shallow copy, resolving pending values."""
+        self._resolve_all()
+        return super().copy()
+
+    def __eq__(self, other):
+        """Compare with resolved values."""
+        self._resolve_all()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Represent with resolved values."""
+        self._resolve_all()
+        return super().__repr__()
+
+    def pending(self):
+        """Return the keys whose value has not been resolved yet."""
+        return [k for k, v in dict.items(self) if type(v) is LazyValue]
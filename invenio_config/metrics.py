@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration access metrics.
+
+Counts the reads of each configuration key, to find keys which are never
+used. Metering is opt-in, e.g. with the ``meter`` argument of
+:func:`invenio_config.utils.create_config_loader`, and only counts reads
+done after it is installed, through ``app.config[key]`` and
+``app.config.get(key)``. Iterating over the configuration, e.g. with
+:meth:`flask.Config.get_namespace`, is not counted.
+
+Reads are counted exactly, in a dictionary of counters. Sampling reads
+would not be cheaper, as deciding whether to count a read costs as much as
+counting it. A metered read takes a few hundred nanoseconds more than an
+unmetered one, see ``benchmarks/bench_metrics.py``.
+
+.. code-block:: python
+
+    config_loader = create_config_loader(provenance=True, meter=True)
+    ...
+    for entry_point, keys in unread_keys_report(app).items():
+        print(entry_point, keys)
+"""
+
+from .ext import get_extension
+from .mapping import extend_config
+
+
+class MeteredConfigMixin(object):
+    """Configuration mixin counting the reads of each key.
+
+    .. versionadded:: 1.2.0
+    """
+
+    # The counting is inlined and the parent methods are bound once when
+    # installing the meter, as a call to super() would double the overhead.
+
+    def __getitem__(self, key):
+        """Get a value, counting the read."""
+        value = self._unmetered_getitem(key)
+        counts = self._read_counts
+        if key in counts:
+            counts[key] += 1
+        else:
+            counts[key] = 1
+        return value
+
+    def get(self, key, default=None):
+        """Get a value, counting the read."""
+        counts = self._read_counts
+        if key in counts:
+            counts[key] += 1
+        else:
+            counts[key] = 1
+        return self._unmetered_get(key, default)
+
+
+def install_config_meter(app):
+    """Start counting the reads of the application configuration keys.
+
+    Installing the meter again resets the counters.
+
+    :param app: The Flask application.
+
+    .. versionadded:: 1.2.0
+    """
+    config = extend_config(app, MeteredConfigMixin)
+    parent = super(MeteredConfigMixin, config)
+    config._unmetered_getitem = parent.__getitem__
+    config._unmetered_get = parent.get
+    config._read_counts = {}
+
+
+def read_counts(app):
+    """Return the number of reads of each read key.
+
+    :param app: The Flask application.
+    :returns: A dictionary of read counts keyed by configuration key.
+
+    .. versionadded:: 1.2.0
+    """
+    return dict(getattr(app.config, "_read_counts", {}))
+
+
+def unread_keys(app):
+    """Return the configuration keys which were never read.
+
+    :param app: The Flask application.
+    :returns: A sorted list of keys.
+
+    .. versionadded:: 1.2.0
+    """
+    if not isinstance(app.config, MeteredConfigMixin):
+        raise RuntimeError("Configuration reads are not metered.")
+    counts = app.config._read_counts
+    return sorted(key for key in app.config if key not in counts)
+
+
+def unread_keys_report(app):
+    """Group the never read configuration keys by the source defining them.
+
+    Keys are grouped by the name of the first entry point which set them.
+    Other keys are grouped by the location of their first source, and by
+    ``None`` if provenance tracking was not enabled (see
+    :class:`invenio_config.provenance.ConfigProvenance`).
+
+    :param app: The Flask application.
+    :returns: A dictionary of sorted lists of keys.
+
+    .. versionadded:: 1.2.0
+    """
+    provenance = get_extension(app).provenance
+    report = {}
+    for key in unread_keys(app):
+        group = None
+        sources = provenance.sources_of(key) if provenance is not None else []
+        for source in sources:
+            if source.stage == "entry_point":
+                group = source.name
+                break
+        else:
+            if sources:
+                group = sources[0].location(key)
+        report.setdefault(group, []).append(key)
+    return report
@@ -4,6 +4,8 @@
 
 """Invenio module configuration."""
 
+from werkzeug.utils import import_string
+
 
 class InvenioConfigModule(object):
     """Load configuration from module.
@@ -17,6 +19,22 @@ class InvenioConfigModule(object):
         if app:
             self.init_app(app)
 
+    def collect(self, app, config=None):
+        """Return the configuration values defined in the module.
+
+        :param app: The Flask application.
+        :param config: Unused, see :mod:`invenio_config.changeset`.
+        :returns: A dictionary of the uppercase attributes of the module.
+
+        .. versionadded:: 1.2.0
+        """
+        module = self.module
+        if not module:
+            return {}
+        if isinstance(module, str):
+            module = import_string(module)
+        return {key: getattr(module, key) for key in dir(module) if key.isupper()}
+
     def init_app(self, app):
         """Initialize Flask application."""
         if self.module:
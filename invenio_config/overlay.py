@@ -0,0 +1,229 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration overlays for multiple applications.
+
+A process serving many sites from the same code base, e.g. through a
+:class:`werkzeug.middleware.dispatcher.DispatcherMiddleware`, creates one
+application per site. Most of their configuration comes from the entry point
+and module configuration, which is identical for all of them.
+
+:class:`SharedConfigLoader` loads these sources once into a shared read-only
+base. The configuration of each application only holds its own values, i.e.
+those of the instance folder, keyword arguments, environment variables and
+defaults, and looks up other keys in the base:
+
+.. code-block:: python
+
+    config_loader = SharedConfigLoader(config="mysite.config")
+
+    def create_site(name):
+        app = Flask(name, instance_path=os.path.join(sites_path, name))
+        config_loader(app, SITE_NAME=name)
+        return app
+"""
+
+import threading
+from collections.abc import ItemsView, KeysView, ValuesView
+from types import MappingProxyType
+
+from flask import Flask
+
+from .frozen import freeze_value
+from .mapping import extend_config
+from .utils import ConfigLoader
+
+_missing = object()
+
+
+class OverlayConfigMixin(object):
+    """Configuration mixin looking up missing keys in a shared base.
+
+    The values of the application are stored in the configuration
+    dictionary itself, so reading them is as fast as with a plain
+    configuration. Keys deleted from the configuration are recorded in a set
+    of tombstones hiding the corresponding base keys. The base itself is
+    never modified, but mutable values are shared between applications and
+    must not be modified in place.
+
+    Code accessing the configuration through the :class:`dict` methods
+    directly, e.g. ``dict.get(app.config, key)``, only sees the values of
+    the application.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __missing__(self, key):
+        """Look up a key in the base."""
+        if key in self._overlay_deleted:
+            raise KeyError(key)
+        return self._overlay_base[key]
+
+    def get(self, key, default=None):
+        """Get a value from the application or the base."""
+        value = dict.get(self, key, _missing)
+        if value is _missing:
+            if key in self._overlay_deleted:
+                return default
+            return self._overlay_base.get(key, default)
+        return value
+
+    def __contains__(self, key):
+        """Check if the application or the base defines a key."""
+        return dict.__contains__(self, key) or (
+            key in self._overlay_base and key not in self._overlay_deleted
+        )
+
+    def __iter__(self):
+        """Iterate over the keys of the application and the base."""
+        yield from dict.__iter__(self)
+        for key in self._overlay_base:
+            if not dict.__contains__(self, key) and key not in self._overlay_deleted:
+                yield key
+
+    def __len__(self):
+        """Return the number of keys."""
+        return sum(1 for key in self)
+
+    def keys(self):
+        """Return the keys of the application and the base."""
+        return KeysView(self)
+
+    def values(self):
+        """Return the values of the application and the base."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return the items of the application and the base."""
+        return ItemsView(self)
+
+    def __delitem__(self, key):
+        """Delete a key, hiding it in the base."""
+        found = dict.__contains__(self, key)
+        if found:
+            dict.__delitem__(self, key)
+        if key in self._overlay_base and key not in self._overlay_deleted:
+            self._overlay_deleted.add(key)
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def pop(self, key, *args):
+        """Remove a key and return its value."""
+        try:
+            value = self[key]
+        except KeyError:
+            if args:
+                return args[0]
+            raise
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        """Get a value, setting it if not defined."""
+        value = self.get(key, _missing)
+        if value is _missing:
+            self[key] = value = default
+        return value
+
+    def clear(self):
+        """Remove all keys."""
+        dict.clear(self)
+        self._overlay_deleted.update(self._overlay_base)
+
+    def copy(self):
+        """Return a dictionary with the values of the application and base."""
+        return dict(self.items())
+
+    def __eq__(self, other):
+        """Compare the values of the application and the base."""
+        return self.copy() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Represent the values of the application and the base."""
+        return "<{0} {1}>".format(type(self).__name__, dict.__repr__(self.copy()))
+
+
+def install_overlay(app, base, defaults=None):
+    """Make the application configuration an overlay of a shared base.
+
+    Default values still held by the configuration are removed, so that the
+    base values are used instead.
+
+    :param app: The Flask application.
+    :param base: The shared base mapping.
+    :param defaults: The default values the base was loaded on, defaults to
+        the Flask default configuration. Values identical to them are
+        removed.
+    :returns: The application configuration.
+
+    .. versionadded:: 1.2.0
+    """
+    config = extend_config(app, OverlayConfigMixin)
+    config._overlay_base = base
+    config._overlay_deleted = set()
+    if defaults is None:
+        defaults = app.default_config
+    for key, value in list(dict.items(config)):
+        if key in base and defaults.get(key, _missing) is value:
+            dict.__delitem__(config, key)
+    return config
+
+
+class SharedConfigLoader(ConfigLoader):
+    """Configuration loader sharing a base configuration between applications.
+
+    The loader behaves like the one returned by
+    :func:`invenio_config.utils.create_config_loader` and accepts the same
+    options, except ``snapshot_path``. The entry point and module
+    configuration are loaded once, into a base shared by all the
+    applications it loads (see :class:`OverlayConfigMixin`), and only the
+    instance folder, external sources, keyword arguments, environment
+    variables and defaults are applied per application.
+
+    The values of the base are frozen (see
+    :func:`~invenio_config.frozen.freeze_value`), so that an application
+    cannot modify them in place for the others.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, config=None, env_prefix="APP", **kwargs):
+        """Initialize loader.
+
+        :param config: Either an import string to a module with configuration
+            or alternatively the module itself.
+        :param env_prefix: Environment variable prefix to import configuration
+            from.
+        :param kwargs: The other options of
+            :func:`~invenio_config.utils.create_config_loader`.
+        :raises ValueError: If ``snapshot_path`` is set.
+        """
+        if kwargs.get("snapshot_path"):
+            raise ValueError("A shared base configuration cannot be snapshotted.")
+        super().__init__(config=config, env_prefix=env_prefix, **kwargs)
+        self._base = None
+        self._defaults = None
+        self._lock = threading.Lock()
+
+    @property
+    def base(self):
+        """Return the shared base configuration, loading it if needed."""
+        if self._base is None:
+            with self._lock:
+                if self._base is None:
+                    app = Flask("invenio_config_base")
+                    self._defaults = dict(app.config)
+                    self.load_entry_points(app)
+                    self.load_module(app)
+                    self._base = MappingProxyType(
+                        {k: freeze_value(v) for k, v in app.config.items()}
+                    )
+        return self._base
+
+    def load_base(self, app):
+        """Install the shared base and load the instance folder."""
+        install_overlay(app, self.base, self._defaults)
+        self.load_instance_folder(app)
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration loading for prefork servers.
+
+With prefork servers such as gunicorn or celery, the application factory
+usually runs in every worker process. :class:`PreforkConfigLoader` loads the
+expensive configuration sources once in the master process and lets workers
+inherit the result:
+
+.. code-block:: python
+
+    config_loader = PreforkConfigLoader(config=config, env_prefix="INVENIO")
+    # In the master, before forking (e.g. in gunicorn's ``on_starting``).
+    config_loader.preload(Flask("invenio", instance_path=instance_path))
+
+    # In each worker, e.g. through ``invenio_base.app.create_app_factory``.
+    app = create_app(config_loader=config_loader)
+"""
+
+import gc
+import os
+
+from .ext import track_stage
+from .utils import ConfigLoader
+
+
+class PreforkConfigLoader(ConfigLoader):
+    """Configuration loader sharing preloaded configuration with workers.
+
+    The loader behaves like the one returned by
+    :func:`invenio_config.utils.create_config_loader` and accepts the same
+    options. Once :meth:`preload` ran, the entry point, module and instance
+    folder stages are replaced by copying the preloaded configuration, and
+    only the external sources, keyword arguments, environment variables and
+    defaults are applied per application.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, config=None, env_prefix="APP", gc_freeze=True, **kwargs):
+        """Initialize loader.
+
+        :param config: Either an import string to a module with configuration
+            or alternatively the module itself.
+        :param env_prefix: Environment variable prefix to import configuration
+            from.
+        :param gc_freeze: After preloading, move all objects tracked by the
+            garbage collector to the permanent generation (see
+            :func:`gc.freeze`), so that collections in the workers do not
+            write to the inherited memory pages.
+        :param kwargs: The other options of
+            :func:`~invenio_config.utils.create_config_loader`.
+        :raises ValueError: If ``watch`` is set, as the watcher of the
+            preloading process is not inherited by the workers.
+        """
+        if kwargs.get("watch"):
+            raise ValueError("Preloaded configuration files cannot be watched.")
+        super().__init__(config=config, env_prefix=env_prefix, **kwargs)
+        self.gc_freeze = gc_freeze
+        self.preloaded = None
+        self.preloaded_pid = None
+
+    def preload(self, app):
+        """Load the shared configuration sources.
+
+        :param app: A Flask application with the same name and instance path
+            as the applications created by the workers.
+        """
+        super().load_base(app)
+        self.preloaded = dict(app.config.items())
+        self.preloaded_pid = os.getpid()
+        if self.gc_freeze and hasattr(gc, "freeze"):
+            gc.freeze()
+
+    def load_base(self, app):
+        """Load the shared configuration sources, unless preloaded."""
+        if self.preloaded is None:
+            return super().load_base(app)
+        app.logger.debug(
+            f"Using configuration preloaded by process {self.preloaded_pid}"
+        )
+        with track_stage(app, "preloaded"):
+            app.config.update(self.preloaded)
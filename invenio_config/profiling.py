@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration loading profiling.
+
+When profiling is enabled, each stage of the configuration loader, and each
+entry point module within the entry point stage, is recorded with its wall
+time and the number of configuration keys it set or overrode.
+"""
+
+from collections import namedtuple
+
+#: Timing of a configuration loading stage.
+StageTiming = namedtuple(
+    "StageTiming",
+    ["stage", "name", "wall_time", "import_time", "keys_set", "keys_overridden"],
+)
+
+
+class ConfigLoadTimings(object):
+    """Timings of the configuration loading.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self):
+        """Initialize timings."""
+        #: List of :data:`StageTiming` for the loader stages.
+        self.stages = []
+        #: List of :data:`StageTiming` for each entry point module.
+        self.entry_points = []
+
+    @property
+    def total(self):
+        """Total wall time of all stages."""
+        return sum(t.wall_time for t in self.stages)
+
+    def add(self, timing):
+        """Add a timing."""
+        if timing.stage == "entry_point":
+            self.entry_points.append(timing)
+        else:
+            self.stages.append(timing)
+
+    def slowest_entry_points(self, limit=10):
+        """Return the entry points that took the longest to load."""
+        return sorted(self.entry_points, key=lambda t: t.wall_time, reverse=True)[
+            :limit
+        ]
+
+    def as_dict(self):
+        """Return the timings as a JSON serializable dictionary."""
+        return {
+            "total": self.total,
+            "stages": [t._asdict() for t in self.stages],
+            "entry_points": [t._asdict() for t in self.entry_points],
+        }
+
+    def summary(self, limit=5):
+        """Return a human readable summary."""
+        lines = ["Configuration loaded in {0:.1f} ms".format(self.total * 1000)]
+        for t in self.stages:
+            lines.append(
+                "  {0:<16} {1:8.1f} ms  {2} set, {3} overridden".format(
+                    t.stage, t.wall_time * 1000, t.keys_set, t.keys_overridden
+                )
+            )
+        for t in self.slowest_entry_points(limit):
+            lines.append(
+                "  {0:<16} {1:8.1f} ms  (import {2:.1f} ms) {3}".format(
+                    "entry_point",
+                    t.wall_time * 1000,
+                    (t.import_time or 0) * 1000,
+                    t.name,
+                )
+            )
+        return "\n".join(lines)
+
+    def log_summary(self, logger):
+        """Log the summary at info level."""
+        logger.info(self.summary())
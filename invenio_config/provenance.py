@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration provenance.
+
+When provenance tracking is enabled, the configuration loader records for
+each key the ordered chain of sources which set it, e.g. entry point names,
+the instance folder file and environment variable names.
+"""
+
+from collections import namedtuple
+
+
+class ConfigSource(namedtuple("ConfigSource", ["stage", "name"])):
+    """A source of configuration values."""
+
+    __slots__ = ()
+
+    def location(self, key):
+        """Return a human readable location of a key in this source."""
+        if self.stage == "environment":
+            return "{0}{1}".format(self.name, key)
+        if self.name is None:
+            return self.stage
+        return "{0}:{1}".format(self.stage, self.name)
+
+
+class ConfigProvenance(object):
+    """Index of the sources of each configuration key.
+
+    Sources are stored once and keys only refer to them by their position, so
+    the index does not keep references to the configuration values unless
+    ``track_values`` is enabled.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, track_values=False):
+        """Initialize the index.
+
+        :param track_values: Also keep the value set by each source, so that
+            overridden values can be inspected.
+        """
+        self.track_values = track_values
+        #: List of :class:`ConfigSource`.
+        self.sources = []
+        self._source_ids = {}
+        self._keys = {}
+        self._values = {} if track_values else None
+
+    def _source_id(self, stage, name):
+        """Return the identifier of a source, registering it if needed."""
+        source = ConfigSource(stage, name)
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self.sources)
+            self.sources.append(source)
+        return source_id
+
+    def record(self, stage, name, keys, config):
+        """Record that a source set the given keys.
+
+        :param stage: The configuration loading stage.
+        :param name: The name of the source within the stage.
+        :param keys: The keys set by the source.
+        :param config: The configuration holding the values.
+        """
+        source_id = self._source_id(stage, name)
+        for key in keys:
+            self._keys.setdefault(key, []).append(source_id)
+            if self._values is not None:
+                self._values.setdefault(key, []).append(dict.get(config, key))
+
+    def __contains__(self, key):
+        """Check if the origin of a key is known."""
+        return key in self._keys
+
+    def origin(self, key):
+        """Return the source of the current value of a key, or ``None``."""
+        source_ids = self._keys.get(key)
+        return self.sources[source_ids[-1]] if source_ids else None
+
+    def sources_of(self, key):
+        """Return the sources which set a key, in loading order."""
+        return [self.sources[i] for i in self._keys.get(key, ())]
+
+    def history(self, key):
+        """Return ``(source, value)`` pairs for a key, in loading order.
+
+        :raises RuntimeError: If values are not tracked.
+        """
+        if self._values is None:
+            raise RuntimeError("Configuration values are not tracked.")
+        return list(zip(self.sources_of(key), self._values.get(key, ())))
+
+    def keys_from(self, stage, name=None):
+        """Return the keys whose current value comes from a source."""
+        source_id = self._source_ids.get(ConfigSource(stage, name))
+        return [k for k, ids in self._keys.items() if ids[-1] == source_id]
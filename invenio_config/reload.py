@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration file reloading.
+
+A :class:`ConfigFileWatcher` watches a Python configuration file and applies
+the values that changed to the application configuration, without
+restarting the process. File system events are received through `watchdog
+<https://pypi.org/project/watchdog/>`_ (inotify on Linux) if it is installed,
+otherwise the file is polled. ``watchdog`` is only imported when a watcher
+is started.
+"""
+
+import os
+import threading
+
+from .bytecode import load_config_file
+from .signals import config_changed
+
+_missing = object()
+
+
+def _create_observer(watcher):
+    """Return a watchdog observer waking up a watcher, or ``None``.
+
+    ``watchdog`` is only imported when a watcher starts, so that importing
+    the configuration loaders does not import it.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:  # pragma: no cover
+        return None
+
+    class EventHandler(FileSystemEventHandler):
+        """Notify the watcher about events concerning its file."""
+
+        def on_any_event(self, event):
+            """Wake up the watcher if its file changed."""
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            if watcher.filename in [os.path.abspath(p) for p in paths if p]:
+                watcher._event.set()
+
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(EventHandler(), os.path.dirname(watcher.filename))
+    return observer
+
+
+class ConfigFileWatcher(object):
+    """Reload a configuration file when it changes.
+
+    Only values which changed since the last load are written to the
+    application configuration, in a single :meth:`dict.update` call so that
+    readers see either all old or all new values of a reload. Keys which
+    were overridden by later configuration sources (e.g. environment
+    variables), or which are set by the keyword arguments or environment
+    variables of the configuration loader (see
+    :attr:`invenio_config.ext.InvenioConfig.pinned_keys`), are left
+    untouched, and keys removed from the file keep their last value. After
+    applying changes, the
+    :data:`invenio_config.signals.config_changed` signal is sent.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(
+        self,
+        app,
+        filename,
+        interval=1.0,
+        debounce=0.5,
+        use_events=True,
+        cache_dir=None,
+    ):
+        """Initialize watcher.
+
+        :param app: The Flask application.
+        :param filename: The path of the configuration file.
+        :param interval: Polling interval in seconds.
+        :param debounce: Time in seconds the file must remain unchanged before
+            it is reloaded.
+        :param use_events: Use file system events if ``watchdog`` is
+            installed, otherwise poll.
+        :param cache_dir: Directory of the bytecode cache (see
+            :func:`invenio_config.bytecode.compile_config_file`).
+        """
+        self.app = app
+        self.filename = os.path.abspath(filename)
+        self.interval = interval
+        self.debounce = debounce
+        self.use_events = use_events
+        self.cache_dir = cache_dir
+        self._values = {}
+        self._signature = None
+        self._event = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    def _stat(self):
+        """Return a signature of the file state."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def load(self):
+        """Load the file into the application configuration.
+
+        :returns: The set of changed keys.
+        """
+        # Record the state first, so that a broken file is reported once.
+        signature = self._signature = self._stat()
+        try:
+            values = (
+                load_config_file(self.filename, cache_dir=self.cache_dir)
+                if signature
+                else {}
+            )
+        except Exception:
+            self.app.logger.exception(
+                f"Failed to reload configuration file {self.filename}"
+            )
+            return set()
+
+        ext = self.app.extensions.get("invenio-config")
+        pinned = ext.pinned_keys if ext is not None else ()
+        changes = {}
+        for key, value in values.items():
+            old = self._values.get(key, _missing)
+            if key in pinned:
+                # Set by the keyword arguments or environment variables.
+                continue
+            if old is not _missing:
+                if old == value:
+                    # Keep the identity of unchanged values.
+                    values[key] = old
+                    continue
+                if self.app.config.get(key, _missing) is not old:
+                    # Overridden by a later configuration source.
+                    continue
+            changes[key] = value
+
+        self._values = values
+        if changes:
+            self.app.config.update(changes)
+            config_changed.send(self.app, keys=set(changes), source=self.filename)
+        return set(changes)
+
+    def check(self):
+        """Reload the file if it changed since the last load.
+
+        :returns: The set of changed keys.
+        """
+        if self._stat() == self._signature:
+            return set()
+        return self.load()
+
+    def _wait_for_change(self):
+        """Wait until the file changed or the watcher is stopped."""
+        if self._observer is not None:
+            changed = self._event.wait(self.interval)
+            self._event.clear()
+            # Changes may not produce events for the file itself, e.g. when
+            # a symlinked parent directory is swapped.
+            return changed or self._stat() != self._signature
+        self._stop.wait(self.interval)
+        return self._stat() != self._signature
+
+    def _run(self):
+        """Watch the file until stopped."""
+        while not self._stop.is_set():
+            if not self._wait_for_change():
+                continue
+            # Debounce: wait until the file stopped changing.
+            signature = self._stat()
+            while not self._stop.wait(self.debounce):
+                current = self._stat()
+                if current == signature:
+                    break
+                signature = current
+            if not self._stop.is_set():
+                self.check()
+
+    def start(self):
+        """Start watching the file in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        if self.use_events:
+            try:
+                observer = _create_observer(self)
+                if observer is not None:
+                    observer.start()
+            except OSError:
+                self.app.logger.warning(
+                    f"Cannot watch {self.filename} for events, polling instead"
+                )
+            else:
+                self._observer = observer
+        self._thread = threading.Thread(
+            target=self._run, name="invenio-config-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching the file."""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
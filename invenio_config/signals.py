@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio-Config signals."""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+config_changed = _signals.signal("config-changed")
+"""Signal sent when configuration values changed after the initial loading.
+
+Parameters:
+
+- ``sender`` - the Flask application.
+- ``keys`` - set of the changed configuration keys.
+- ``source`` - description of where the changes come from, e.g. the path of
+  the reloaded file.
+
+Example receiver:
+
+.. code-block:: python
+
+    def receiver(app, keys=None, source=None):
+        if "RATELIMIT_DEFAULT" in keys:
+            ...
+"""
@@ -0,0 +1,274 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration snapshots.
+
+A snapshot holds the configuration values set by the entry points, the
+configuration module and the instance folder, serialized to disk together
+with a fingerprint of all the inputs that produced it. As long as the
+fingerprint matches, the snapshot can be loaded instead of running these
+loading stages. The external sources, keyword arguments, environment
+variables and defaults are applied on top of the snapshot on each load, so
+their values, e.g. secrets, are never stored in the snapshot. Neither are
+the values Flask computes when creating the application, e.g. ``DEBUG``
+from the ``FLASK_DEBUG`` environment variable.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+from operator import attrgetter
+
+from werkzeug.utils import import_string
+
+from .discovery import entry_points
+
+#: Version of the snapshot file format.
+SNAPSHOT_VERSION = 2
+
+
+def _entry_points_fingerprint(group, index=None):
+    """Return a hashable description of the entry points in a group."""
+    result = []
+    for ep in sorted(entry_points(group, index=index), key=attrgetter("name")):
+        dist = getattr(ep, "dist", None)
+        result.append(
+            (
+                ep.name,
+                ep.value,
+                getattr(dist, "name", None),
+                getattr(dist, "version", None),
+            )
+        )
+    return result
+
+
+def _module_fingerprint(module):
+    """Return a hashable description of a configuration module or class.
+
+    Import strings are resolved, so that changes to the source file of the
+    module or class are detected.
+    """
+    if module is None:
+        return None
+    if isinstance(module, str):
+        module = import_string(module)
+    name = "{0}.{1}".format(
+        getattr(module, "__module__", None) or getattr(module, "__name__", ""),
+        getattr(module, "__qualname__", getattr(module, "__name__", "")),
+    )
+    try:
+        filename = inspect.getsourcefile(module)
+    except (TypeError, OSError):
+        filename = None
+    if filename and os.path.exists(filename):
+        stat = os.stat(filename)
+        return (name, filename, stat.st_mtime_ns, stat.st_size)
+    return name
+
+
+def _file_fingerprint(filename):
+    """Return a hashable description of a (possibly missing) file."""
+    try:
+        with open(filename, "rb") as fp:
+            digest = hashlib.sha256(fp.read()).hexdigest()
+    except OSError:
+        return (filename, None)
+    stat = os.stat(filename)
+    return (filename, stat.st_mtime_ns, stat.st_size, digest)
+
+
+def _directory_fingerprint(directory):
+    """Return a hashable description of the files of a directory."""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return (directory, None)
+    return (
+        directory,
+        [_file_fingerprint(os.path.join(directory, name)) for name in names],
+    )
+
+
+class ConfigSnapshot(object):
+    """Load and store fully merged configuration from a snapshot file.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(
+        self,
+        path,
+        config=None,
+        entry_point_group="invenio_config.module",
+        entry_point_index=None,
+        instance_formats=(),
+        config_directory=False,
+    ):
+        """Initialize snapshot.
+
+        :param path: Path of the snapshot file.
+        :param config: The configuration module given to the config loader.
+        :param entry_point_group: The configuration entry point group.
+        :param entry_point_index: Path of an entry point index file.
+        :param instance_formats: The structured file extensions loaded from
+            the instance folder.
+        :param config_directory: Whether the configuration directory of the
+            instance folder is loaded.
+        """
+        self.path = path
+        self.config = config
+        self.entry_point_group = entry_point_group
+        self.entry_point_index = entry_point_index
+        self.instance_formats = instance_formats
+        self.config_directory = config_directory
+
+    def fingerprint(self, app):
+        """Compute the fingerprint of all inputs of the snapshot.
+
+        :param app: The Flask application.
+        :returns: A hexadecimal digest.
+        """
+        from . import __version__
+
+        root_path = app.config.root_path
+        inputs = (
+            SNAPSHOT_VERSION,
+            __version__,
+            sys.version,
+            app.name,
+            _entry_points_fingerprint(
+                self.entry_point_group, index=self.entry_point_index
+            ),
+            _module_fingerprint(self.config),
+            _file_fingerprint(os.path.join(root_path, "{0}.cfg".format(app.name))),
+            [
+                _file_fingerprint(
+                    os.path.join(root_path, "{0}.{1}".format(app.name, ext))
+                )
+                for ext in self.instance_formats
+            ],
+            (
+                _directory_fingerprint(
+                    os.path.join(root_path, "{0}.d".format(app.name))
+                )
+                if self.config_directory
+                else None
+            ),
+        )
+        return hashlib.sha256(repr(inputs).encode("utf-8")).hexdigest()
+
+    def load(self, app, fingerprint):
+        """Load the snapshot into the application configuration.
+
+        :param app: The Flask application.
+        :param fingerprint: The expected fingerprint.
+        :returns: ``True`` if the snapshot was loaded, ``False`` otherwise.
+        """
+        try:
+            with open(self.path, "rb") as fp:
+                data = pickle.load(fp)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            app.logger.warning(
+                f"Ignoring unreadable configuration snapshot {self.path}",
+                exc_info=True,
+            )
+            return False
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != SNAPSHOT_VERSION
+            or data.get("fingerprint") != fingerprint
+        ):
+            app.logger.debug(f"Configuration snapshot {self.path} is outdated")
+            return False
+
+        app.config.update(data["config"])
+        app.logger.debug(f"Loaded configuration snapshot {self.path}")
+        return True
+
+    def dump(self, app, fingerprint, keys=None):
+        """Write the application configuration to the snapshot file.
+
+        The file is replaced atomically. Configuration values which cannot be
+        pickled make the snapshot unusable, in which case nothing is written.
+        Errors writing the file, e.g. on a read-only file system, are logged
+        and the configuration already loaded is used as is.
+
+        :param app: The Flask application.
+        :param fingerprint: The fingerprint of the configuration inputs.
+        :param keys: The keys to store, i.e. those set by the snapshotted
+            loading stages. Defaults to all keys.
+        :returns: ``True`` if the snapshot was written, ``False`` otherwise.
+        """
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": fingerprint,
+            "config": {
+                key: value
+                for key, value in app.config.items()
+                if keys is None or key in keys
+            },
+        }
+        try:
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            app.logger.warning(
+                "Configuration cannot be pickled, snapshot not written",
+                exc_info=True,
+            )
+            return False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmppath = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        except OSError:
+            app.logger.warning(
+                f"Cannot write configuration snapshot {self.path}", exc_info=True
+            )
+            return False
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(payload)
+            os.replace(tmppath, self.path)
+        except OSError:
+            os.unlink(tmppath)
+            app.logger.warning(
+                f"Cannot write configuration snapshot {self.path}", exc_info=True
+            )
+            return False
+        except BaseException:
+            os.unlink(tmppath)
+            raise
+        return True
+
+
+def build_config_snapshot(app, path, **options):
+    """Run the full configuration loader and write a snapshot.
+
+    Intended to be called during image build so that workers started later
+    can load the snapshot instead of the individual configuration sources.
+    The loader options must be those of the workers' loader, as some of them
+    (e.g. ``instance_formats``) are part of the fingerprint.
+
+    :param app: The Flask application to load the configuration into.
+    :param path: Path of the snapshot file.
+    :param options: The options of
+        :func:`~invenio_config.utils.create_config_loader`.
+    :returns: The fingerprint of the written snapshot.
+
+    .. versionadded:: 1.2.0
+    """
+    from .utils import ConfigLoader
+
+    loader = ConfigLoader(snapshot_path=path, **options)
+    if os.path.exists(path):
+        os.unlink(path)
+    loader(app)
+    return loader.snapshot().fingerprint(app)
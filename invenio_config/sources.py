@@ -0,0 +1,253 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio external configuration sources.
+
+Secrets such as ``SECRET_KEY`` or database credentials are often kept in a
+secret store rather than in configuration files. A
+:class:`CachedConfigSource` makes the keys of such a store available in the
+application configuration:
+
+- values are fetched when loading the configuration, so reading the
+  configuration never waits for the store,
+- fetched values are cached for ``ttl`` seconds and shared by the
+  applications loaded in this time,
+- a background thread refreshes the cached values and applies the changed
+  ones to the application configuration, so that rotated secrets are picked
+  up without restarting.
+
+:class:`SecretsDirectory` reads a directory containing one file per key, as
+mounted by Kubernetes or Docker secrets:
+
+.. code-block:: python
+
+    config_loader = create_config_loader(
+        config=config, sources=[SecretsDirectory("/run/secrets")]
+    )
+"""
+
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from time import monotonic
+
+from .ext import get_extension
+from .signals import config_changed
+
+_missing = object()
+
+#: Sources whose background refresh is running.
+_refreshing = weakref.WeakSet()
+
+
+def _restart_after_fork():
+    """Restart the background refresh of the sources in a forked child.
+
+    Threads do not survive :func:`os.fork`, e.g. with ``gunicorn --preload``
+    or prefork celery workers, so the child starts its own.
+    """
+    for source in list(_refreshing):
+        source._lock = threading.Lock()
+        source._stop = threading.Event()
+        source._thread = None
+        source.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+class CachedConfigSource(ABC):
+    """Base class of configuration sources backed by an external store.
+
+    Subclasses implement :meth:`list_keys` and :meth:`fetch`. A source can be
+    used by several applications, which then share its cache.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app=None, ttl=300.0, background=True):
+        """Initialize source.
+
+        :param ttl: Time in seconds fetched values are cached.
+        :param background: Refresh the cached values in a background thread
+            every ``ttl`` seconds. Otherwise expired values are fetched again
+            when loading another application, and changes are only applied
+            by :meth:`refresh`.
+        """
+        self.ttl = ttl
+        self.background = background
+        self._cache = {}
+        self._apps = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if app:
+            self.init_app(app)
+
+    @property
+    def name(self):
+        """Return a description of the source, used in logs and signals."""
+        return type(self).__name__
+
+    @abstractmethod
+    def list_keys(self):
+        """Return the configuration keys available in the store."""
+
+    @abstractmethod
+    def fetch(self, key):
+        """Fetch the value of a key from the store.
+
+        :raises KeyError: If the key does not exist.
+        """
+
+    def get(self, key):
+        """Return the value of a key, fetching it if not cached or expired.
+
+        While the background refresh is running, cached values are returned
+        even if expired.
+        """
+        entry = self._cache.get(key)
+        if entry is not None and (self.is_refreshing() or monotonic() < entry[1]):
+            return entry[0]
+        value = self.fetch(key)
+        with self._lock:
+            self._cache[key] = (value, monotonic() + self.ttl)
+        return value
+
+    def init_app(self, app):
+        """Initialize Flask application.
+
+        The values of all keys are fetched, unless cached, and set in the
+        application configuration.
+        """
+        values = {}
+        for key in self.list_keys():
+            try:
+                values[key] = self.get(key)
+            except KeyError:
+                # Removed since listed.
+                continue
+        app.config.update(values)
+        self._apps[app] = set(values)
+        if self.background:
+            self.start()
+            ext = get_extension(app)
+            if self not in ext.watchers:
+                ext.watchers.append(self)
+
+    def refresh(self):
+        """Fetch the cached values again and apply the changed ones.
+
+        Keys which were overridden by later configuration sources are left
+        untouched, and keys removed from the store keep their last value.
+        The :data:`invenio_config.signals.config_changed` signal is sent for
+        each application whose configuration changed.
+
+        :returns: The set of changed keys.
+        """
+        changed = {}
+        for key, (old, expires) in list(self._cache.items()):
+            try:
+                value = self.fetch(key)
+            except KeyError:
+                continue
+            except Exception:
+                for app in list(self._apps.keys()):
+                    app.logger.exception(f"Failed to refresh {key} from {self.name}")
+                continue
+            if value == old:
+                # Keep the identity of unchanged values.
+                value = old
+            else:
+                changed[key] = (old, value)
+            with self._lock:
+                self._cache[key] = (value, monotonic() + self.ttl)
+
+        for app, keys in list(self._apps.items()):
+            changes = {}
+            for key, (old, value) in changed.items():
+                if key in keys and dict.get(app.config, key, _missing) is old:
+                    changes[key] = value
+            if changes:
+                app.config.update(changes)
+                config_changed.send(app, keys=set(changes), source=self.name)
+        return set(changed)
+
+    def _run(self):
+        """Refresh the cached values until stopped."""
+        while not self._stop.wait(self.ttl):
+            self.refresh()
+
+    def is_refreshing(self):
+        """Check if the background refresh is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start refreshing the cached values in a background thread."""
+        if self.is_refreshing():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="invenio-config-source", daemon=True
+        )
+        self._thread.start()
+        _refreshing.add(self)
+
+    def stop(self):
+        """Stop refreshing the cached values."""
+        _refreshing.discard(self)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class SecretsDirectory(CachedConfigSource):
+    """Load configuration from a directory with one file per key.
+
+    Each uppercase file name is a configuration key, and the content of the
+    file, without trailing newline, its value. Hidden files, such as the
+    ``..data`` links of Kubernetes secret volumes, are ignored. A missing
+    directory provides no keys.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, path, app=None, encoding="utf-8", **kwargs):
+        """Initialize source.
+
+        :param path: Path of the secrets directory.
+        :param encoding: Encoding of the files.
+        """
+        self.path = path
+        self.encoding = encoding
+        super().__init__(app=app, **kwargs)
+
+    @property
+    def name(self):
+        """Return the path of the directory."""
+        return self.path
+
+    def list_keys(self):
+        """Return the names of the files in the directory."""
+        try:
+            names = sorted(os.listdir(self.path))
+        except OSError:
+            return []
+        return [
+            name
+            for name in names
+            if name.isupper()
+            and not name.startswith(".")
+            and os.path.isfile(os.path.join(self.path, name))
+        ]
+
+    def fetch(self, key):
+        """Read the file of a key."""
+        try:
+            with open(os.path.join(self.path, key), encoding=self.encoding) as fp:
+                return fp.read().rstrip("\r\n")
+        except FileNotFoundError:
+            raise KeyError(key)
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio structured instance folder configuration.
+
+Loads configuration from TOML, JSON or YAML files in the instance folder.
+Unlike ``cfg`` files, these files are parsed and never executed. Only the
+top-level uppercase keys are stored in the application configuration.
+
+Parsing TOML requires Python 3.11 or `tomli <https://pypi.org/project/tomli/>`_
+and parsing YAML requires `PyYAML <https://pypi.org/project/PyYAML/>`_,
+which are installed by the ``toml`` and ``yaml`` extras, e.g.
+``pip install invenio-config[toml,yaml]``.
+"""
+
+import json
+import os
+
+from .ext import track_stage
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+
+def _uppercase_members(data, kind):
+    """Return the uppercase members of a parsed document.
+
+    :raises ValueError: If the top level of the document is not a mapping.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(
+            "The top level of a {0} document must be a mapping, not {1}".format(
+                kind, type(data).__name__
+            )
+        )
+    return {k: v for k, v in data.items() if isinstance(k, str) and k.isupper()}
+
+
+def load_json(text):
+    """Load the uppercase members of a JSON object.
+
+    :param text: The JSON document.
+    :returns: A dictionary.
+    :raises ValueError: If the document is invalid or not an object.
+
+    .. versionadded:: 1.2.0
+    """
+    return _uppercase_members(json.loads(text), "JSON")
+
+
+def load_toml(text):
+    """Load the uppercase keys of a TOML document.
+
+    :param text: The TOML document.
+    :returns: A dictionary.
+    :raises ValueError: If the document is invalid.
+
+    .. versionadded:: 1.2.0
+    """
+    if tomllib is None:  # pragma: no cover
+        raise RuntimeError("Parsing TOML requires Python 3.11 or tomli.")
+    return _uppercase_members(tomllib.loads(text), "TOML")
+
+
+def load_yaml(text):
+    """Load the uppercase keys of a YAML document.
+
+    :param text: The YAML document.
+    :returns: A dictionary.
+    :raises ValueError: If the document is invalid or not a mapping.
+
+    .. versionadded:: 1.2.0
+    """
+    if yaml is None:  # pragma: no cover
+        raise RuntimeError("Parsing YAML requires PyYAML.")
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        data = yaml.load(text, Loader=loader)
+    except yaml.YAMLError as e:
+        raise ValueError(str(e))
+    return _uppercase_members({} if data is None else data, "YAML")
+
+
+#: Parser of each supported file extension.
+LOADERS = {
+    "toml": load_toml,
+    "json": load_json,
+    "yaml": load_yaml,
+    "yml": load_yaml,
+}
+
+
+def load_structured(filename, text):
+    """Parse a structured file with the parser of its extension.
+
+    :param filename: The path of the file.
+    :param text: The content of the file.
+    :returns: A dictionary.
+    :raises ValueError: If the file is invalid, with its path in the message.
+
+    .. versionadded:: 1.2.0
+    """
+    ext = os.path.splitext(filename)[1][1:]
+    try:
+        return LOADERS[ext](text)
+    except ValueError as e:
+        raise ValueError("Invalid configuration file {0}: {1}".format(filename, e))
+
+
+class InvenioConfigStructuredFile(object):
+    """Load configuration from structured files in folder.
+
+    The files ``<app.name>.toml``, ``<app.name>.json``, ``<app.name>.yaml``
+    and ``<app.name>.yml`` are read in this order, if they exist, from the
+    same folder as the ``cfg`` file of
+    :class:`~invenio_config.folder.InvenioConfigInstanceFolder`.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, app=None, formats=("toml", "json", "yaml", "yml")):
+        """Initialize extension.
+
+        :param formats: File extensions to look for, in loading order.
+        """
+        self.formats = formats
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Initialize Flask application."""
+        for ext in self.formats:
+            filename = os.path.join(
+                app.config.root_path, "{0}.{1}".format(app.name, ext)
+            )
+            try:
+                with open(filename, encoding="utf-8") as fp:
+                    text = fp.read()
+            except OSError:
+                continue
+
+            app.logger.debug(f"Loading config from {filename}")
+            with track_stage(app, "instance_folder", filename):
+                app.config.update(load_structured(filename, text))
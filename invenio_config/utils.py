@@ -4,14 +4,42 @@
 
 """Default configuration loader usable by e.g. Invenio-Base."""
 
+import os
+
+from .confd import InvenioConfigDirectory
 from .default import InvenioConfigDefault
 from .entrypoint import InvenioConfigEntryPointModule
 from .env import InvenioConfigEnvironment
+from .ext import get_extension, record_keys, track_stage
 from .folder import InvenioConfigInstanceFolder
+from .metrics import install_config_meter
 from .module import InvenioConfigModule
+from .profiling import ConfigLoadTimings
+from .provenance import ConfigProvenance
+from .snapshot import ConfigSnapshot
+from .structured import InvenioConfigStructuredFile
+from .validation import validate_config
 
 
-def create_config_loader(config=None, env_prefix="APP"):
+def create_config_loader(
+    config=None,
+    env_prefix="APP",
+    snapshot_path=None,
+    key_index=None,
+    profile=False,
+    provenance=False,
+    provenance_values=False,
+    watch=False,
+    parallel=False,
+    max_workers=None,
+    entry_point_index=None,
+    instance_formats=(),
+    config_directory=False,
+    sources=(),
+    meter=False,
+    validate=False,
+    bytecode_cache_dir=None,
+):
     """Create a default configuration loader.
 
     A configuration loader takes a Flask application and keyword arguments and
@@ -29,32 +57,280 @@ def create_config_loader(config=None, env_prefix="APP"):
         2. Load configuration from ``config`` module if provided as argument.
         3. Load configuration from the instance folder:
            ``<app.instance_path>/<app.name>.cfg``.
-        4. Load configuration keyword arguments provided.
-        5. Load configuration from environment variables with the prefix
+        4. Load configuration from the external ``sources``, if any.
+        5. Load configuration keyword arguments provided.
+        6. Load configuration from environment variables with the prefix
            ``env_prefix``.
 
     If no secret key has been set a warning will be issued.
 
+    If ``snapshot_path`` is given, the configuration merged from the first
+    three steps is stored in a snapshot file (see
+    :class:`invenio_config.snapshot.ConfigSnapshot`) and subsequent loads read
+    the snapshot instead, as long as none of their inputs (entry points,
+    config module and instance folder files) changed. The remaining steps
+    are always applied, so values of external sources, keyword arguments and
+    environment variables are never stored in the snapshot.
+
     :param config: Either an import string to a module with configuration or
         alternatively the module itself.
     :param env_prefix: Environment variable prefix to import configuration
         from.
-    :return: A callable with the method signature
+    :param snapshot_path: Path of the configuration snapshot file.
+    :param key_index: Key index of the entry point configuration modules. If
+        given, the modules are imported lazily (see
+        :class:`invenio_config.entrypoint.InvenioConfigEntryPointModule`).
+    :param profile: Record the timings of each loading stage in
+        ``app.extensions['invenio-config'].timings`` (see
+        :class:`invenio_config.profiling.ConfigLoadTimings`) and log a
+        summary.
+    :param provenance: Record the sources of each configuration key in
+        ``app.extensions['invenio-config'].provenance`` (see
+        :class:`invenio_config.provenance.ConfigProvenance`).
+    :param provenance_values: Also record the values set by each source,
+        including overridden ones.
+    :param watch: Reload the instance folder configuration file when it
+        changes (see :class:`invenio_config.reload.ConfigFileWatcher`).
+    :param parallel: Import the entry point configuration modules
+        concurrently.
+    :param max_workers: Number of threads importing the entry point
+        configuration modules in parallel mode.
+    :param entry_point_index: Path of an entry point index file (see
+        :mod:`invenio_config.discovery`).
+    :param instance_formats: Also load structured files with these
+        extensions from the instance folder, e.g. ``("toml", "json")`` (see
+        :class:`invenio_config.structured.InvenioConfigStructuredFile`).
+    :param config_directory: Also load the files of the ``<app.name>.d``
+        directory of the instance folder (see
+        :class:`invenio_config.confd.InvenioConfigDirectory`).
+    :param sources: External configuration sources, e.g. a secrets directory
+        (see :class:`invenio_config.sources.CachedConfigSource`).
+    :param meter: Count the reads of each configuration key once loaded (see
+        :mod:`invenio_config.metrics`).
+    :param validate: Validate the configuration against the schemas declared
+        by the ``invenio_config.schema`` entry points and log the problems
+        found (see :mod:`invenio_config.validation`). With ``"strict"``, a
+        :class:`~invenio_config.validation.ConfigValidationError` is raised
+        instead.
+    :param bytecode_cache_dir: Directory where the compiled code of the
+        instance folder configuration files is cached (see
+        :mod:`invenio_config.bytecode`).
+    :return: A :class:`ConfigLoader`, callable with the method signature
         ``config_loader(app, **kwargs)``.
+    :raises ValueError: If ``snapshot_path`` is combined with ``watch``.
 
     .. versionadded:: 1.0.0
+
+    .. versionchanged:: 1.2.0
+       Added the ``snapshot_path``, ``key_index``, ``profile``,
+       ``provenance``, ``provenance_values``, ``watch``, ``parallel``,
+       ``max_workers``, ``entry_point_index``, ``instance_formats``,
+       ``config_directory``, ``sources``, ``meter``, ``validate`` and
+       ``bytecode_cache_dir`` arguments.
     """
+    return ConfigLoader(
+        config=config,
+        env_prefix=env_prefix,
+        snapshot_path=snapshot_path,
+        key_index=key_index,
+        profile=profile,
+        provenance=provenance,
+        provenance_values=provenance_values,
+        watch=watch,
+        parallel=parallel,
+        max_workers=max_workers,
+        entry_point_index=entry_point_index,
+        instance_formats=instance_formats,
+        config_directory=config_directory,
+        sources=sources,
+        meter=meter,
+        validate=validate,
+        bytecode_cache_dir=bytecode_cache_dir,
+    )
+
+
+class ConfigLoader(object):
+    """Default configuration loader.
+
+    The loader returned by :func:`create_config_loader`, see there for the
+    loading order and the arguments. Its stages are also used by the
+    alternate loaders, e.g. :class:`invenio_config.prefork.PreforkConfigLoader`
+    and :class:`invenio_config.overlay.SharedConfigLoader`, which replace some
+    of them:
+
+    - :meth:`prepare` sets up profiling and provenance,
+    - :meth:`load_base` loads the entry point, module and instance folder
+      configuration, from the snapshot if any,
+    - :meth:`load_overrides` applies the external sources, keyword arguments,
+      environment variables and defaults,
+    - :meth:`finalize` validates and meters the configuration.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(
+        self,
+        config=None,
+        env_prefix="APP",
+        snapshot_path=None,
+        key_index=None,
+        profile=False,
+        provenance=False,
+        provenance_values=False,
+        watch=False,
+        parallel=False,
+        max_workers=None,
+        entry_point_index=None,
+        instance_formats=(),
+        config_directory=False,
+        sources=(),
+        meter=False,
+        validate=False,
+        bytecode_cache_dir=None,
+    ):
+        """Initialize loader.
+
+        :raises ValueError: If ``snapshot_path`` is combined with ``watch``.
+        """
+        if snapshot_path and watch:
+            raise ValueError(
+                "The instance folder is not loaded from a snapshot, "
+                "snapshot_path cannot be combined with watch."
+            )
+        self.config = config
+        self.env_prefix = env_prefix
+        self.snapshot_path = snapshot_path
+        self.key_index = key_index
+        self.profile = profile
+        self.provenance = provenance
+        self.provenance_values = provenance_values
+        self.watch = watch
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.entry_point_index = entry_point_index
+        self.instance_formats = instance_formats
+        self.config_directory = config_directory
+        self.sources = sources
+        self.meter = meter
+        self.validate = validate
+        self.bytecode_cache_dir = bytecode_cache_dir
+
+    def __call__(self, app, **kwargs_config):
+        """Load the configuration of an application."""
+        self.prepare(app)
+        self.load_base(app)
+        self.load_overrides(app, kwargs_config)
+        self.finalize(app)
+
+    def prepare(self, app):
+        """Set up profiling and provenance tracking."""
+        if self.profile:
+            get_extension(app).timings = ConfigLoadTimings()
+        if self.provenance:
+            get_extension(app).provenance = ConfigProvenance(
+                track_values=self.provenance_values
+            )
+
+    def load_base(self, app):
+        """Load the entry point, module and instance folder configuration.
+
+        If a snapshot path is set, the snapshot is used when its inputs did
+        not change, and written otherwise.
+        """
+        if not self.snapshot_path:
+            self.load_entry_points(app)
+            self.load_module(app)
+            self.load_instance_folder(app)
+            return
+        snapshot = self.snapshot()
+        with track_stage(app, "snapshot"):
+            fingerprint = snapshot.fingerprint(app)
+            loaded = snapshot.load(app, fingerprint)
+        if not loaded:
+            with record_keys(app) as keys:
+                self.load_entry_points(app)
+                self.load_module(app)
+                self.load_instance_folder(app)
+            snapshot.dump(app, fingerprint, keys)
+
+    def snapshot(self):
+        """Return the configuration snapshot of the loader, if any.
+
+        :returns: A :class:`~invenio_config.snapshot.ConfigSnapshot` or
+            ``None``.
+        """
+        if not self.snapshot_path:
+            return None
+        return ConfigSnapshot(
+            self.snapshot_path,
+            config=self.config,
+            entry_point_index=self.entry_point_index,
+            instance_formats=self.instance_formats,
+            config_directory=self.config_directory,
+        )
+
+    def load_entry_points(self, app):
+        """Load the entry point configuration modules."""
+        with track_stage(app, "entry_points", record_sources=False):
+            InvenioConfigEntryPointModule(
+                app=app,
+                lazy=self.key_index is not None,
+                key_index=self.key_index,
+                parallel=self.parallel,
+                max_workers=self.max_workers,
+                entry_point_index=self.entry_point_index,
+            )
+
+    def load_module(self, app):
+        """Load the configuration module, if any."""
+        if self.config:
+            with track_stage(
+                app, "module", getattr(self.config, "__name__", self.config)
+            ):
+                InvenioConfigModule(app=app, module=self.config)
+
+    def load_instance_folder(self, app):
+        """Load the configuration files of the instance folder."""
+        with track_stage(
+            app,
+            "instance_folder",
+            os.path.join(app.config.root_path, "{0}.cfg".format(app.name)),
+        ):
+            InvenioConfigInstanceFolder(
+                app=app, watch=self.watch, cache_dir=self.bytecode_cache_dir
+            )
+        if self.instance_formats:
+            InvenioConfigStructuredFile(app=app, formats=self.instance_formats)
+        if self.config_directory:
+            InvenioConfigDirectory(app=app, cache_dir=self.bytecode_cache_dir)
+
+    def load_overrides(self, app, kwargs_config):
+        """Apply sources, keyword arguments, environment and defaults."""
+        for source in self.sources:
+            with track_stage(app, "source", source.name):
+                source.init_app(app)
+        with track_stage(app, "kwargs"):
+            app.config.update(**kwargs_config)
+        prefix = "{0}_".format(self.env_prefix)
+        with track_stage(app, "environment", prefix):
+            env_values = InvenioConfigEnvironment(prefix=prefix).collect(app)
+            app.config.update(env_values)
+        if self.watch or self.config_directory:
+            get_extension(app).pinned_keys.update(kwargs_config, env_values)
+        with track_stage(app, "default"):
+            InvenioConfigDefault(app=app)
 
-    def _config_loader(app, **kwargs_config):
-        InvenioConfigEntryPointModule(app=app)
-        if config:
-            InvenioConfigModule(app=app, module=config)
-        InvenioConfigInstanceFolder(app=app)
-        app.config.update(**kwargs_config)
-        InvenioConfigEnvironment(app=app, prefix="{0}_".format(env_prefix))
-        InvenioConfigDefault(app=app)
+    def finalize(self, app):
+        """Validate and meter the loaded configuration."""
+        if self.validate:
+            validate_config(
+                app, strict=self.validate == "strict", index=self.entry_point_index
+            )
+        if self.meter:
+            install_config_meter(app)
 
-    return _config_loader
+        if self.profile:
+            app.extensions["invenio-config"].timings.log_summary(app.logger)
 
 
 def create_conf_loader(*args, **kwargs):  # pragma: no cover
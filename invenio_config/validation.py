@@ -0,0 +1,306 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Invenio configuration validation.
+
+Extensions declare the types of the configuration keys they own with an
+entry point in the ``invenio_config.schema`` group, next to their
+``invenio_config.module`` entry point, pointing to a dictionary:
+
+.. code-block:: python
+
+    # invenio_search/config.py
+    SCHEMA = {
+        "SEARCH_HOSTS": (list, str),
+        "SEARCH_INDEX_PREFIX": str,
+        "SEARCH_CLIENT_CONFIG": (dict, None),
+    }
+
+    # setup.cfg
+    [options.entry_points]
+    invenio_config.schema =
+        invenio_search = invenio_search.config:SCHEMA
+
+A type is a class, ``None`` or a tuple of them. Each schema owns the keys
+starting with its prefix, which is the longest common prefix of its keys
+ending with an underscore (``SEARCH_`` above), unless given explicitly with
+the ``"__prefix__"`` item.
+
+The schemas are compiled once per process into a :class:`ConfigValidator`,
+which reports in a single pass over the configuration:
+
+- unknown keys, i.e. keys starting with the prefix owned by a schema which
+  are not declared themselves, with suggestions of similar keys declared by
+  that schema,
+- values whose type does not match the schema,
+- suspicious overrides, i.e. sources replacing a value with a value of
+  another type, if the values set by each source are tracked (see
+  :class:`invenio_config.provenance.ConfigProvenance`).
+
+Values not loaded yet (see :class:`invenio_config.mapping.LazyValue`) are
+not checked.
+"""
+
+import difflib
+import os
+from operator import attrgetter
+
+from .discovery import entry_points
+from .mapping import LazyValue
+
+#: Entry point group of the configuration schemas.
+SCHEMA_ENTRY_POINT_GROUP = "invenio_config.schema"
+
+_missing = object()
+
+#: Immutable equivalents of the types converted by freezing.
+_FROZEN_TYPES = {list: tuple, set: frozenset}
+
+#: Schema item giving the prefix of the keys owned by the schema.
+PREFIX_KEY = "__prefix__"
+
+#: Compiled validators, keyed by the entry points they were compiled from.
+_validators = {}
+
+
+class ConfigValidationError(ValueError):
+    """Configuration does not match the declared schemas.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, report):
+        """Initialize exception.
+
+        :param report: The :class:`ConfigValidationReport`.
+        """
+        self.report = report
+        super().__init__("\n".join(report.messages()))
+
+
+class ConfigValidationReport(object):
+    """Problems found by a :class:`ConfigValidator`.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self):
+        """Initialize report."""
+        #: List of ``(key, suggestions)`` tuples.
+        self.unknown = []
+        #: List of ``(key, types, value)`` tuples.
+        self.mismatches = []
+        #: List of ``(key, source, overriding_source)`` tuples.
+        self.overrides = []
+
+    def __bool__(self):
+        """Check if any problem was found."""
+        return bool(self.unknown or self.mismatches or self.overrides)
+
+    def messages(self):
+        """Return a human readable description of each problem."""
+        messages = []
+        for key, suggestions in self.unknown:
+            message = "Unknown configuration key {0}".format(key)
+            if suggestions:
+                message += ", did you mean {0}?".format(" or ".join(suggestions))
+            messages.append(message)
+        for key, types, value in self.mismatches:
+            messages.append(
+                "Configuration key {0} should be of type {1}, not {2}".format(
+                    key,
+                    " or ".join(_type_name(t) for t in types),
+                    _type_name(type(value)),
+                )
+            )
+        for key, source, overriding in self.overrides:
+            messages.append(
+                "Configuration key {0} set by {1} is overridden by {2} with a "
+                "value of another type".format(
+                    key, source.location(key), overriding.location(key)
+                )
+            )
+        return messages
+
+    def raise_for_errors(self):
+        """Raise an exception if any problem was found.
+
+        :raises ConfigValidationError: If the report is not empty.
+        """
+        if self:
+            raise ConfigValidationError(self)
+
+
+def _type_name(type_):
+    """Return the name of a type."""
+    return "None" if type_ is type(None) else type_.__name__
+
+
+def _normalize_types(spec):
+    """Return the tuple of types allowed by a schema type."""
+    if not isinstance(spec, tuple):
+        spec = (spec,)
+    types = tuple(type(None) if t is None else t for t in spec)
+    for t in types:
+        if not isinstance(t, type):
+            raise TypeError("Invalid schema type {0!r}".format(t))
+    return types
+
+
+def schema_prefix(schema):
+    """Return the prefix of the keys owned by a schema.
+
+    :param schema: Dictionary of types keyed by configuration key.
+    :returns: The ``"__prefix__"`` item if any, otherwise the longest common
+        prefix of the keys ending with an underscore, or ``None``.
+
+    .. versionadded:: 1.2.0
+    """
+    prefix = schema.get(PREFIX_KEY)
+    if prefix is None:
+        common = os.path.commonprefix([key for key in schema if key != PREFIX_KEY])
+        prefix = common[: common.rfind("_") + 1]
+    return prefix or None
+
+
+class ConfigValidator(object):
+    """Validator compiled from configuration schemas.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, schema, prefixes=None):
+        """Compile the validator.
+
+        :param schema: Dictionary of types keyed by configuration key.
+        :param prefixes: Prefixes of the owned keys, defaults to the prefix
+            of the schema (see :func:`schema_prefix`).
+        """
+        if prefixes is None:
+            prefixes = [schema_prefix(schema)]
+        self.types = {
+            key: _normalize_types(spec)
+            for key, spec in schema.items()
+            if key != PREFIX_KEY
+        }
+        self.keys = sorted(self.types)
+        # Frozen values (see :func:`invenio_config.frozen.freeze_value`), e.g.
+        # of a shared base configuration, match the types they were frozen
+        # from.
+        self._frozen_types = {
+            key: tuple(_FROZEN_TYPES[t] for t in types if t in _FROZEN_TYPES)
+            for key, types in self.types.items()
+        }
+        self.prefixes = tuple(sorted({prefix for prefix in prefixes if prefix}))
+        self._prefix_keys = {
+            prefix: [key for key in self.keys if key.startswith(prefix)]
+            for prefix in self.prefixes
+        }
+
+    def suggestions(self, key):
+        """Return the declared keys similar to an unknown key.
+
+        Only the keys under the prefixes owning the key are compared.
+        """
+        candidates = []
+        for prefix, keys in self._prefix_keys.items():
+            if key.startswith(prefix):
+                candidates.extend(keys)
+        return difflib.get_close_matches(key, candidates, n=3, cutoff=0.8)
+
+    def validate(self, config, provenance=None):
+        """Validate a configuration.
+
+        :param config: The configuration.
+        :param provenance: The :class:`~invenio_config.provenance.ConfigProvenance`
+            of the configuration, to report suspicious overrides.
+        :returns: A :class:`ConfigValidationReport`.
+        """
+        report = ConfigValidationReport()
+        types = self.types
+        prefixes = self.prefixes
+        for key in config:
+            # Read the stored value, so that pending values are not resolved,
+            # and fall back to the mapping for keys of a shared base.
+            value = dict.get(config, key, _missing)
+            if value is _missing:
+                value = config[key]
+            expected = types.get(key)
+            if expected is None:
+                if prefixes and key.startswith(prefixes):
+                    report.unknown.append((key, self.suggestions(key)))
+            elif (
+                type(value) is not LazyValue
+                and not isinstance(value, expected)
+                and not isinstance(value, self._frozen_types[key])
+            ):
+                report.mismatches.append((key, expected, value))
+
+        if provenance is not None and provenance.track_values:
+            for key in self.keys:
+                history = provenance.history(key)
+                for (source, old), (overriding, new) in zip(history, history[1:]):
+                    if (
+                        old is not None
+                        and new is not None
+                        and type(old) is not LazyValue
+                        and type(new) is not LazyValue
+                        and type(old) is not type(new)
+                    ):
+                        report.overrides.append((key, source, overriding))
+        return report
+
+
+def get_validator(group=SCHEMA_ENTRY_POINT_GROUP, index=None):
+    """Return the validator of the declared schemas.
+
+    The validator is compiled once per process, and again only if the
+    entry points or the versions of their distributions changed.
+
+    :param group: The entry point group.
+    :param index: Path of an entry point index file.
+    :returns: A :class:`ConfigValidator`.
+
+    .. versionadded:: 1.2.0
+    """
+    eps = sorted(entry_points(group, index=index), key=attrgetter("name"))
+    cache_key = (group,) + tuple(
+        (ep.name, ep.value, getattr(getattr(ep, "dist", None), "version", None))
+        for ep in eps
+    )
+    validator = _validators.get(cache_key)
+    if validator is None:
+        # Schemas are merged in the alphabetical order of the entry points.
+        schema = {}
+        prefixes = []
+        for ep in eps:
+            ep_schema = ep.load()
+            prefixes.append(schema_prefix(ep_schema))
+            schema.update(ep_schema)
+        validator = _validators[cache_key] = ConfigValidator(schema, prefixes)
+    return validator
+
+
+def validate_config(app, strict=False, group=SCHEMA_ENTRY_POINT_GROUP, index=None):
+    """Validate the application configuration against the declared schemas.
+
+    Each problem is logged as a warning.
+
+    :param app: The Flask application.
+    :param strict: Raise an exception if any problem was found.
+    :param group: The entry point group of the schemas.
+    :param index: Path of an entry point index file.
+    :returns: The :class:`ConfigValidationReport`.
+    :raises ConfigValidationError: In strict mode, if any problem was found.
+
+    .. versionadded:: 1.2.0
+    """
+    ext = app.extensions.get("invenio-config")
+    report = get_validator(group, index=index).validate(
+        app.config, provenance=getattr(ext, "provenance", None)
+    )
+    if strict:
+        report.raise_for_errors()
+    for message in report.messages():
+        app.logger.warning(message)
+    return report
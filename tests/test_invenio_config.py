@@ -5,12 +5,23 @@
 
 """Simple tests."""
 
+import ast
+import asyncio
+import json
 import os
+import pickle
+import re
 import shutil
+import sys
 import tempfile
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from os.path import join
 
+import pytest
 from flask import Flask
 from mock import patch
 
@@ -21,8 +32,48 @@ from invenio_config import (
     InvenioConfigInstanceFolder,
     InvenioConfigModule,
     create_config_loader,
+    decoders,
 )
+from invenio_config import env as env_module
+from invenio_config.aio import create_async_config_loader
+from invenio_config.binary import (
+    InvenioConfigBinary,
+    dump_binary_config,
+    load_binary_config,
+)
+from invenio_config.changeset import IncrementalConfigLoader, diff_config
+from invenio_config.confd import InvenioConfigDirectory
 from invenio_config.default import ALLOWED_HTML_ATTRS, ALLOWED_HTML_TAGS
+from invenio_config.derived import get_derived, register_derived
+from invenio_config.discovery import build_entry_point_index, load_entry_point_index
+from invenio_config.entrypoint import build_key_index, dump_key_index
+from invenio_config.env import patch_nested, register_env_types
+from invenio_config.ext import InvenioConfig, record_keys
+from invenio_config.frozen import FrozenDict, freeze_config, freeze_value
+from invenio_config.metrics import (
+    install_config_meter,
+    read_counts,
+    unread_keys,
+    unread_keys_report,
+)
+from invenio_config.overlay import SharedConfigLoader
+from invenio_config.prefork import PreforkConfigLoader
+from invenio_config.reload import ConfigFileWatcher
+from invenio_config.signals import config_changed
+from invenio_config.snapshot import build_config_snapshot
+from invenio_config.sources import (
+    CachedConfigSource,
+    SecretsDirectory,
+    _restart_after_fork,
+)
+from invenio_config.structured import InvenioConfigStructuredFile, load_json
+from invenio_config.utils import ConfigLoader
+from invenio_config.validation import (
+    ConfigValidationError,
+    ConfigValidator,
+    get_validator,
+    validate_config,
+)
 
 
 class ConfigEP:
@@ -149,9 +200,14 @@ def test_default_allowed_html_tags():
     InvenioConfigDefault(app)
     assert app.config["ALLOWED_HTML_TAGS"] == ALLOWED_HTML_TAGS
 
+    assert "ALLOWED_HTML_TAGS_LOOKUP" not in app.config
+    lookup = get_derived(app, "ALLOWED_HTML_TAGS_LOOKUP")
+    assert lookup == frozenset(ALLOWED_HTML_TAGS)
+
     app.config["ALLOWED_HTML_TAGS"] = ["a"]
     InvenioConfigDefault(app)
     assert app.config["ALLOWED_HTML_TAGS"] == ["a"]
+    assert get_derived(app, "ALLOWED_HTML_TAGS_LOOKUP") == frozenset(["a"])
 
 
 def test_default_allowed_html_attrs():
@@ -161,9 +217,22 @@ def test_default_allowed_html_attrs():
     InvenioConfigDefault(app)
     assert app.config["ALLOWED_HTML_ATTRS"] == ALLOWED_HTML_ATTRS
 
+    lookup = get_derived(app, "ALLOWED_HTML_ATTRS_LOOKUP")
+    assert lookup["a"] == {"href", "title", "name", "class", "rel"}
+    assert lookup["abbr"] == {"title", "class"}
+    assert lookup["*"] == {"class"}
+
+    app.config["ALLOWED_HTML_ATTRS"] = {"img": ["src"]}
+    InvenioConfigDefault(app)
+    assert get_derived(app, "ALLOWED_HTML_ATTRS_LOOKUP") == {
+        "*": frozenset(),
+        "img": frozenset(["src"]),
+    }
+
     app.config["ALLOWED_HTML_ATTRS"] = "test override"
     InvenioConfigDefault(app)
     assert app.config["ALLOWED_HTML_ATTRS"] == "test override"
+    assert get_derived(app, "ALLOWED_HTML_ATTRS_LOOKUP") is None
 
 
 def test_env():
@@ -228,3 +297,1522 @@ def test_conf_loader_factory():
         assert app.config["ENV"] == "env"
     finally:
         shutil.rmtree(tmppath)
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep([ConfigEP(name="00_app", module_name="app.config", EP="ep")]),
+)
+def test_config_snapshot():
+    """Test loading configuration from a snapshot."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        snapshot_path = join(tmppath, "config.snapshot")
+        with open(join(tmppath, "testapp.cfg"), "w") as f:
+            f.write("FOLDER = 'folder'\n")
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        build_config_snapshot(app, snapshot_path, instance_formats=("json",))
+        assert os.path.exists(snapshot_path)
+
+        # The snapshot is used instead of the individual sources.
+        conf_loader = create_config_loader(
+            snapshot_path=snapshot_path, instance_formats=("json",)
+        )
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with patch("invenio_config.utils.InvenioConfigEntryPointModule") as ep:
+            conf_loader(app, KWARGS="kwargs")
+            assert not ep.called
+        assert app.config["EP"] == "ep"
+        assert app.config["FOLDER"] == "folder"
+        assert app.config["KWARGS"] == "kwargs"
+
+        # Changed inputs invalidate the snapshot.
+        with open(join(tmppath, "testapp.cfg"), "w") as f:
+            f.write("FOLDER = 'changed'\n")
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with patch("invenio_config.utils.InvenioConfigEntryPointModule") as ep:
+            conf_loader(app, KWARGS="kwargs")
+            assert ep.called
+        assert app.config["FOLDER"] == "changed"
+
+        # Unreadable snapshots fall back to the full load.
+        with open(snapshot_path, "wb") as f:
+            f.write(b"garbage")
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        conf_loader(app)
+        assert app.config["EP"] == "ep"
+        assert app.config["FOLDER"] == "changed"
+
+        # Keyword arguments and environment variables are applied on top of
+        # the snapshot and not stored in it.
+        os.environ["SNAPSHOTTEST_ENV"] = "'env'"
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        conf_loader = create_config_loader(
+            env_prefix="SNAPSHOTTEST",
+            snapshot_path=snapshot_path,
+            instance_formats=("json",),
+        )
+        with patch("invenio_config.utils.InvenioConfigEntryPointModule") as ep:
+            conf_loader(app, OBJ=object())
+            assert not ep.called
+        assert "OBJ" in app.config
+        assert app.config["ENV"] == "env"
+        # Neither are the values computed by Flask, e.g. DEBUG.
+        with open(snapshot_path, "rb") as f:
+            stored = pickle.load(f)["config"]
+        assert sorted(stored) == ["EP", "FOLDER"]
+        with pytest.raises(ValueError):
+            create_config_loader(snapshot_path=snapshot_path, watch=True)
+
+        # Snapshots which cannot be written are skipped.
+        conf_loader = create_config_loader(
+            snapshot_path=join(tmppath, "testapp.cfg", "config.snapshot")
+        )
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        conf_loader(app)
+        assert app.config["FOLDER"] == "changed"
+        os.unlink(snapshot_path)
+        conf_loader = create_config_loader(snapshot_path=snapshot_path)
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with patch("os.replace", side_effect=PermissionError):
+            conf_loader(app)
+        assert app.config["FOLDER"] == "changed"
+        assert os.listdir(tmppath) == ["testapp.cfg"]
+    finally:
+        os.environ.pop("SNAPSHOTTEST_ENV", None)
+        shutil.rmtree(tmppath)
+
+
+def test_config_snapshot_module_changes():
+    """Test invalidating snapshots when the configuration module changes."""
+    tmppath = tempfile.mkdtemp()
+    sys.path.insert(0, tmppath)
+    try:
+        snapshot_path = join(tmppath, "config.snapshot")
+        module_path = join(tmppath, "snapshot_config.py")
+        with open(module_path, "w") as f:
+            f.write("class Config:\n    VALUE = 1\n")
+        for mtime, config in enumerate(("snapshot_config", "snapshot_config:Config")):
+            conf_loader = create_config_loader(
+                config=config, snapshot_path=snapshot_path
+            )
+            app = Flask("testapp", instance_path=tmppath)
+            conf_loader(app)
+            assert os.path.exists(snapshot_path)
+
+            app = Flask("testapp", instance_path=tmppath)
+            with patch("invenio_config.utils.InvenioConfigModule") as module:
+                conf_loader(app)
+                assert not module.called
+
+            os.utime(module_path, ns=(mtime, mtime))
+            app = Flask("testapp", instance_path=tmppath)
+            with patch("invenio_config.utils.InvenioConfigModule") as module:
+                conf_loader(app)
+                assert module.called
+            os.unlink(snapshot_path)
+    finally:
+        sys.path.remove(tmppath)
+        sys.modules.pop("snapshot_config", None)
+        shutil.rmtree(tmppath)
+
+
+class CountingConfigEP(ConfigEP):
+    """Entry point counting how often it is loaded."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize entry point."""
+        super().__init__(*args, **kwargs)
+        self.loads = 0
+
+    def load(self):
+        """Load entry point."""
+        self.loads += 1
+        return super().load()
+
+
+def test_entry_point_lazy():
+    """Test lazy loading of entry point modules."""
+    eps = [
+        CountingConfigEP(name="00_app", module_name="a.config", A="a", SHARED="a"),
+        CountingConfigEP(name="10_app", module_name="b.config", B="b", SHARED="b"),
+        CountingConfigEP(name="20_app", module_name="c.config", C="c"),
+    ]
+    with patch("importlib.metadata.entry_points", return_value=eps):
+        index = build_key_index()
+        assert index["entry_points"]["10_app"]["keys"] == ["B", "SHARED"]
+        for ep in eps:
+            ep.loads = 0
+
+        # Entry points missing from the index are loaded eagerly.
+        del index["entry_points"]["20_app"]
+        app = Flask("testapp")
+        app.config["B"] = "override"
+        InvenioConfigEntryPointModule(app, lazy=True, key_index=index)
+        assert [ep.loads for ep in eps] == [0, 0, 1]
+        assert "A" in app.config and app.config["C"] == "c"
+        assert [ep.loads for ep in eps] == [0, 0, 1]
+
+        # Modules are imported on first access and override order is kept.
+        assert app.config["SHARED"] == "b"
+        assert [ep.loads for ep in eps] == [0, 1, 1]
+        assert app.config.get("A") == "a"
+        assert app.config["B"] == "b"
+        assert [ep.loads for ep in eps] == [1, 1, 1]
+
+        # Later layers override pending values without importing.
+        eps[0].loads = 0
+        app = Flask("testapp")
+        InvenioConfigEntryPointModule(app, lazy=True, key_index=index)
+        app.config.update(A="later")
+        assert app.config["A"] == "later"
+        assert eps[0].loads == 0
+        assert dict(app.config.items())["SHARED"] == "b"
+
+        # Copies of the configuration hold the resolved values.
+        app = Flask("testapp")
+        InvenioConfigEntryPointModule(app, lazy=True, key_index=index)
+        assert dict(app.config)["A"] == {**app.config}["A"] == "a"
+
+
+def test_entry_point_key_index_file():
+    """Test reading the key index from a file."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        path = join(tmppath, "index.json")
+        eps = [CountingConfigEP(name="00_app", module_name="a.config", A="a")]
+        with patch("importlib.metadata.entry_points", return_value=eps):
+            dump_key_index(path)
+            eps[0].loads = 0
+            app = Flask("testapp")
+            create_config_loader(key_index=path)(app)
+            assert eps[0].loads == 0
+            assert app.config["A"] == "a"
+            assert eps[0].loads == 1
+
+            with open(path, "w") as f:
+                f.write("{}")
+            app = Flask("testapp")
+            InvenioConfigEntryPointModule(app, lazy=True, key_index=path)
+            assert eps[0].loads == 2
+    finally:
+        shutil.rmtree(tmppath)
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep(
+        [
+            ConfigEP(name="00_app", module_name="a.config", A="a", B="a"),
+            ConfigEP(name="10_app", module_name="b.config", B="b"),
+        ]
+    ),
+)
+def test_config_loader_profile():
+    """Test the timings of the configuration loader stages."""
+    app = Flask("testapp")
+    assert "invenio-config" not in app.extensions
+    create_config_loader(env_prefix="NOTSET")(app)
+    assert "invenio-config" not in app.extensions
+
+    app = Flask("testapp")
+    with patch.object(app.logger, "info") as log:
+        create_config_loader(env_prefix="NOTSET", profile=True)(app, C="c")
+        assert "Configuration loaded in" in log.call_args[0][0]
+
+    timings = app.extensions["invenio-config"].timings
+    stages = {t.stage: t for t in timings.stages}
+    assert list(stages) == [
+        "entry_points",
+        "instance_folder",
+        "kwargs",
+        "environment",
+        "default",
+    ]
+    assert stages["entry_points"].keys_set == 2
+    assert stages["kwargs"].keys_set == 1
+    assert stages["default"].keys_set == 2
+    assert stages["default"].keys_overridden == 1
+    assert [(t.name, t.keys_set, t.keys_overridden) for t in timings.entry_points] == [
+        ("00_app", 2, 0),
+        ("10_app", 0, 1),
+    ]
+    assert all(t.import_time is not None for t in timings.entry_points)
+    assert timings.total >= stages["entry_points"].wall_time
+    assert timings.as_dict()["entry_points"][0]["name"] == "00_app"
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep(
+        [
+            ConfigEP(name="00_app", module_name="a.config", A="a", B="a", C="a"),
+            ConfigEP(name="10_app", module_name="b.config", B="b", C="b"),
+        ]
+    ),
+)
+def test_config_loader_provenance():
+    """Test tracking the sources of configuration values."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        with open(join(tmppath, "testapp.cfg"), "w") as f:
+            f.write("C = 'folder'\n")
+        os.environ["PROVENANCE_C"] = "'env'"
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(env_prefix="PROVENANCE", provenance=True)(app)
+        provenance = app.extensions["invenio-config"].provenance
+        assert [s.name for s in provenance.sources_of("B")] == ["00_app", "10_app"]
+        assert provenance.origin("A").location("A") == "entry_point:00_app"
+        assert [s.location("C") for s in provenance.sources_of("C")] == [
+            "entry_point:00_app",
+            "entry_point:10_app",
+            "instance_folder:" + join(tmppath, "testapp.cfg"),
+            "PROVENANCE_C",
+        ]
+        assert provenance.origin("SECRET_KEY").stage == "default"
+        assert provenance.origin("DEBUG") is None
+        assert "B" in provenance and "DEBUG" not in provenance
+        assert provenance.keys_from("entry_point", "10_app") == ["B"]
+        with pytest.raises(RuntimeError):
+            provenance.history("C")
+
+        # Keys set to a value identical to the previous one are recorded.
+        os.environ["PROVENANCE_DEBUG"] = "False"
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(
+            env_prefix="PROVENANCE", provenance=True, provenance_values=True
+        )(app)
+        provenance = app.extensions["invenio-config"].provenance
+        assert [v for s, v in provenance.history("C")] == ["a", "b", "folder", "env"]
+        assert provenance.origin("DEBUG").location("DEBUG") == "PROVENANCE_DEBUG"
+    finally:
+        os.environ.pop("PROVENANCE_DEBUG", None)
+        del os.environ["PROVENANCE_C"]
+        shutil.rmtree(tmppath)
+
+
+def test_env_cache():
+    """Test caching of parsed environment variables."""
+    os.environ["CACHEPREFIX_DICT"] = "{'a': [1]}"
+    os.environ["CACHEPREFIX_STR"] = "plain"
+    os.environ["CACHEPREFIX_EMPTY"] = ""
+    os.environ["OTHERPREFIX_STR"] = "'other'"
+    try:
+        app = Flask("testapp")
+        app.config["EMPTY"] = "42"
+        with patch("ast.literal_eval", wraps=ast.literal_eval) as literal_eval:
+            InvenioConfigEnvironment(app, prefix="CACHEPREFIX_")
+            # Only the dictionary and the empty value are evaluated.
+            assert literal_eval.call_count == 2
+            assert app.config["DICT"] == {"a": [1]}
+            assert app.config["STR"] == "plain"
+            assert app.config["EMPTY"] == 42
+
+            app2 = Flask("testapp")
+            InvenioConfigEnvironment(app2, prefix="CACHEPREFIX_")
+            assert literal_eval.call_count == 3
+            assert app2.config["DICT"] == {"a": [1]}
+            assert app2.config["DICT"] is not app.config["DICT"]
+            assert app2.config["EMPTY"] is None
+
+            os.environ["CACHEPREFIX_DICT"] = "{'a': [2]}"
+            InvenioConfigEnvironment(app2, prefix=["CACHEPREFIX_", "OTHERPREFIX_"])
+            assert app2.config["DICT"] == {"a": [2]}
+            assert app2.config["STR"] == "other"
+    finally:
+        for name in ["CACHEPREFIX_DICT", "CACHEPREFIX_STR", "CACHEPREFIX_EMPTY"]:
+            del os.environ[name]
+        del os.environ["OTHERPREFIX_STR"]
+
+
+def test_folder_watch():
+    """Test reloading the instance folder configuration file."""
+    tmppath = tempfile.mkdtemp()
+    filename = join(tmppath, "testapp.cfg")
+    changes = []
+
+    def receiver(app, keys=None, source=None):
+        changes.append((keys, source))
+
+    try:
+        with open(filename, "w") as f:
+            f.write("A = 'a'\nB = {'b': 1}\nC = 'c'\n")
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        InvenioConfigInstanceFolder(app, watch=True, interval=0.01, debounce=0.01)
+        watcher = app.extensions["invenio-config"].watchers[0]
+        watcher.stop()
+        assert app.config["B"] == {"b": 1}
+        app.config["C"] = "env"
+
+        config_changed.connect(receiver, app)
+        assert watcher.check() == set()
+
+        with open(filename, "w") as f:
+            f.write("A = 'changed'\nB = {'b': 1}\nC = 'changed'\nD = 'd'\n")
+        os.utime(filename, ns=(0, 0))
+        assert watcher.check() == {"A", "D"}
+        assert changes == [({"A", "D"}, filename)]
+        assert app.config["A"] == "changed"
+        assert app.config["C"] == "env"
+
+        # Errors keep the current configuration and are only logged once.
+        with open(filename, "w") as f:
+            f.write("A = \n")
+        os.utime(filename, ns=(1, 1))
+        with patch.object(app.logger, "exception") as exception:
+            assert watcher.check() == set()
+            assert watcher.check() == set()
+        assert exception.call_count == 1
+        assert app.config["A"] == "changed"
+
+        # Changes are picked up by the background thread.
+        watcher = ConfigFileWatcher(app, filename, interval=0.01, debounce=0.01)
+        watcher.start()
+        with open(filename, "w") as f:
+            f.write("A = 'thread'\n")
+        for _ in range(500):
+            if app.config["A"] == "thread":
+                break
+            time.sleep(0.01)
+        watcher.stop()
+        assert app.config["A"] == "thread"
+
+        # Changes not notified by events are picked up by the polling.
+        class SilentObserver(object):
+            start = stop = join = lambda self: None
+
+        with patch(
+            "invenio_config.reload._create_observer", return_value=SilentObserver()
+        ):
+            watcher = ConfigFileWatcher(app, filename, interval=0.01, debounce=0.01)
+            watcher.start()
+        with open(filename, "w") as f:
+            f.write("A = 'silent'\n")
+        for _ in range(500):
+            if app.config["A"] == "silent":
+                break
+            time.sleep(0.01)
+        watcher.stop()
+        assert app.config["A"] == "silent"
+
+        # Keys set by keyword arguments and environment variables are pinned.
+        os.environ["WATCHTEST_E"] = "'env'"
+        os.environ["WATCHTEST_R"] = "10"
+        with open(filename, "w") as f:
+            f.write("R = 10\n")
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(env_prefix="WATCHTEST", watch=True)(app, K="kwargs")
+        watcher = app.extensions["invenio-config"].watchers[0]
+        watcher.stop()
+        with open(filename, "w") as f:
+            f.write("E = 'file'\nK = 'file'\nN = 'new'\nR = 20\n")
+        os.utime(filename, ns=(2, 2))
+        assert watcher.check() == {"N"}
+        assert app.config["E"] == "env"
+        assert app.config["K"] == "kwargs"
+        assert app.config["R"] == 10
+    finally:
+        os.environ.pop("WATCHTEST_E", None)
+        os.environ.pop("WATCHTEST_R", None)
+        config_changed.disconnect(receiver)
+        shutil.rmtree(tmppath)
+
+
+class FailingConfigEP(CountingConfigEP):
+    """Entry point failing to load the first time."""
+
+    def load(self):
+        """Fail on the first load."""
+        if not self.loads:
+            self.loads += 1
+            raise RuntimeError("deadlock detected")
+        return super().load()
+
+
+def test_entry_points_parallel():
+    """Test importing entry point modules concurrently."""
+
+    eps = UNSORTED_ENTRY_POINTS + [
+        FailingConfigEP(name="15_app", module_name="failing.config", TESTVAR="failing")
+    ]
+    app = Flask("testapp")
+    with patch("importlib.metadata.entry_points", return_value=eps):
+        InvenioConfigEntryPointModule(app, parallel=True, max_workers=2)
+    assert app.config["TESTVAR"] == "last"
+    assert eps[-1].loads == 2
+
+    app = Flask("testapp")
+    with patch("importlib.metadata.entry_points", return_value=eps[:3]), patch(
+        "invenio_config.entrypoint.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+    ) as executor:
+        create_config_loader(parallel=True, max_workers=1, profile=True)(app)
+    executor.assert_called_once_with(max_workers=1)
+    timings = app.extensions["invenio-config"].timings
+    assert [t.name for t in timings.entry_points] == ["00_app", "10_app", "20_app"]
+    assert app.config["TESTVAR"] == "last"
+
+
+def test_freeze_config():
+    """Test freezing the configuration."""
+    app = Flask("testapp")
+    create_config_loader(env_prefix="NOTSET")(app, SET={"a"})
+    with patch("gc.freeze") as gc_freeze:
+        config = freeze_config(app)
+        assert not gc_freeze.called
+    assert config["ALLOWED_HTML_TAGS"] == tuple(ALLOWED_HTML_TAGS)
+    assert config["ALLOWED_HTML_ATTRS"]["a"] == tuple(ALLOWED_HTML_ATTRS["a"])
+    assert config["ALLOWED_HTML_ATTRS"] == FrozenDict(
+        (k, tuple(v)) for k, v in ALLOWED_HTML_ATTRS.items()
+    )
+    assert config["SET"] == frozenset(["a"])
+    assert hash(config["ALLOWED_HTML_ATTRS"]) == hash(freeze_value(ALLOWED_HTML_ATTRS))
+    assert hash(config) == hash(config)
+    assert config.setdefault("DEBUG") is False
+
+    for modify in [
+        lambda: config.__setitem__("DEBUG", True),
+        lambda: config.__delitem__("DEBUG"),
+        lambda: config.update(DEBUG=True),
+        lambda: config.pop("DEBUG"),
+        lambda: config.setdefault("NEW", 1),
+        lambda: config.from_mapping(DEBUG=True),
+    ]:
+        with pytest.raises(TypeError):
+            modify()
+    assert config["DEBUG"] is False
+
+    # Frozen dictionaries behave like dictionaries.
+    assert isinstance(config["ALLOWED_HTML_ATTRS"], dict)
+    assert json.loads(json.dumps(config["ALLOWED_HTML_ATTRS"]))["a"] == list(
+        ALLOWED_HTML_ATTRS["a"]
+    )
+    assert pickle.loads(pickle.dumps(config["ALLOWED_HTML_ATTRS"])) == (
+        config["ALLOWED_HTML_ATTRS"]
+    )
+    assert FrozenDict.fromkeys("ab") == {"a": None, "b": None}
+    with pytest.raises(TypeError):
+        config["ALLOWED_HTML_ATTRS"]["a"] = ()
+
+    # Watched configurations cannot be frozen.
+    app = Flask("testapp")
+    app.extensions["invenio-config"] = InvenioConfig()
+    app.extensions["invenio-config"].watchers.append(object())
+    with pytest.raises(ValueError):
+        freeze_config(app)
+
+
+def test_prefork_config_loader():
+    """Test sharing preloaded configuration."""
+    eps = [CountingConfigEP(name="00_app", module_name="a.config", EP="ep", ENV="ep")]
+    os.environ["PREFORK_ENV"] = "env"
+
+    class Config(object):
+        MODULE = "module"
+
+    try:
+        loader = PreforkConfigLoader(Config, env_prefix="PREFORK", gc_freeze=False)
+        with patch("importlib.metadata.entry_points", return_value=eps):
+            app = Flask("testapp")
+            loader(app, KWARGS="kwargs")
+            assert eps[0].loads == 1
+            assert app.config["ENV"] == "env"
+
+            loader.preload(Flask("testapp"))
+            assert eps[0].loads == 2
+            assert loader.preloaded["ENV"] == "ep"
+
+            os.environ["PREFORK_ENV"] = "child"
+            app = Flask("testapp")
+            loader(app, KWARGS="kwargs")
+            assert eps[0].loads == 2
+            assert app.config["EP"] == "ep"
+            assert app.config["MODULE"] == "module"
+            assert app.config["KWARGS"] == "kwargs"
+            assert app.config["ENV"] == "child"
+
+            # Options of the default loader apply to the workers.
+            loader = PreforkConfigLoader(
+                Config, env_prefix="PREFORK", gc_freeze=False, provenance=True
+            )
+            loader.preload(Flask("testapp"))
+            app = Flask("testapp")
+            loader(app)
+            provenance = app.extensions["invenio-config"].provenance
+            assert provenance.origin("MODULE").stage == "preloaded"
+            assert provenance.origin("ENV").stage == "environment"
+
+        with pytest.raises(ValueError):
+            PreforkConfigLoader(watch=True)
+    finally:
+        del os.environ["PREFORK_ENV"]
+
+
+@patch("site.getusersitepackages", lambda: "/nonexistent/user-site")
+def test_entry_point_index():
+    """Test reading entry points from an index file."""
+    tmppath = tempfile.mkdtemp()
+    sys.path.insert(0, join(tmppath, "site"))
+    getsitepackages = patch("site.getsitepackages", lambda: [join(tmppath, "site")])
+    getsitepackages.start()
+    try:
+        os.mkdir(join(tmppath, "site"))
+        with open(join(tmppath, "site", "indexed_config.py"), "w") as f:
+            f.write("class Config:\n    INDEXED = 'indexed'\n")
+        index = join(tmppath, "index.json")
+        ep = ConfigEP(name="00_app", module_name="indexed_config:Config")
+        with patch("importlib.metadata.entry_points", return_value=[ep]):
+            build_entry_point_index(index)
+
+        with patch("importlib.metadata.entry_points") as entry_points:
+            app = Flask("testapp")
+            create_config_loader(entry_point_index=index)(app)
+            assert not entry_points.called
+            assert app.config["INDEXED"] == "indexed"
+            assert "indexed_config" in repr(load_entry_point_index(index)["groups"])
+
+            # Other groups are not indexed.
+            InvenioConfigEntryPointModule(
+                app, entry_point_group="other", entry_point_index=index
+            )
+            assert entry_points.called
+
+        # Other import paths, e.g. the working directory, are not considered.
+        sys.path.insert(0, tmppath)
+        os.utime(tmppath, ns=(1, 1))
+        assert load_entry_point_index(index) is not None
+        sys.path.remove(tmppath)
+
+        # Installing or removing distributions outdates the index.
+        mtime = os.stat(join(tmppath, "site")).st_mtime_ns
+        os.mkdir(join(tmppath, "site", "dist-1.0.dist-info"))
+        os.utime(join(tmppath, "site"), ns=(mtime, mtime))
+        assert load_entry_point_index(index) is None
+        build_entry_point_index(index)
+        os.utime(join(tmppath, "site"), ns=(1, 1))
+        assert load_entry_point_index(index) is None
+        assert load_entry_point_index(join(tmppath, "missing.json")) is None
+    finally:
+        getsitepackages.stop()
+        sys.path.remove(join(tmppath, "site"))
+        sys.modules.pop("indexed_config", None)
+        shutil.rmtree(tmppath)
+
+
+def test_structured_file():
+    """Test loading structured files from the instance folder."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        with open(join(tmppath, "testapp.toml"), "w") as f:
+            f.write("TOML = 'toml'\nSHARED = 'toml'\nlower = 1\n[NESTED]\na = 1\n")
+        with open(join(tmppath, "testapp.yaml"), "w") as f:
+            f.write("YAML: [1, 2]\nSHARED: yaml\nlower: 1\n")
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(
+            instance_formats=("toml", "json", "yaml"), provenance=True
+        )(app)
+        assert app.config["TOML"] == "toml"
+        provenance = app.extensions["invenio-config"].provenance
+        assert provenance.origin("TOML").location("TOML") == "instance_folder:" + join(
+            tmppath, "testapp.toml"
+        )
+        assert app.config["NESTED"] == {"a": 1}
+        assert app.config["YAML"] == [1, 2]
+        assert app.config["SHARED"] == "yaml"
+        assert "lower" not in app.config
+    finally:
+        shutil.rmtree(tmppath)
+
+
+def test_structured_file_errors():
+    """Test loading invalid structured files."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with open(join(tmppath, "testapp.json"), "w") as f:
+            json.dump({"A": 1, "lower": 2}, f)
+        InvenioConfigStructuredFile(app)
+        assert app.config["A"] == 1
+        assert "lower" not in app.config
+
+        for ext, content in [
+            ("json", "[1, 2]"),
+            ("json", '{"A": 1 "B": 2}'),
+            ("toml", "A = "),
+            ("yaml", "- 1\n- 2\n"),
+            ("yaml", "A: [1"),
+        ]:
+            filename = join(tmppath, "testapp." + ext)
+            with open(filename, "w") as f:
+                f.write(content)
+            with pytest.raises(ValueError) as excinfo:
+                InvenioConfigStructuredFile(app, formats=[ext])
+            assert filename in str(excinfo.value)
+            os.unlink(filename)
+        assert load_json("{ }") == {}
+    finally:
+        shutil.rmtree(tmppath)
+
+
+def test_config_directory():
+    """Test loading configuration from a directory."""
+    tmppath = tempfile.mkdtemp()
+    confd = join(tmppath, "testapp.d")
+    cache_dir = join(tmppath, "cache")
+    changes = []
+
+    def receiver(app, keys=None, source=None):
+        changes.append(keys)
+
+    def write(name, content, mtime):
+        with open(join(confd, name), "w") as f:
+            f.write(content)
+        os.utime(join(confd, name), ns=(mtime, mtime))
+
+    try:
+        os.mkdir(confd)
+        os.mkdir(join(confd, "20-subdir.cfg"))
+        write("10-a.cfg", "A = 'a'\nSHARED = 'a'\n", 1)
+        write("20-b.json", '{"B": {"b": 1}, "SHARED": "b"}', 1)
+        write("30-c.yml", "C: c\nENV: c\n", 1)
+        write("README", "Not loaded", 1)
+        write(".hidden.cfg", "HIDDEN = True\n", 1)
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(config_directory=True, provenance=True)(
+            app, PINNED="kwargs"
+        )
+        assert app.config["A"] == "a"
+        provenance = app.extensions["invenio-config"].provenance
+        assert provenance.origin("A").location("A") == "instance_folder:" + join(
+            confd, "10-a.cfg"
+        )
+        assert provenance.origin("SHARED").name == join(confd, "20-b.json")
+        assert app.config["B"] == {"b": 1}
+        assert app.config["SHARED"] == "b"
+        assert "HIDDEN" not in app.config
+        assert app.extensions["invenio-config"].pinned_keys == {"PINNED"}
+        assert app.extensions["invenio-config"].config_directory.reload(app) == set()
+
+        # Applications do not share mutable values.
+        app.config["B"]["b"] = 2
+        other = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        InvenioConfigDirectory(other)
+        assert other.config["B"] == {"b": 1}
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with patch("invenio_config.confd.load_config_file") as load_config_file:
+            loader = InvenioConfigDirectory(app, cache_dir=cache_dir)
+            assert not load_config_file.called
+        assert app.config["B"] == {"b": 1}
+
+        # Only changed files are loaded again.
+        app.config["ENV"] = "env"
+        config_changed.connect(receiver, app)
+        write("20-b.json", '{"B": {"b": 1}, "SHARED": "b"}', 2)
+        write("30-c.yml", "C: changed\nENV: changed\n", 2)
+        with patch("invenio_config.confd.load_config_file") as load_config_file:
+            assert loader.reload(app) == {"C"}
+            assert not load_config_file.called
+        assert app.config["C"] == "changed"
+        assert app.config["ENV"] == "env"
+        assert changes == [{"C"}]
+
+        # New keys do not override pinned keys.
+        app.extensions["invenio-config"] = InvenioConfig()
+        app.extensions["invenio-config"].pinned_keys.add("PINNED")
+        app.config["PINNED"] = "kwargs"
+        write("30-c.yml", "C: changed\nENV: changed\nPINNED: c\nNEW: c\n", 3)
+        assert loader.reload(app) == {"NEW"}
+        assert app.config["PINNED"] == "kwargs"
+
+        # Python files are compiled through the bytecode cache.
+        write("10-a.cfg", "A = 'changed'\nSHARED = 'a'\n", 3)
+        assert loader.reload(app) == {"A"}
+        assert len(os.listdir(cache_dir)) == 1
+        assert loader.reload(app) == set()
+    finally:
+        config_changed.disconnect(receiver)
+        shutil.rmtree(tmppath)
+
+
+def test_env_types():
+    """Test decoding environment variables according to their type."""
+    environ = {
+        "TYPED_INT": "1_000",
+        "TYPED_FLOAT": "1e5",
+        "TYPED_BOOL": "off",
+        "TYPED_STR": "True",
+        "TYPED_LIST": "a, b,,c",
+        "TYPED_JSON": '{"a": [1, true]}',
+        "TYPED_DURATION": "1h30m",
+        "TYPED_SIZE": "1.5KiB",
+        "TYPED_REGISTERED": "10MB",
+        "TYPED_UNTYPED": "[1, 2]",
+        "TYPED_LARGE": "[" + "1," * 100 + "]",
+    }
+    os.environ.update(environ)
+    try:
+        register_env_types({"REGISTERED": "bytesize"})
+        app = Flask("testapp")
+        with warnings.catch_warnings(record=True) as w:
+            InvenioConfigEnvironment(
+                app,
+                prefix="TYPED_",
+                max_literal_size=100,
+                types={
+                    "INT": int,
+                    "FLOAT": float,
+                    "BOOL": bool,
+                    "STR": str,
+                    "LIST": list,
+                    "JSON": "json",
+                    "DURATION": "duration",
+                    "SIZE": "bytesize",
+                },
+            )
+            assert len(w) == 1
+        assert app.config["INT"] == 1000
+        assert app.config["FLOAT"] == 100000.0
+        assert app.config["BOOL"] is False
+        assert app.config["STR"] == "True"
+        assert app.config["LIST"] == ["a", "b", "c"]
+        assert app.config["JSON"] == {"a": [1, True]}
+        assert app.config["DURATION"] == timedelta(hours=1, minutes=30)
+        assert app.config["SIZE"] == 1536
+        assert app.config["REGISTERED"] == 10000000
+        assert app.config["UNTYPED"] == [1, 2]
+        assert app.config["LARGE"] == environ["TYPED_LARGE"]
+
+        InvenioConfigEnvironment(app, prefix="TYPED_", literal_eval=False)
+        assert app.config["UNTYPED"] == "[1, 2]"
+
+        with pytest.raises(ValueError) as e:
+            InvenioConfigEnvironment(app, prefix="TYPED_", types={"STR": int})
+        assert "TYPED_STR" in str(e.value)
+        with pytest.raises(ValueError):
+            InvenioConfigEnvironment(app, prefix="TYPED_", types={"STR": "unknown"})
+    finally:
+        env_module._registered_types.clear()
+        for name in environ:
+            del os.environ[name]
+
+
+def test_decoders():
+    """Test the environment variable decoders."""
+    assert decoders.decode_bool(" Yes ") is True
+    assert decoders.decode_str_list('["a", 1]') == ["a", "1"]
+    assert decoders.decode_duration("30") == timedelta(seconds=30)
+    assert decoders.decode_duration("2d 5s") == timedelta(days=2, seconds=5)
+    assert decoders.decode_duration("250ms") == timedelta(milliseconds=250)
+    assert decoders.decode_bytesize("512") == 512
+    assert decoders.decode_bytesize("2 GB") == 2000000000
+    for decoder, value in [
+        (decoders.decode_int, "1e5"),
+        (decoders.decode_bool, "maybe"),
+        (decoders.decode_duration, "soon"),
+        (decoders.decode_duration, ""),
+        (decoders.decode_duration, "inf"),
+        (decoders.decode_duration, "99999999999d"),
+        (decoders.decode_bytesize, "9" * 400),
+        (decoders.decode_bytesize, "big"),
+    ]:
+        with pytest.raises(ValueError):
+            decoder(value)
+    assert decoders.get_decoder(str.upper) is str.upper
+
+
+def test_env_nested():
+    """Test setting nested values from environment variables."""
+    default = {"timeout": 10, "hosts": [{"host": "a"}, {"host": "b"}], "opts": {}}
+    environ = {
+        "NESTED_SEARCH__timeout": "30",
+        "NESTED_SEARCH__hosts__1__host": "'c'",
+        "NESTED_SEARCH__new__key": "True",
+        "NESTED_LIST__0": "'first'",
+        "NESTED_FLAT__KEY": "flat",
+        "NESTED_INT__KEY": "1",
+    }
+    invalid = {
+        "NESTED_SEARCH__timeout__seconds": "1",
+        "NESTED_SEARCH__hosts__5__host": "'d'",
+        "NESTED_SEARCH__hosts__first__host": "'d'",
+        "NESTED_LIST__5": "'c'",
+        "NESTED_LIST__2": "'c'",
+    }
+    os.environ.update(environ)
+    try:
+        app = Flask("testapp")
+        app.config.update(SEARCH=default, LIST=["a", "b"], INT=1)
+        InvenioConfigEnvironment(app, prefix="NESTED_")
+        assert app.config["SEARCH"] == {
+            "timeout": 30,
+            "hosts": [{"host": "a"}, {"host": "c"}],
+            "opts": {},
+            "new": {"key": True},
+        }
+        assert app.config["LIST"] == ["first", "b"]
+        assert app.config["FLAT__KEY"] == "flat"
+        assert app.config["INT__KEY"] == 1
+        # The original value is not modified and unrelated values are shared.
+        assert default["timeout"] == 10 and default["hosts"][1] == {"host": "b"}
+        assert app.config["SEARCH"]["hosts"][0] is default["hosts"][0]
+        assert app.config["SEARCH"]["opts"] is default["opts"]
+
+        # Invalid paths are ignored with a warning naming the variable.
+        os.environ.update(invalid)
+        app.config.update(SEARCH=default, LIST=["a", "b"])
+        with pytest.warns(UserWarning) as record:
+            InvenioConfigEnvironment(app, prefix="NESTED_")
+        assert sorted(str(w.message).split(":")[0] for w in record) == [
+            "Ignoring environment variable " + name
+            for name in sorted(invalid)
+            if name != "NESTED_LIST__2"
+        ]
+        assert app.config["LIST"] == ["first", "b", "c"]
+        assert app.config["SEARCH"]["timeout"] == 30
+        assert len(app.config["SEARCH"]["hosts"]) == 2
+        with pytest.raises(ValueError):
+            patch_nested(["a"], [(["5"], "b")])
+    finally:
+        for name in invalid:
+            os.environ.pop(name, None)
+        for name in environ:
+            del os.environ[name]
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep(
+        [
+            ConfigEP(name="10_app", EP="ep", MODULE="ep", FOLDER="ep", ENV="ep"),
+            ConfigEP(name="00_app", EP="first", FIRST="first"),
+        ]
+    ),
+)
+def test_async_config_loader():
+    """Test the asynchronous configuration loader."""
+    tmppath = tempfile.mkdtemp()
+    try:
+        with open(join(tmppath, "testapp.cfg"), "w") as f:
+            f.write("FOLDER = 'folder'\nKWARGS = 'folder'\nENV = 'folder'\n")
+        os.environ["ASYNCPREFIX_ENV"] = "env"
+
+        class Config(object):
+            MODULE = "module"
+            FOLDER = "module"
+
+        for config in [Config, "test_invenio_config:ModuleConfig"]:
+            app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+            loader = create_async_config_loader(config, env_prefix="ASYNCPREFIX")
+            asyncio.run(loader(app, KWARGS="kwargs"))
+            assert app.config["EP"] == "ep"
+            assert app.config["FIRST"] == "first"
+            assert app.config["MODULE"] == "module"
+            assert app.config["FOLDER"] == "folder"
+            assert app.config["KWARGS"] == "kwargs"
+            assert app.config["ENV"] == "env"
+            assert app.config["SECRET_KEY"] == "CHANGE_ME"
+
+        # Missing instance folder file.
+        app = Flask("testapp", instance_path=join(tmppath, "missing"))
+        asyncio.run(create_async_config_loader(env_prefix="ASYNCPREFIX")(app))
+        assert app.config["FOLDER"] == "ep"
+
+        # Failed concurrent imports are retried sequentially.
+        ep = FailingConfigEP(name="20_app", module_name="failing.config", EP="last")
+        app = Flask("testapp", instance_path=join(tmppath, "missing"))
+        with patch("importlib.metadata.entry_points", return_value=[ep]):
+            asyncio.run(create_async_config_loader(env_prefix="ASYNCPREFIX")(app))
+        assert app.config["EP"] == "last"
+        assert ep.loads == 2
+
+        # Options of the default loader are applied.
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        loader = create_async_config_loader(
+            Config, env_prefix="ASYNCPREFIX", provenance=True
+        )
+        asyncio.run(loader(app))
+        provenance = app.extensions["invenio-config"].provenance
+        assert provenance.origin("EP").stage == "entry_point"
+        assert provenance.origin("FOLDER").stage == "instance_folder"
+        with pytest.raises(ValueError):
+            create_async_config_loader(parallel=True)
+    finally:
+        del os.environ["ASYNCPREFIX_ENV"]
+        shutil.rmtree(tmppath)
+
+
+class ModuleConfig(object):
+    """Configuration imported by string."""
+
+    MODULE = "module"
+
+
+def test_secrets_directory():
+    """Test loading configuration from a secrets directory."""
+    tmppath = tempfile.mkdtemp()
+    changes = []
+
+    def receiver(app, keys=None, source=None):
+        changes.append((keys, source))
+
+    def write(name, value):
+        with open(join(tmppath, name), "w") as f:
+            f.write(value)
+
+    try:
+        write("SECRET_KEY", "secret\n")
+        write("DB_URI", "postgresql://db")
+        write("OVERRIDDEN", "secret")
+        write("lowercase", "ignored")
+        write(".hidden", "ignored")
+        os.mkdir(join(tmppath, "DIRECTORY"))
+
+        source = SecretsDirectory(tmppath, ttl=3600, background=False)
+        app = Flask("testapp")
+        create_config_loader(sources=[source], provenance=True)(
+            app, OVERRIDDEN="kwargs"
+        )
+        assert app.config["DB_URI"] == "postgresql://db"
+        assert app.config["SECRET_KEY"] == "secret"
+        assert app.config["OVERRIDDEN"] == "kwargs"
+        assert "lowercase" not in app.config
+        assert "DIRECTORY" not in app.config
+        provenance = app.extensions["invenio-config"].provenance
+        assert provenance.origin("DB_URI").location("DB_URI") == "source:" + tmppath
+        assert app.extensions["invenio-config"].watchers == []
+
+        # Cached values are refreshed and changes applied.
+        config_changed.connect(receiver, app)
+        write("SECRET_KEY", "rotated")
+        write("DB_URI", "postgresql://other")
+        assert app.config["SECRET_KEY"] == "secret"
+        assert source.refresh() == {"SECRET_KEY", "DB_URI"}
+        assert app.config["SECRET_KEY"] == "rotated"
+        assert app.config["DB_URI"] == "postgresql://other"
+        assert changes == [({"SECRET_KEY", "DB_URI"}, tmppath)]
+
+        # Sources must implement the store accessors.
+        with pytest.raises(TypeError):
+            CachedConfigSource()
+
+        # Removed keys keep their last value.
+        os.unlink(join(tmppath, "SECRET_KEY"))
+        assert source.refresh() == set()
+        assert app.config["SECRET_KEY"] == "rotated"
+
+        # Background refresh.
+        write("SECRET_KEY", "secret")
+        source = SecretsDirectory(tmppath, ttl=0.01)
+        app = Flask("testapp")
+        source.init_app(app)
+        assert app.extensions["invenio-config"].watchers == [source]
+        assert app.config["SECRET_KEY"] == "secret"
+
+        # Threads lost by forking are restarted in the child.
+        dead = threading.Thread(target=lambda: None)
+        dead.start()
+        dead.join()
+        source._thread = dead
+        assert not source.is_refreshing()
+        _restart_after_fork()
+        assert source.is_refreshing()
+        write("SECRET_KEY", "thread")
+        for _ in range(500):
+            if app.config["SECRET_KEY"] == "thread":
+                break
+            time.sleep(0.01)
+        source.stop()
+        assert app.config["SECRET_KEY"] == "thread"
+
+        # Missing directory.
+        app = Flask("testapp")
+        SecretsDirectory(join(tmppath, "missing"), app=app, background=False)
+        assert app.config["SECRET_KEY"] is None
+    finally:
+        config_changed.disconnect(receiver)
+        shutil.rmtree(tmppath)
+
+
+def test_incremental_config_loader():
+    """Test re-applying configuration sources incrementally."""
+    tmppath = tempfile.mkdtemp()
+    filename = join(tmppath, "testapp.cfg")
+    changes = []
+
+    def receiver(app, keys=None, source=None):
+        changes.append((keys, source))
+
+    class Config(object):
+        MODULE = "module"
+        FOLDER = "module"
+        DICT = {"a": 1}
+
+    try:
+        with open(filename, "w") as f:
+            f.write("FOLDER = 'folder'\nOVERRIDDEN = 'folder'\n")
+        os.environ["INCR_ENV"] = "env"
+        os.environ["INCR_DICT__b"] = "2"
+
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(Config, env_prefix="INCR")(app, OVERRIDDEN="kwargs")
+        assert app.config["DICT"] == {"a": 1, "b": 2}
+
+        folder = InvenioConfigInstanceFolder()
+        assert folder.collect(app) == {"FOLDER": "folder", "OVERRIDDEN": "folder"}
+        assert InvenioConfigModule(module=Config).collect(app)["MODULE"] == "module"
+        assert InvenioConfigEnvironment(prefix="INCR_").collect(app) == {
+            "ENV": "env",
+            "DICT": {"a": 1, "b": 2},
+        }
+
+        loader = IncrementalConfigLoader(
+            app,
+            [
+                ("module", InvenioConfigModule(module=Config)),
+                ("instance_folder", folder),
+                ("environment", InvenioConfigEnvironment(prefix="INCR_")),
+            ],
+        )
+        config_changed.connect(receiver, app)
+        assert not loader.refresh()
+        dict_value = app.config["DICT"]
+
+        # Only the refreshed source is evaluated again.
+        with open(filename, "w") as f:
+            f.write("FOLDER = 'changed'\nOVERRIDDEN = 'changed'\n")
+        os.environ["INCR_ENV"] = "changed"
+        changeset = loader.refresh("environment")
+        assert changeset.changed == {"ENV": "changed"}
+        assert app.config["FOLDER"] == "folder"
+        assert app.config["DICT"] is dict_value
+        assert changes == [({"ENV"}, "environment")]
+
+        # Keys overridden by other sources are left untouched.
+        changeset = loader.refresh("instance_folder")
+        assert changeset.keys == {"FOLDER"}
+        assert app.config["FOLDER"] == "changed"
+        assert app.config["OVERRIDDEN"] == "kwargs"
+
+        # Contributions of earlier sources are seen by later ones.
+        os.environ["INCR_DICT__b"] = "3"
+        assert loader.refresh().changed == {"DICT": {"a": 1, "b": 3}}
+        assert loader.contributions("module")["DICT"] == {"a": 1}
+
+        with pytest.raises(KeyError):
+            loader.refresh("unknown")
+
+        assert diff_config({"A": 1, "B": 2}, {"A": 1, "B": 3, "C": 4}).changed == {
+            "B": 3,
+            "C": 4,
+        }
+        assert diff_config({"A": 1, "B": 2}, {"A": 1}).removed == {"B"}
+    finally:
+        config_changed.disconnect(receiver)
+        del os.environ["INCR_ENV"]
+        del os.environ["INCR_DICT__b"]
+        shutil.rmtree(tmppath)
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep(
+        [
+            ConfigEP(name="00_used", USED="used", UNUSED_A="unused"),
+            ConfigEP(name="10_unused", UNUSED_B="unused"),
+        ]
+    ),
+)
+def test_config_meter():
+    """Test counting the reads of configuration keys."""
+    app = Flask("testapp")
+    with pytest.raises(RuntimeError):
+        unread_keys(app)
+
+    create_config_loader(provenance=True, meter=True)(app, KWARGS="kwargs")
+    assert read_counts(app) == {}
+    for _ in range(3):
+        assert app.config["USED"] == "used"
+    assert app.config.get("DEBUG") is False
+    assert read_counts(app) == {"USED": 3, "DEBUG": 1}
+
+    report = unread_keys_report(app)
+    assert report["00_used"] == ["UNUSED_A"]
+    assert report["10_unused"] == ["UNUSED_B"]
+    assert report["kwargs"] == ["KWARGS"]
+    assert "USED" not in unread_keys(app)
+    assert "DEBUG" not in unread_keys(app)
+
+    # Installing the meter again resets the counters.
+    install_config_meter(app)
+    app.config.get("KWARGS")
+    assert read_counts(app) == {"KWARGS": 1}
+    with pytest.raises(KeyError):
+        app.config["MISSING"]
+    assert "MISSING" not in read_counts(app)
+
+    # Without provenance, keys are not grouped.
+    app = Flask("testapp")
+    create_config_loader(meter=True)(app)
+    assert list(unread_keys_report(app)) == [None]
+
+
+@patch(
+    "importlib.metadata.entry_points",
+    _mock_ep([ConfigEP(name="00_app", EP="ep", DEBUG=True, SHARED=["shared"])]),
+)
+def test_shared_config_loader():
+    """Test sharing the base configuration between applications."""
+    tmppath = tempfile.mkdtemp()
+
+    class Config(object):
+        MODULE = "module"
+        FOLDER = "module"
+
+    try:
+        os.mkdir(join(tmppath, "site1"))
+        with open(join(tmppath, "site1", "site1.cfg"), "w") as f:
+            f.write("FOLDER = 'site1'\n")
+        os.environ["SHAREDAPP_ENV"] = "env"
+
+        loader = SharedConfigLoader(config=Config, env_prefix="SHAREDAPP")
+        apps = []
+        for name in ["site1", "site2"]:
+            app = Flask(
+                name, instance_path=join(tmppath, name), instance_relative_config=True
+            )
+            loader(app, NAME=name)
+            apps.append(app)
+        site1, site2 = apps
+
+        assert site1.config["EP"] == site2.config["EP"] == "ep"
+        assert site1.config["SHARED"] is site2.config["SHARED"]
+        assert site1.config["DEBUG"] is True
+        assert site1.debug is True
+        assert site1.config["FOLDER"] == "site1"
+        assert site2.config["FOLDER"] == "module"
+        assert site2.config["NAME"] == "site2"
+        assert site2.config["ENV"] == "env"
+        assert site2.config["SECRET_KEY"] == "CHANGE_ME"
+
+        # Only the values of the application are stored in its configuration.
+        assert "EP" not in dict.keys(site2.config)
+        assert "DEBUG" not in dict.keys(site2.config)
+        assert dict.get(site1.config, "FOLDER") == "site1"
+
+        # Mapping interface.
+        config = site2.config
+        assert "EP" in config and "MISSING" not in config
+        assert config.get("EP") == "ep"
+        assert config.get("MISSING", "default") == "default"
+        assert len(config) == len(list(config)) == len(set(config.keys()))
+        assert dict(config.items())["MODULE"] == "module"
+        assert config == config.copy()
+        assert config.get_namespace("MODU") == {"le": "module"}
+
+        # Tombstones hide base keys.
+        del config["EP"]
+        assert "EP" not in config
+        assert config.get("EP") is None
+        with pytest.raises(KeyError):
+            config["EP"]
+        with pytest.raises(KeyError):
+            del config["EP"]
+        assert site1.config["EP"] == "ep"
+        config["EP"] = "overridden"
+        assert config.pop("EP") == "overridden"
+        assert config.pop("EP", "default") == "default"
+        assert config.setdefault("EP", "new") == "new"
+        assert site1.config.setdefault("EP", "new") == "ep"
+        assert loader.base["EP"] == "ep"
+        with pytest.raises(TypeError):
+            loader.base["EP"] = "modified"
+
+        # Nested values of the base cannot be modified in place.
+        assert site1.config["SHARED"] == ("shared",)
+        with pytest.raises(AttributeError):
+            site1.config["SHARED"].append("modified")
+        with pytest.raises(ValueError):
+            SharedConfigLoader(snapshot_path=join(tmppath, "snapshot"))
+
+        # Reads of base keys are metered.
+        app = Flask("site3", instance_path=join(tmppath, "site3"))
+        SharedConfigLoader(config=Config, meter=True)(app)
+        assert "EP" in unread_keys(app)
+        assert app.config["EP"] == "ep"
+        assert read_counts(app) == {"EP": 1}
+        assert "EP" not in unread_keys(app) and "MODULE" in unread_keys(app)
+    finally:
+        del os.environ["SHAREDAPP_ENV"]
+        shutil.rmtree(tmppath)
+
+
+def test_validate_config():
+    """Test validating the configuration against declared schemas."""
+
+    class SchemaEP(ConfigEP):
+        def load(self):
+            return self.kwargs
+
+    groups = {
+        "invenio_config.module": [
+            ConfigEP(
+                name="00_search",
+                SEARCH_HOSTS=["localhost"],
+                SEARCH_TIMEOUT=10,
+                SEARCH_INDEX_PREFIX="",
+            ),
+        ],
+        "invenio_config.schema": [
+            SchemaEP(
+                name="search",
+                module_name="search.config:SCHEMA",
+                SEARCH_HOSTS=list,
+                SEARCH_TIMEOUT=(int, float),
+                SEARCH_INDEX_PREFIX=str,
+                SEARCH_CLIENT_CONFIG=(dict, None),
+            ),
+            SchemaEP(
+                name="records",
+                module_name="records.config:SCHEMA",
+                RECORDS_REST_ENDPOINTS=dict,
+                **{"__prefix__": "RECORDS_REST_"},
+            ),
+        ],
+    }
+
+    def entry_points(group=None):
+        return groups[group]
+
+    with patch("importlib.metadata.entry_points", entry_points):
+        validator = get_validator()
+        assert get_validator() is validator
+        assert validator.prefixes == ("RECORDS_REST_", "SEARCH_")
+
+        app = Flask("testapp")
+        create_config_loader(validate="strict")(app)
+
+        app = Flask("testapp")
+        os.environ["VALIDATEAPP_SEARCH_TIMEOUT"] = "'10'"
+        try:
+            loader = create_config_loader(
+                env_prefix="VALIDATEAPP",
+                provenance=True,
+                provenance_values=True,
+                validate=True,
+            )
+            loader(app, SEARCH_INDEX_PRFIX="typo", SEARCH_CLIENT_CONFIG=None)
+        finally:
+            del os.environ["VALIDATEAPP_SEARCH_TIMEOUT"]
+
+        report = validate_config(app)
+        assert report.unknown == [("SEARCH_INDEX_PRFIX", ["SEARCH_INDEX_PREFIX"])]
+        assert report.mismatches == [("SEARCH_TIMEOUT", (int, float), "10")]
+        assert [(k, s.location(k), o.location(k)) for k, s, o in report.overrides] == [
+            ("SEARCH_TIMEOUT", "entry_point:00_search", "VALIDATEAPP_SEARCH_TIMEOUT")
+        ]
+        assert report.messages() == [
+            "Unknown configuration key SEARCH_INDEX_PRFIX, "
+            "did you mean SEARCH_INDEX_PREFIX?",
+            "Configuration key SEARCH_TIMEOUT should be of type int or float, "
+            "not str",
+            "Configuration key SEARCH_TIMEOUT set by entry_point:00_search is "
+            "overridden by VALIDATEAPP_SEARCH_TIMEOUT with a value of another type",
+        ]
+        with pytest.raises(ConfigValidationError) as exc_info:
+            validate_config(app, strict=True)
+        assert exc_info.value.report.unknown == report.unknown
+
+        # Keys of a shared base are validated too, frozen lists included.
+        app = Flask("testapp")
+        SharedConfigLoader(validate=True)(app, SEARCH_INDEX_PRFIX="typo")
+        shared_report = validate_config(app)
+        assert shared_report.unknown == report.unknown
+        assert shared_report.mismatches == []
+        assert ConfigValidator({"SEARCH_TIMEOUT": str}).validate(
+            app.config
+        ).mismatches == [("SEARCH_TIMEOUT", (str,), 10)]
+
+        # Schema changes compile a new validator.
+        groups["invenio_config.schema"][0].value = "search.config:OTHER"
+        assert get_validator() is not validator
+
+    with pytest.raises(TypeError):
+        ConfigValidator({"KEY": "str"})
+
+    # Only keys under the longest common prefix of the schema are owned.
+    validator = ConfigValidator(
+        {"RECORDS_REST_ENDPOINTS": dict, "RECORDS_REST_FACETS": dict}
+    )
+    assert validator.prefixes == ("RECORDS_REST_",)
+    report = validator.validate({"RECORDS_UI_ENDPOINTS": {}, "RECORDS_REST_FACET": {}})
+    assert report.unknown == [("RECORDS_REST_FACET", ["RECORDS_REST_FACETS"])]
+    assert ConfigValidator({"KEY": str}).prefixes == ()
+
+
+def test_derived_config():
+    """Test memoized derived configuration values."""
+    calls = []
+
+    @register_derived("TEST_DERIVED_URL", ["TEST_URL_HOST", "TEST_URL_PORT"])
+    def build_url(host, port):
+        calls.append((host, port))
+        return "http://{0}:{1}".format(host, port or 80)
+
+    tmppath = tempfile.mkdtemp()
+    filename = join(tmppath, "testapp.cfg")
+    try:
+        with open(filename, "w") as f:
+            f.write("TEST_URL_HOST = 'localhost'\n")
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        create_config_loader(watch=True)(app)
+        watcher = app.extensions["invenio-config"].watchers[0]
+        watcher.stop()
+
+        assert get_derived(app, "TEST_DERIVED_URL") == "http://localhost:80"
+        assert get_derived(app, "TEST_DERIVED_URL") == "http://localhost:80"
+        assert len(calls) == 1
+
+        # Values set to other objects invalidate the derived value.
+        app.config["TEST_URL_PORT"] = 5000
+        assert get_derived(app, "TEST_DERIVED_URL") == "http://localhost:5000"
+        assert len(calls) == 2
+
+        # Reloads invalidate the derived value.
+        with open(filename, "w") as f:
+            f.write("TEST_URL_HOST = 'example.org'\n")
+        os.utime(filename, ns=(0, 0))
+        assert watcher.check() == {"TEST_URL_HOST"}
+        assert get_derived(app, "TEST_DERIVED_URL") == "http://example.org:5000"
+        assert len(calls) == 3
+
+        # HTML lookups are registered as derived values.
+        assert get_derived(app, "ALLOWED_HTML_TAGS_LOOKUP") == frozenset(
+            ALLOWED_HTML_TAGS
+        )
+        app.config["ALLOWED_HTML_TAGS"] = ["a"]
+        assert get_derived(app, "ALLOWED_HTML_TAGS_LOOKUP") == frozenset(["a"])
+
+        with pytest.raises(KeyError):
+            get_derived(app, "UNKNOWN")
+    finally:
+        shutil.rmtree(tmppath)
+
+
+def test_folder_bytecode_cache():
+    """Test caching the compiled instance folder configuration file."""
+    tmppath = tempfile.mkdtemp()
+    filename = join(tmppath, "testapp.cfg")
+    cache_dir = join(tmppath, "cache")
+
+    def load():
+        app = Flask("testapp", instance_path=tmppath, instance_relative_config=True)
+        with patch("invenio_config.bytecode.compile", side_effect=compile) as mock:
+            create_config_loader(bytecode_cache_dir=cache_dir)(app)
+        return app, mock.call_count
+
+    try:
+        with open(filename, "w") as f:
+            f.write("FOLDER = 'folder'\nPATH = __file__\n")
+
+        # The first load compiles the file and caches the code.
+        app, compiled = load()
+        assert compiled == 1
+        assert app.config["FOLDER"] == "folder"
+        assert app.config["PATH"] == filename
+        assert len(os.listdir(cache_dir)) == 1
+
+        # Unchanged files are not compiled again.
+        app, compiled = load()
+        assert compiled == 0
+        assert app.config["FOLDER"] == "folder"
+
+        # Files with a new modification time but the same content neither.
+        os.utime(filename, ns=(0, 0))
+        app, compiled = load()
+        assert compiled == 0
+        app, compiled = load()
+        assert compiled == 0
+
+        # Changed files are compiled again.
+        with open(filename, "w") as f:
+            f.write("FOLDER = 'changed'\n")
+        app, compiled = load()
+        assert compiled == 1
+        assert app.config["FOLDER"] == "changed"
+        assert len(os.listdir(cache_dir)) == 1
+
+        # Missing files are ignored.
+        os.unlink(filename)
+        app, compiled = load()
+        assert "FOLDER" not in app.config
+    finally:
+        shutil.rmtree(tmppath)
+
+
+def test_binary_config():
+    """Test exporting and loading the configuration in binary format."""
+    tmppath = tempfile.mkdtemp()
+    path = join(tmppath, "config.bin")
+    try:
+        app = Flask("testapp")
+        app.config.update(
+            PLAIN={"a": [1, 2.5, None], ("t", 1): {b"bytes", frozenset([True])}},
+            DURATION=timedelta(hours=1, microseconds=5),
+            NESTED={"timeout": timedelta(seconds=30)},
+            DATE=date(2026, 1, 2),
+            DATETIME=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            PATTERN=re.compile(r"^/records/(\d+)$", re.IGNORECASE),
+            FROZEN=FrozenDict({"a": 1}),
+            CLASS=FrozenDict,
+            FUNCTION=freeze_value,
+            MODULE=os.path,
+        )
+        create_config_loader()(app)
+        dump_binary_config(app.config, path)
+
+        loaded = Flask("testapp")
+        InvenioConfigBinary(loaded, path=path)
+        pending = set(loaded.config.pending())
+        assert pending == {"CLASS", "FUNCTION", "MODULE"}
+        assert loaded.config["CLASS"] is FrozenDict
+        assert loaded.config["FUNCTION"] is freeze_value
+        assert loaded.config["MODULE"] is os.path
+        for key in set(app.config) - pending:
+            assert loaded.config[key] == app.config[key], key
+        assert loaded.config["PATTERN"].match("/RECORDS/1")
+        loaded = Flask("testapp")
+        InvenioConfigBinary(loaded, path=path)
+        assert dict(loaded.config)["CLASS"] is FrozenDict
+
+        assert load_binary_config(path, lazy=False)["CLASS"] is FrozenDict
+
+        # Only the keys of the base stages are exported.
+        class Config(object):
+            MODULE = "module"
+
+        app = Flask("testapp")
+        with record_keys(app) as keys:
+            ConfigLoader(config=Config).load_base(app)
+        dump_binary_config({key: app.config[key] for key in keys}, path)
+        assert load_binary_config(path) == {"MODULE": "module"}
+
+        # Lambdas and other objects cannot be exported.
+        with pytest.raises(TypeError, match="LAMBDA"):
+            dump_binary_config({"LAMBDA": lambda: None}, join(tmppath, "other"))
+        with pytest.raises(TypeError, match="INSTANCE"):
+            dump_binary_config({"INSTANCE": ConfigEP()}, join(tmppath, "other"))
+
+        # Invalid files.
+        with open(path, "wb") as f:
+            f.write(b"not a binary configuration")
+        with pytest.raises(ValueError):
+            InvenioConfigBinary(Flask("testapp"), path=path)
+        InvenioConfigBinary(Flask("testapp"), path=join(tmppath, "x"), silent=True)
+        with pytest.raises(FileNotFoundError):
+            InvenioConfigBinary(Flask("testapp"), path=join(tmppath, "x"))
+    finally:
+        shutil.rmtree(tmppath)